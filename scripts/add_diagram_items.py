@@ -1,6 +1,8 @@
 #!/usr/bin/env python3
 """Add variety items: MCQ-with-ASCII-diagram and simpler short PBQ items."""
-import json
+from pathlib import Path
+
+from bank_io import append_journal, journal_note, load_bank_data
 
 DIAGRAM_ITEMS = [
   # ── DIAGRAM-MCQ ITEMS (regular MCQ with ASCII diagram in stem) ──────────
@@ -428,8 +430,7 @@ DIAGRAM_ITEMS = [
 def main():
     path = "/home/alex/alex-cyber-study/cat/question-bank.sample.json"
     print(f"Loading {path}...")
-    with open(path) as f:
-        data = json.load(f)
+    data = load_bank_data(Path(path))
 
     existing_ids = {item["id"] for item in data["items"]}
     new_items = [item for item in DIAGRAM_ITEMS if item["id"] not in existing_ids]
@@ -442,12 +443,10 @@ def main():
         print("All items already present.")
         return
 
-    data["items"].extend(new_items)
-    print(f"Adding {len(new_items)} items. New total: {len(data['items'])}")
-
-    with open(path, "w") as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    print(f"Adding {len(new_items)} items. New total: {len(data['items']) + len(new_items)}")
+    append_journal(Path(path), new_items)
     print("Done.")
+    print(journal_note(Path(path)))
 
 
 if __name__ == "__main__":
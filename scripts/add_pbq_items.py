@@ -1,6 +1,9 @@
 #!/usr/bin/env python3
 """Insert 30 PBQ items (dragdrop + ordering) into the question bank."""
-import json, sys
+import sys
+from pathlib import Path
+
+from bank_io import append_journal, journal_note, load_bank_data
 
 PBQ_ITEMS = [
   # ── DOMAIN 1 ──────────────────────────────────────────────────────────────
@@ -1050,8 +1053,7 @@ PBQ_ITEMS = [
 def main():
     path = "/home/alex/alex-cyber-study/cat/question-bank.sample.json"
     print(f"Loading {path}...")
-    with open(path) as f:
-        data = json.load(f)
+    data = load_bank_data(Path(path))
 
     existing_ids = {item["id"] for item in data["items"]}
     new_items = [item for item in PBQ_ITEMS if item["id"] not in existing_ids]
@@ -1064,12 +1066,10 @@ def main():
         print("All PBQ items already present — nothing to add.")
         return
 
-    data["items"].extend(new_items)
-    print(f"Adding {len(new_items)} PBQ items. New total: {len(data['items'])}")
-
-    with open(path, "w") as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    print(f"Adding {len(new_items)} PBQ items. New total: {len(data['items']) + len(new_items)}")
+    append_journal(Path(path), new_items)
     print("Done.")
+    print(journal_note(Path(path)))
 
 if __name__ == "__main__":
     main()
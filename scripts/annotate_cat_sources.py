@@ -4,14 +4,38 @@
 Adds/updates:
 - top-level sourceCatalog
 - per-item sourceIds
+
+Annotation is incremental: a provenance file next to the bank
+(`question-bank.sample.sources.json`) records, per item, a hash of the text
+the rules read and which rule contributed each source id. Items whose hash,
+rule table (RULES_VERSION) and sourceIds are unchanged are not re-matched, and
+the bank is only rewritten when its content changes.
 """
 from __future__ import annotations
 
 import argparse
+import hashlib
 import json
 import re
+from functools import lru_cache
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterable, Iterator
+
+from bank_io import (
+    BankStream,
+    LoadedBank,
+    bank_text_sha256,
+    clear_journal,
+    load_bank,
+    load_bank_data,
+    prime_parse_cache,
+    save_bank,
+    sha256_text,
+    write_bank_stream,
+    write_checksum,
+    write_json,
+)
+from qa_timings import PhaseTimer, add_timing_args, cprofile_run
 
 SOURCE_CATALOG: dict[str, dict[str, str]] = {
     "isc2-cissp-exam-outline-2024": {
@@ -173,13 +197,127 @@ KEYWORD_RULES: list[tuple[re.Pattern[str], list[str]]] = [
 ]
 
 
+PROVENANCE_SUFFIX = ".sources.json"
+PROVENANCE_FORMAT = "cat-source-provenance/1"
+OUTLINE_SOURCE_ID = "isc2-cissp-exam-outline-2024"
+FALLBACK_SOURCE_IDS = ["nist-sp-800-53r5"]
+# Keep cards readable.
+MAX_SOURCE_IDS = 6
+
+
+def rule_name(pattern: re.Pattern[str]) -> str:
+    """A rule's first keyword, used to name it in provenance and statistics."""
+    return pattern.pattern.removeprefix(r"\b(").split("|")[0].rstrip("?")
+
+
+RULE_NAMES = [rule_name(pattern) for pattern, _ in KEYWORD_RULES]
+
+
+def _rules_version() -> str:
+    table = {
+        "catalog": sorted(SOURCE_CATALOG),
+        "defaults": DOMAIN_DEFAULTS,
+        "fallback": FALLBACK_SOURCE_IDS,
+        "limit": MAX_SOURCE_IDS,
+        "rules": [[pattern.pattern, pattern.flags, sids] for pattern, sids in KEYWORD_RULES],
+    }
+    return hashlib.sha256(json.dumps(table, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+
+
+# Changes whenever anything that decides an item's sourceIds does.
+RULES_VERSION = _rules_version()
+
+
 def infer_domain_key(raw: str) -> str:
     m = re.match(r"^\s*([1-8])", str(raw or ""))
     return m.group(1) if m else ""
 
 
-def build_source_ids(item: dict[str, Any]) -> list[str]:
-    text = " ".join(
+WORD_RE = re.compile(r"\w+")
+# A keyword alternative that is one plain word, optionally with a final "s?".
+PLAIN_WORD_RE = re.compile(r"[a-z0-9]+\??")
+# The fixed first word of a phrase, followed by a literal separator: "code of ethics", "third[- ]party".
+PHRASE_START_RE = re.compile(r"([a-z0-9]+)(?: |&|/|-|\[[- /&]+\])")
+# Phrases with no regex syntax must also occur verbatim in the lowercased text.
+LITERAL_PHRASE_RE = re.compile(r"[a-z0-9 &/-]+")
+
+
+class KeywordMatcher:
+    """All KEYWORD_RULES matched from one tokenization of the item text.
+
+    Every keyword in the rule table is a plain word ("breach", "principals?")
+    or a phrase with a fixed first word ("code of ethics", "third[- ]party").
+    The text is split into lowercase words once; plain words are dict lookups,
+    and a phrase's own word-bounded pattern is searched only when its first
+    word (and, for plain phrases, the phrase itself) occurs. Keywords of any
+    other shape are always searched, and texts with characters that lowercase
+    differently from how re.I matches them ("ſ", "İ") use the per-rule
+    patterns, so the result always equals searching each KEYWORD_RULES
+    pattern on its own.
+    """
+
+    def __init__(self, rules: list[tuple[re.Pattern[str], list[str]]]) -> None:
+        self.patterns = [pattern for pattern, _ in rules]
+        self.words: dict[str, list[int]] = {}
+        self.phrases: dict[str, list[tuple[int, str | None, re.Pattern[str]]]] = {}
+        self.always: list[tuple[int, re.Pattern[str]]] = []
+        for n, pattern in enumerate(self.patterns):
+            body = pattern.pattern
+            if not pattern.flags & re.I or not (body.startswith(r"\b(") and body.endswith(r")\b")) or "(" in body[3:-3]:
+                self.always.append((n, pattern))
+                continue
+            for alternative in body[3:-3].split("|"):
+                if PLAIN_WORD_RE.fullmatch(alternative):
+                    word = alternative.rstrip("?")
+                    forms = {word, word[:-1]} if alternative.endswith("?") else {word}
+                    for form in forms:
+                        self.words.setdefault(form, []).append(n)
+                    continue
+                keyword = re.compile(rf"\b(?:{alternative})\b", pattern.flags)
+                start = PHRASE_START_RE.match(alternative)
+                if start:
+                    literal = alternative if LITERAL_PHRASE_RE.fullmatch(alternative) else None
+                    self.phrases.setdefault(start.group(1), []).append((n, literal, keyword))
+                else:
+                    self.always.append((n, keyword))
+
+    def matched_rules(self, text: str) -> list[int]:
+        """Indexes of the rules whose pattern occurs in `text`, in rule order."""
+        if not text.isascii() and not all(_lowercase_safe(ch) for ch in set(text) if not ch.isascii()):
+            return [n for n, pattern in enumerate(self.patterns) if pattern.search(text)]
+        found: set[int] = set()
+        lowered = text.lower()
+        for word in set(WORD_RE.findall(lowered)):
+            rules = self.words.get(word)
+            if rules:
+                found.update(rules)
+            for n, literal, keyword in self.phrases.get(word, ()):
+                if n not in found and (literal is None or literal in lowered) and keyword.search(text):
+                    found.add(n)
+        for n, keyword in self.always:
+            if n not in found and keyword.search(text):
+                found.add(n)
+        return sorted(found)
+
+
+@lru_cache(maxsize=None)
+def _lowercase_safe(ch: str) -> bool:
+    """True when lowercasing a non-ASCII character cannot change what the keyword patterns see."""
+    low = ch.lower()
+    return (
+        len(low) == 1
+        and not low.isascii()
+        and (WORD_RE.fullmatch(ch) is None) == (WORD_RE.fullmatch(low) is None)
+        and re.fullmatch(r"[a-z0-9_]", ch, re.I) is None
+    )
+
+
+KEYWORD_MATCHER = KeywordMatcher(KEYWORD_RULES)
+
+
+def item_text(item: dict[str, Any]) -> str:
+    """The text keyword rules are matched against."""
+    return " ".join(
         [
             str(item.get("stem", "")),
             str(item.get("explanation", "")),
@@ -188,48 +326,235 @@ def build_source_ids(item: dict[str, Any]) -> list[str]:
         ]
     )
 
-    source_ids: list[str] = ["isc2-cissp-exam-outline-2024"]
+
+def reference_matched_rules(text: str) -> list[int]:
+    """Rule indexes by searching each KEYWORD_RULES pattern separately (parity baseline)."""
+    return [n for n, (pattern, _) in enumerate(KEYWORD_RULES) if pattern.search(text)]
+
+
+def attributed_source_ids(item: dict[str, Any], rules: Iterable[int]) -> dict[str, str]:
+    """sourceIds in order, each mapped to what added it: exam-outline, domain:N, domain:default or keyword:NAME."""
+    candidates: list[tuple[str, str]] = [(OUTLINE_SOURCE_ID, "exam-outline")]
 
     domain_key = infer_domain_key(str(item.get("domain", "")))
-    source_ids.extend(DOMAIN_DEFAULTS.get(domain_key, ["nist-sp-800-53r5"]))
+    if domain_key in DOMAIN_DEFAULTS:
+        candidates.extend((sid, f"domain:{domain_key}") for sid in DOMAIN_DEFAULTS[domain_key])
+    else:
+        candidates.extend((sid, "domain:default") for sid in FALLBACK_SOURCE_IDS)
+
+    for n in rules:
+        candidates.extend((sid, f"keyword:{RULE_NAMES[n]}") for sid in KEYWORD_RULES[n][1])
 
-    for pattern, matches in KEYWORD_RULES:
-        if pattern.search(text):
-            source_ids.extend(matches)
+    attributed: dict[str, str] = {}
+    for sid, origin in candidates:
+        if sid in SOURCE_CATALOG and sid not in attributed:
+            attributed[sid] = origin
+            if len(attributed) == MAX_SOURCE_IDS:
+                break
+    return attributed
 
-    deduped: list[str] = []
-    seen = set()
-    for sid in source_ids:
-        if sid in SOURCE_CATALOG and sid not in seen:
-            deduped.append(sid)
-            seen.add(sid)
 
-    # Keep cards readable.
-    return deduped[:6]
+def source_ids_for(item: dict[str, Any], rules: Iterable[int]) -> list[str]:
+    return list(attributed_source_ids(item, rules))
 
 
-def annotate(bank: dict[str, Any]) -> dict[str, Any]:
+def build_source_ids(item: dict[str, Any]) -> list[str]:
+    return source_ids_for(item, KEYWORD_MATCHER.matched_rules(item_text(item)))
+
+
+def check_parity(items: Iterable[dict[str, Any]]) -> list[str]:
+    """Items whose sourceIds differ between the keyword matcher and per-rule searches."""
+    mismatches: list[str] = []
+    for idx, item in enumerate(items, start=1):
+        text = item_text(item)
+        fast = source_ids_for(item, KEYWORD_MATCHER.matched_rules(text))
+        slow = source_ids_for(item, reference_matched_rules(text))
+        if fast != slow:
+            mismatches.append(f"[{item.get('id') or idx}] matcher {fast} != per-rule {slow}")
+    return mismatches
+
+
+def provenance_path(path: Path) -> Path:
+    path = Path(path)
+    return path.with_name(path.stem + PROVENANCE_SUFFIX)
+
+
+def load_provenance(path: Path) -> dict[str, Any]:
+    """Recorded provenance, or an empty record when missing, unreadable or for another rule table."""
+    try:
+        data = json.loads(Path(path).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get("format") != PROVENANCE_FORMAT:
+        return {}
+    if data.get("rulesVersion") != RULES_VERSION or not isinstance(data.get("items"), dict):
+        return {}
+    return data
+
+
+class Annotator:
+    """Annotates items one at a time, reusing recorded results for unchanged items."""
+
+    def __init__(self, previous: dict[str, Any] | None = None) -> None:
+        self.previous: dict[str, Any] = (previous or {}).get("items", {})
+        self.records: dict[str, dict[str, Any]] = {}
+        self.reused = 0
+        self.matched = 0
+        self.changed = 0
+
+    def annotate_item(self, item: dict[str, Any], position: int) -> dict[str, Any]:
+        key = str(item.get("id") or f"#{position}")
+        text = item_text(item)
+        # item_text() ends with the domain, but the domain default reads it on its own.
+        text_hash = sha256_text(str(item.get("domain", "")) + "\n" + text)
+        record = self.previous.get(key)
+        if (
+            isinstance(record, dict)
+            and record.get("textHash") == text_hash
+            and isinstance(record.get("sourceIds"), dict)
+            and item.get("sourceIds") == list(record["sourceIds"])
+        ):
+            self.reused += 1
+        else:
+            self.matched += 1
+            record = {
+                "textHash": text_hash,
+                "sourceIds": attributed_source_ids(item, KEYWORD_MATCHER.matched_rules(text)),
+            }
+            source_ids = list(record["sourceIds"])
+            if item.get("sourceIds") != source_ids:
+                self.changed += 1
+                item["sourceIds"] = source_ids
+        self.records[key] = record
+        return item
+
+    def provenance(self) -> dict[str, Any]:
+        return {"format": PROVENANCE_FORMAT, "rulesVersion": RULES_VERSION, "items": self.records}
+
+
+def annotate(bank: dict[str, Any], annotator: Annotator | None = None) -> dict[str, Any]:
     items = bank.get("items")
     if not isinstance(items, list):
         raise ValueError("Top-level 'items' must be a list")
 
+    annotator = annotator or Annotator()
     bank["sourceCatalog"] = SOURCE_CATALOG
-    for item in items:
-        item["sourceIds"] = build_source_ids(item)
+    for position, item in enumerate(items, start=1):
+        annotator.annotate_item(item, position)
     return bank
 
 
+def annotate_loaded(loaded: LoadedBank, annotator: Annotator) -> str:
+    """Annotate `loaded.data` in place; returns the sha256 save_bank() would now write.
+
+    When the file is already in save_bank() layout and annotation changed
+    nothing, that is the loaded sha256 and the bank is not re-serialized.
+    """
+    catalog_unchanged = isinstance(loaded.data, dict) and loaded.data.get("sourceCatalog") == SOURCE_CATALOG
+    annotate(loaded.data, annotator)
+    if loaded.canonical and catalog_unchanged and not annotator.changed:
+        return loaded.sha256
+    return bank_text_sha256(loaded.data)
+
+
+def annotate_items(items: Iterable[dict[str, Any]], annotator: Annotator | None = None) -> Iterator[dict[str, Any]]:
+    annotator = annotator or Annotator()
+    for position, item in enumerate(items, start=1):
+        yield annotator.annotate_item(item, position)
+
+
+def annotate_stream(in_path: Path, out_path: Path, annotator: Annotator | None = None) -> tuple[int, str]:
+    """Annotate item by item in constant memory; returns (item count, sha256).
+
+    The output is always rewritten: whether anything changed is only known
+    once every item has been written.
+    """
+    stream = BankStream(in_path)
+    if not stream.has_item_array:
+        raise ValueError("Top-level 'items' must be a list")
+    members = stream.members()
+    layout = stream.layout()
+    members["sourceCatalog"] = SOURCE_CATALOG
+    if "sourceCatalog" not in layout:
+        layout.append("sourceCatalog")
+    digest = write_bank_stream(out_path, layout, members, annotate_items(stream.items(), annotator))
+    clear_journal(out_path)
+    return stream.item_count, digest
+
+
+def save_provenance(path: Path, annotator: Annotator, previous: dict[str, Any]) -> bool:
+    """Write the provenance file if it differs from `previous`; returns whether it was written."""
+    provenance = annotator.provenance()
+    if provenance == previous:
+        return False
+    write_json(path, provenance)
+    return True
+
+
 def main() -> int:
     parser = argparse.ArgumentParser()
     parser.add_argument("bank_json", type=Path)
     parser.add_argument("--write", type=Path)
+    parser.add_argument("--stream", action="store_true", help="annotate item by item in constant memory")
+    parser.add_argument("--write-sha256", type=Path, help="also write a sha256sum-style checksum of the output")
+    parser.add_argument("--provenance", type=Path, help="provenance file (default: <output stem>.sources.json)")
+    parser.add_argument("--full", action="store_true", help="ignore recorded provenance and re-match every item")
+    parser.add_argument(
+        "--check-parity",
+        action="store_true",
+        help="compare the keyword matcher with per-rule searches; writes nothing",
+    )
+    add_timing_args(parser)
     args = parser.parse_args()
 
-    bank = json.loads(args.bank_json.read_text(encoding="utf-8"))
-    updated = annotate(bank)
+    if args.check_parity:
+        bank = load_bank_data(args.bank_json)
+        items = bank.get("items", []) if isinstance(bank, dict) else []
+        mismatches = check_parity(items)
+        for line in mismatches:
+            print(f"MISMATCH: {line}")
+        print(f"Keyword matcher parity: {len(items) - len(mismatches)}/{len(items)} items identical")
+        return 1 if mismatches else 0
+
+    timer = PhaseTimer.from_args(args)
     out_path = args.write or args.bank_json
-    out_path.write_text(json.dumps(updated, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
-    print(f"Annotated source citations for {len(updated.get('items', []))} items in {out_path}")
+    provenance_file = args.provenance or provenance_path(out_path)
+    previous = {} if args.full else load_provenance(provenance_file)
+    annotator = Annotator(previous)
+    with cprofile_run(args):
+        if args.stream:
+            with timer.phase("annotate+write"):
+                count, digest = annotate_stream(args.bank_json, out_path, annotator)
+                if args.write_sha256:
+                    write_checksum(args.write_sha256, digest, out_path)
+            state = "written"
+        else:
+            with timer.phase("load"):
+                loaded = load_bank(args.bank_json)
+            with timer.phase("annotate"):
+                digest = annotate_loaded(loaded, annotator)
+            updated = loaded.data
+            # The loaded sha256 covers any pending journal, so a bank with one is always rewritten.
+            if digest == loaded.sha256 and out_path == args.bank_json:
+                state = "unchanged"
+                if not loaded.canonical:
+                    prime_parse_cache(out_path, digest, updated)
+                if args.write_sha256:
+                    write_checksum(args.write_sha256, digest, out_path)
+            else:
+                state = "updated"
+                with timer.phase("write"):
+                    digest = save_bank(out_path, updated, checksum_path=args.write_sha256)
+                prime_parse_cache(out_path, digest, updated)
+            count = len(updated.get("items", []))
+        with timer.phase("provenance"):
+            save_provenance(provenance_file, annotator, previous)
+
+    print(
+        f"Annotated source citations for {count} items in {out_path} ({state}; "
+        f"{annotator.matched} matched, {annotator.reused} unchanged, {annotator.changed} with new sourceIds)"
+    )
+    timer.print_summary()
     return 0
 
 
@@ -9,96 +9,249 @@ from __future__ import annotations
 import argparse
 import json
 import re
+import time
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable, Iterable
 
-OPTION_RE = re.compile(r"\bOption\s+([1-9][0-9]?)\s+is\s+correct\b", re.I)
-CORRECT_ANSWER_RE = re.compile(r"\bCorrect\s+Answer\s*:\s*(.+?)(?:\.\s|$)", re.I)
-MULTI_ANSWER_RE = re.compile(r"\bcorrect\s+answers?\s+are\s+options?\b", re.I)
-GDPR_DISCOVERY_RE = re.compile(r"\bgdpr\b", re.I)
-DISCOVERY_RE = re.compile(r"\bfrom\s+discovery\b", re.I)
+from bank_io import BankStream, load_bank_data
+from explanation_consistency import DEFAULT_MARGIN, check_consistency
+from qa_cache import QACache, cached_item, code_fingerprint
+from qa_timings import PhaseTimer, add_timing_args, cprofile_run
+
+# Every pattern the audit looks for, scanned together in one pass per item
+# (see compile_scanner). Each starts with a letter and is matched from a word
+# boundary; no two may match at the same position.
+SCAN_PATTERNS: dict[str, str] = {
+    "multi_answer": r"correct\s+answers?\s+are\s+options?\b",
+    "option_correct": r"Option\s+(?P<option_number>[1-9][0-9]?)\s+is\s+correct\b",
+    "correct_answer": r"Correct\s+Answer\s*:\s*(?P<answer_text>.+?)(?:\.\s|$)",
+    "gdpr": r"gdpr\b",
+    "from_discovery": r"from\s+discovery\b",
+}
+
+
+@dataclass(frozen=True)
+class FactRule:
+    """Flags explanation wording that misstates a fact about `topic`.
+
+    `topic` is looked for in the stem and explanation, `wording` in the
+    explanation; both name SCAN_PATTERNS entries.
+    """
+
+    kind: str
+    topic: str
+    wording: str
+    level: str
+    message: str
+
+
+# New factual checks are one entry here (plus their patterns above).
+FACT_RULES: list[FactRule] = [
+    FactRule(
+        "gdpr_awareness_wording",
+        topic="gdpr",
+        wording="from_discovery",
+        level="warning",
+        message="GDPR wording uses 'from discovery'; Article 33 standard is from awareness.",
+    ),
+]
+
+
+def compile_scanner(patterns: dict[str, str]) -> re.Pattern[str]:
+    """One regex reporting every pattern's matches, overlapping ones included.
+
+    Alternatives sit inside a lookahead, so a long match (a whole "Correct
+    Answer: ..." sentence) does not hide another pattern starting inside it;
+    the leading character class skips positions no pattern can start at.
+    """
+    first = sorted({p[0].lower() for p in patterns.values()})
+    if not all(ch.isalpha() for ch in first):
+        raise ValueError("Scan patterns must start with a letter")
+    alternatives = "|".join(f"(?P<{name}>{pattern})" for name, pattern in patterns.items())
+    return re.compile(rf"(?=[{''.join(first)}])\b(?={alternatives})", re.I)
+
+
+SCANNER = compile_scanner(SCAN_PATTERNS)
 
 
 def norm(s: str) -> str:
     return re.sub(r"\s+", " ", s.strip().lower())
 
 
-def audit(items: list[dict[str, Any]], strict_text_match: bool = False) -> dict[str, Any]:
-    findings: list[dict[str, Any]] = []
+@dataclass
+class ItemScan:
+    """One item's fields and the scanner's matches, shared by every rule."""
 
-    for idx, item in enumerate(items, start=1):
-        iid = str(item.get("id") or idx)
-        choices = item.get("choices") if isinstance(item.get("choices"), list) else []
-        ci = item.get("correctIndex")
+    iid: str
+    choices: list[Any]
+    ci: Any
+    # First match of each pattern inside the explanation.
+    explanation: dict[str, re.Match[str]]
+    # Patterns matched anywhere in stem + explanation.
+    anywhere: set[str]
+
+    @classmethod
+    def scan(cls, item: dict[str, Any], idx: int) -> "ItemScan":
         explanation = str(item.get("explanation") or "")
         stem = str(item.get("stem") or "")
+        offset = len(stem) + 1
+        first: dict[str, re.Match[str]] = {}
+        anywhere: set[str] = set()
+        for m in SCANNER.finditer(stem + " " + explanation):
+            name = m.lastgroup
+            anywhere.add(name)
+            if m.start() >= offset and name not in first:
+                first[name] = m
+        return cls(
+            iid=str(item.get("id") or idx),
+            choices=item.get("choices") if isinstance(item.get("choices"), list) else [],
+            ci=item.get("correctIndex"),
+            explanation=first,
+            anywhere=anywhere,
+        )
+
+    def finding(self, level: str, kind: str, message: str) -> dict[str, Any]:
+        return {"level": level, "item": self.iid, "kind": kind, "message": message}
+
+
+def rule_multi_answer(s: ItemScan, strict_text_match: bool) -> list[dict[str, Any]]:
+    if "multi_answer" in s.explanation:
+        return [s.finding("error", "multi_answer_phrase", "Explanation suggests multiple correct options in single-answer MCQ.")]
+    return []
+
+
+def rule_option_number(s: ItemScan, strict_text_match: bool) -> list[dict[str, Any]]:
+    m = s.explanation.get("option_correct")
+    if m and isinstance(s.ci, int):
+        explained_opt = int(m.group("option_number")) - 1
+        if explained_opt != s.ci:
+            return [s.finding(
+                "error",
+                "option_number_mismatch",
+                f"Explanation says Option {explained_opt + 1} but correctIndex is {s.ci + 1}.",
+            )]
+    return []
+
+
+def rule_correct_answer_text(s: ItemScan, strict_text_match: bool) -> list[dict[str, Any]]:
+    if not strict_text_match:
+        return []
+    m = s.explanation.get("correct_answer")
+    if m and isinstance(s.ci, int) and 0 <= s.ci < len(s.choices):
+        explained_text = norm(m.group("answer_text"))
+        correct_choice = norm(str(s.choices[s.ci]))
+        # Lenient containment check to avoid false positives from paraphrases.
+        if explained_text and correct_choice and (explained_text not in correct_choice and correct_choice not in explained_text):
+            return [s.finding(
+                "warning",
+                "correct_answer_text_mismatch",
+                "Correct Answer text does not closely match answer key choice text.",
+            )]
+    return []
+
+
+def fact_rule(fact: FactRule) -> Callable[[ItemScan, bool], list[dict[str, Any]]]:
+    def rule(s: ItemScan, strict_text_match: bool) -> list[dict[str, Any]]:
+        if fact.topic in s.anywhere and fact.wording in s.explanation:
+            return [s.finding(fact.level, fact.kind, fact.message)]
+        return []
+
+    rule.__name__ = f"rule_{fact.kind}"
+    return rule
+
+
+# Applied in order; finding order in reports follows this list.
+RULES: list[Callable[[ItemScan, bool], list[dict[str, Any]]]] = [
+    rule_multi_answer,
+    rule_option_number,
+    rule_correct_answer_text,
+    *(fact_rule(fact) for fact in FACT_RULES),
+]
+
+
+class AuditStats:
+    """Items matching each scan pattern and per-rule cost, collected with --rule-stats."""
+
+    def __init__(self) -> None:
+        self.items = 0
+        self.scan_s = 0.0
+        self.matches: dict[str, int] = {name: 0 for name in SCAN_PATTERNS}
+        self.rules: dict[str, dict[str, Any]] = {
+            r.__name__.removeprefix("rule_"): {"findings": 0, "seconds": 0.0} for r in RULES
+        }
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "items": self.items,
+            "scan_seconds": round(self.scan_s, 4),
+            "pattern_items": dict(self.matches),
+            "rules": {
+                name: {**stats, "seconds": round(stats["seconds"], 4)} for name, stats in self.rules.items()
+            },
+        }
 
-        if MULTI_ANSWER_RE.search(explanation):
-            findings.append({
-                "level": "error",
-                "item": iid,
-                "kind": "multi_answer_phrase",
-                "message": "Explanation suggests multiple correct options in single-answer MCQ.",
-            })
-
-        m = OPTION_RE.search(explanation)
-        if m and isinstance(ci, int):
-            explained_opt = int(m.group(1)) - 1
-            if explained_opt != ci:
-                findings.append({
-                    "level": "error",
-                    "item": iid,
-                    "kind": "option_number_mismatch",
-                    "message": f"Explanation says Option {explained_opt + 1} but correctIndex is {ci + 1}.",
-                })
-
-        if strict_text_match:
-            m2 = CORRECT_ANSWER_RE.search(explanation)
-            if m2 and isinstance(ci, int) and 0 <= ci < len(choices):
-                explained_text = norm(m2.group(1))
-                correct_choice = norm(str(choices[ci]))
-                # Lenient containment check to avoid false positives from paraphrases.
-                if explained_text and correct_choice and (explained_text not in correct_choice and correct_choice not in explained_text):
-                    findings.append({
-                        "level": "warning",
-                        "item": iid,
-                        "kind": "correct_answer_text_mismatch",
-                        "message": "Correct Answer text does not closely match answer key choice text.",
-                    })
-
-        if GDPR_DISCOVERY_RE.search(stem + " " + explanation) and DISCOVERY_RE.search(explanation):
-            findings.append({
-                "level": "warning",
-                "item": iid,
-                "kind": "gdpr_awareness_wording",
-                "message": "GDPR wording uses 'from discovery'; Article 33 standard is from awareness.",
-            })
+
+def audit_item(
+    item: dict[str, Any], idx: int, strict_text_match: bool = False, stats: AuditStats | None = None
+) -> list[dict[str, Any]]:
+    findings: list[dict[str, Any]] = []
+    if stats is None:
+        scan = ItemScan.scan(item, idx)
+        for rule in RULES:
+            findings.extend(rule(scan, strict_text_match))
+        return findings
+
+    stats.items += 1
+    start = time.perf_counter()
+    scan = ItemScan.scan(item, idx)
+    stats.scan_s += time.perf_counter() - start
+    for name in scan.anywhere:
+        stats.matches[name] += 1
+    for rule in RULES:
+        start = time.perf_counter()
+        hits = rule(scan, strict_text_match)
+        rule_stats = stats.rules[rule.__name__.removeprefix("rule_")]
+        rule_stats["seconds"] += time.perf_counter() - start
+        rule_stats["findings"] += len(hits)
+        findings.extend(hits)
+    return findings
+
+
+def cache_namespace(strict_text_match: bool) -> str:
+    return f"{code_fingerprint(__file__)}:{'strict' if strict_text_match else 'default'}"
+
+
+def audit(
+    items: Iterable[dict[str, Any]],
+    strict_text_match: bool = False,
+    cache: QACache | None = None,
+    stats: AuditStats | None = None,
+) -> dict[str, Any]:
+    findings: list[dict[str, Any]] = []
+
+    item_count = 0
+    for idx, item in enumerate(items, start=1):
+        item_count = idx
+        findings.extend(cached_item(cache, item, idx, lambda: audit_item(item, idx, strict_text_match, stats)))
 
     return {
-        "item_count": len(items),
+        "item_count": item_count,
         "error_count": sum(1 for f in findings if f["level"] == "error"),
         "warning_count": sum(1 for f in findings if f["level"] == "warning"),
         "findings": findings,
     }
 
 
-def main() -> int:
-    parser = argparse.ArgumentParser()
-    parser.add_argument("bank_json", type=Path)
-    parser.add_argument("--write-report", type=Path)
-    parser.add_argument("--strict-text-match", action="store_true")
-    args = parser.parse_args()
+def add_semantic_findings(report: dict[str, Any], items: Iterable[dict[str, Any]], margin: float = DEFAULT_MARGIN) -> None:
+    """Append the TF-IDF explanation/key check (explanation_consistency.py) to an audit report."""
+    semantic = check_consistency(items, margin)
+    report["findings"].extend(semantic["findings"])
+    report["warning_count"] = sum(1 for f in report["findings"] if f["level"] == "warning")
+    report["semantic"] = {k: semantic[k] for k in ("checked_items", "margin", "flagged_count")}
 
-    bank = json.loads(args.bank_json.read_text(encoding="utf-8"))
-    items = bank.get("items")
-    if not isinstance(items, list):
-        raise SystemExit("Top-level 'items' must be a list")
-
-    report = audit(items, strict_text_match=args.strict_text_match)
-
-    if args.write_report:
-        args.write_report.write_text(json.dumps(report, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
 
+def print_report(report: dict[str, Any]) -> None:
     for f in report["findings"]:
         print(f"{f['level'].upper()}: [{f['item']}] {f['kind']} - {f['message']}")
     print(
@@ -112,6 +265,56 @@ def main() -> int:
             ensure_ascii=False,
         ),
     )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("bank_json", type=Path)
+    parser.add_argument("--write-report", type=Path)
+    parser.add_argument("--strict-text-match", action="store_true")
+    parser.add_argument("--stream", action="store_true", help="audit item by item in constant memory")
+    parser.add_argument("--rule-stats", action="store_true", help="report items matched per pattern and per-rule cost")
+    parser.add_argument("--semantic", action="store_true", help="also flag explanations closer to a distractor than the key")
+    parser.add_argument("--semantic-margin", type=float, default=DEFAULT_MARGIN)
+    add_timing_args(parser)
+    args = parser.parse_args()
+
+    timer = PhaseTimer.from_args(args)
+    with cprofile_run(args):
+        with timer.phase("load"):
+            stream = None
+            if args.stream:
+                stream = BankStream(args.bank_json)
+                if not stream.has_item_array:
+                    raise SystemExit("Top-level 'items' must be a list")
+                items: Iterable[dict[str, Any]] = stream.items()
+            else:
+                bank = load_bank_data(args.bank_json)
+                items = bank.get("items")
+                if not isinstance(items, list):
+                    raise SystemExit("Top-level 'items' must be a list")
+
+        with timer.phase("audit"):
+            stats = AuditStats() if args.rule_stats else None
+            # Cached items are not re-scanned, so --rule-stats bypasses the cache.
+            cache = None if stats else QACache.for_bank(args.bank_json, "audit", cache_namespace(args.strict_text_match))
+            report = audit(items, strict_text_match=args.strict_text_match, cache=cache, stats=stats)
+            if cache is not None:
+                cache.save()
+            if stats is not None:
+                report["rule_stats"] = stats.as_dict()
+
+        if args.semantic:
+            with timer.phase("semantic"):
+                add_semantic_findings(report, stream.items() if stream is not None else items, args.semantic_margin)
+
+        if args.write_report:
+            timer.write_json(args.write_report, timer.embed(report), "report")
+
+    print_report(report)
+    if "rule_stats" in report:
+        print("RULE_STATS:", json.dumps(report["rule_stats"], ensure_ascii=False))
+    timer.print_summary()
     return 1 if report["error_count"] else 0
 
 
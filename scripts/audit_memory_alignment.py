@@ -15,6 +15,8 @@ import re
 from pathlib import Path
 from typing import Any
 
+from bank_io import load_bank_data
+
 
 NETWORK_SOURCE_HINTS = ("ietf", "tls", "network", "rfc")
 STOPWORDS = {
@@ -174,7 +176,7 @@ def main() -> int:
     ap.add_argument("--write-report", type=Path)
     args = ap.parse_args()
 
-    bank = load_json(args.bank)
+    bank = load_bank_data(args.bank)
     memory = load_json(args.memory)
     report = audit(bank, memory)
 
@@ -0,0 +1,110 @@
+"""Shared layout for the precomputed bank index artifacts.
+
+choice_index.py and source_index.py both write a JSON file next to the bank
+that names items once (`items`: item ids, `domains`: canonical domain names,
+`item_domains`: per-item domain code) and refers to them by position in
+`items` everywhere else. Each file carries the sha256 of the bank it was built
+from, is written one entry per line, and is read back through a BankIndex
+subclass.
+"""
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any, Iterator
+
+from bank_io import bank_sha256
+from cat_domains import canonical_domain
+
+
+def default_output(bank_path: Path, suffix: str) -> Path:
+    """cat/question-bank.sample.json, ".choice-index.json" -> cat/question-bank.choice-index.json"""
+    name = bank_path.name
+    for bank_suffix in (".sample.json", ".json"):
+        if name.endswith(bank_suffix):
+            name = name[: -len(bank_suffix)]
+            break
+    return bank_path.with_name(name + suffix)
+
+
+def compact(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+
+class ItemTable:
+    """The `items` / `domains` / `item_domains` columns, filled in bank order."""
+
+    def __init__(self) -> None:
+        self.ids: list[str] = []
+        self.domains: list[str] = []
+        self.item_domains: list[int] = []
+        self._codes: dict[str, int] = {}
+
+    def add(self, item: dict[str, Any]) -> int:
+        """Record `item`; returns its position in `items`."""
+        position = len(self.ids)
+        # Items without an id are named by 1-based bank position, as the validator reports them.
+        self.ids.append(str(item.get("id") or position + 1))
+        domain = canonical_domain(item.get("domain"))
+        code = self._codes.get(domain)
+        if code is None:
+            code = self._codes[domain] = len(self.domains)
+            self.domains.append(domain)
+        self.item_domains.append(code)
+        return position
+
+    def as_dict(self) -> dict[str, Any]:
+        return {"items": self.ids, "domains": self.domains, "item_domains": self.item_domains}
+
+
+def header_lines(index: dict[str, Any], keys: tuple[str, ...]) -> Iterator[str]:
+    """The opening brace and one `"key": value,` line per key, values on one line each."""
+    yield "{\n"
+    for key in keys:
+        yield f"  {compact(key)}: {compact(index[key])},\n"
+
+
+def mapping_lines(mapping: dict[str, Any]) -> Iterator[str]:
+    """A JSON object with one `key: value` entry per line, indented under the top level."""
+    yield "{"
+    yield ",".join(f"\n    {compact(key)}: {compact(value)}" for key, value in mapping.items())
+    yield "\n  }"
+
+
+class BankIndex:
+    """Base reader: checks the format tag and resolves item positions to ids and domains."""
+
+    FORMAT = ""
+    LABEL = "Index"
+    MAKE_TARGET = ""
+
+    def __init__(self, data: dict[str, Any]) -> None:
+        if data.get("format") != self.FORMAT:
+            raise ValueError(f"Unsupported {self.LABEL.lower()} format: {data.get('format')}")
+        self.data = data
+        self.ids: list[str] = data["items"]
+        self._domains: list[str] = data["domains"]
+        self._item_domains: list[int] = data["item_domains"]
+
+    @classmethod
+    def load(cls, path: Path) -> "BankIndex":
+        return cls(json.loads(Path(path).read_text(encoding="utf-8")))
+
+    @classmethod
+    def check(cls, path: Path, bank_path: Path) -> int:
+        """--check: 0 when the index at `path` was built from the current bank, else 1."""
+        if not path.exists():
+            print(f"{cls.LABEL} missing: {path}")
+            return 1
+        if cls.load(path).source_sha256 != bank_sha256(bank_path):
+            print(f"{cls.LABEL} is stale: {path} (run make {cls.MAKE_TARGET})")
+            return 1
+        print(f"{cls.LABEL} OK: {path}")
+        return 0
+
+    @property
+    def source_sha256(self) -> str:
+        return str(self.data.get("bank_sha256", ""))
+
+    def domain_of(self, position: int) -> str:
+        return self._domains[self._item_domains[position]]
@@ -0,0 +1,611 @@
+"""Shared question-bank loader for the CAT QA scripts.
+
+The bank is read through mmap and fingerprinted (sha256) in the same pass.
+A binary parse cache is kept next to the bank, keyed by that hash, so any
+script run against an unchanged bank skips JSON decoding entirely. It is
+written with marshal, not pickle: the decoded bank is only dicts, lists and
+scalars, and loading a marshal file cannot run code. The cache is trusted as
+much as the bank file beside it; a file that does not decode is ignored.
+
+Set CAT_BANK_PARSE_CACHE=0 to bypass the cache.
+
+For banks too large to hold as one object, BankStream yields items one at a
+time from the top-level `items` array and write_bank_stream() writes them back
+in the same `indent=2` layout, so memory stays flat per item. All writes go
+through atomic_write(): temp file, fsync, rename.
+
+Ingestion scripts append new items to a delta journal next to the bank
+(`question-bank.sample.journal.jsonl`) instead of rewriting the whole file.
+Every reader here sees base + journal; save_bank() (and the explicit
+`compact_bank_journal.py`) folds the journal back into the canonical file.
+"""
+from __future__ import annotations
+
+import hashlib
+import itertools
+import json
+import marshal
+import mmap
+import os
+import re
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Iterable, Iterator, TextIO
+
+PARSE_CACHE_SUFFIX = ".parse-cache"
+PARSE_CACHE_MAGIC = b"CATBANK-PARSE-CACHE/2\n"
+PARSE_CACHE_ENV = "CAT_BANK_PARSE_CACHE"
+STREAM_CHUNK_SIZE = 1 << 16
+JOURNAL_SUFFIX = ".journal.jsonl"
+
+# iter_bank() event markers: ("items", ITEMS_ARRAY) opens the items array,
+# (None, item) is one element of it.
+ITEMS_ARRAY = object()
+
+_DECODER = json.JSONDecoder()
+_WS_RE = re.compile(r"[ \t\n\r]*")
+_NUMBER_CHARS = frozenset("0123456789+-.eE")
+
+
+@dataclass
+class LoadedBank:
+    path: Path
+    data: Any
+    sha256: str
+    from_cache: bool = False
+    # The file is exactly what save_bank() writes for `data`; only known when
+    # the parse cache was primed by the script that wrote the bank.
+    canonical: bool = False
+    # Journal adds skipped because a different item already has their id.
+    journal_conflicts: list[str] = field(default_factory=list)
+
+
+def parse_cache_path(path: Path) -> Path:
+    return path.with_name(path.name + PARSE_CACHE_SUFFIX)
+
+
+def cache_enabled() -> bool:
+    return os.environ.get(PARSE_CACHE_ENV, "1").strip().lower() not in {"0", "false", "no", "off"}
+
+
+def _open_mapped(path: Path) -> mmap.mmap | None:
+    """Map path read-only; empty files cannot be mapped and return None."""
+    with path.open("rb") as fh:
+        if os.fstat(fh.fileno()).st_size == 0:
+            return None
+        return mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def journal_path(path: Path) -> Path:
+    path = Path(path)
+    return path.with_name(path.stem + JOURNAL_SUFFIX)
+
+
+def _read_journal_bytes(path: Path) -> bytes:
+    try:
+        return journal_path(path).read_bytes()
+    except FileNotFoundError:
+        return b""
+
+
+def parse_journal(data: bytes) -> list[dict[str, Any]]:
+    records: list[dict[str, Any]] = []
+    lines = data.decode("utf-8").split("\n")
+    for n, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError:
+            # A torn final line (interrupted append) is ignored; anything else is corruption.
+            if n == len(lines):
+                break
+            raise ValueError(f"Malformed bank journal record on line {n}") from None
+        if not isinstance(record, dict) or record.get("op") not in {"add", "set"}:
+            raise ValueError(f"Unknown bank journal record on line {n}")
+        records.append(record)
+    return records
+
+
+def read_journal(path: Path) -> list[dict[str, Any]]:
+    return parse_journal(_read_journal_bytes(path))
+
+
+def apply_journal(
+    bank: dict[str, Any], records: list[dict[str, Any]], conflicts: list[str] | None = None
+) -> dict[str, Any]:
+    """Apply journal records in order.
+
+    Adds whose id already exists are skipped, so replaying a journal that was
+    already folded into the base (e.g. after an interrupted compaction) is a
+    no-op. When the existing item differs, the skip loses data: its id is
+    appended to `conflicts`.
+    """
+    if not records:
+        return bank
+    items = bank.setdefault("items", [])
+    if not isinstance(items, list):
+        raise ValueError("Top-level 'items' must be a list to apply the bank journal")
+    by_id = {str(it.get("id")): it for it in items if isinstance(it, dict) and it.get("id")}
+    for record in records:
+        if record["op"] == "set":
+            bank[record["key"]] = record["value"]
+            continue
+        item = record["item"]
+        iid = item.get("id") if isinstance(item, dict) else None
+        if iid and str(iid) in by_id:
+            if conflicts is not None and by_id[str(iid)] != item:
+                conflicts.append(str(iid))
+            continue
+        if iid:
+            by_id[str(iid)] = item
+        items.append(item)
+    return bank
+
+
+def _fsync_append(path: Path, lines: list[str]) -> None:
+    with path.open("a+b") as fh:
+        end = fh.seek(0, os.SEEK_END)
+        if end:
+            fh.seek(end - 1)
+            if fh.read(1) != b"\n":
+                # Drop the torn tail of an interrupted append (rare, so a full read is fine).
+                fh.seek(0)
+                fh.truncate(fh.read().rfind(b"\n") + 1)
+        fh.write("".join(lines).encode("utf-8"))
+        fh.flush()
+        os.fsync(fh.fileno())
+
+
+def append_journal(
+    path: Path, items: Iterable[dict[str, Any]] = (), members: dict[str, Any] | None = None
+) -> int:
+    """Append new items (and top-level member updates) to the bank journal in O(new)."""
+    items = list(items)
+    lines = [
+        json.dumps({"op": "set", "key": key, "value": value}, ensure_ascii=False, separators=(",", ":")) + "\n"
+        for key, value in (members or {}).items()
+    ]
+    lines.extend(
+        json.dumps({"op": "add", "item": item}, ensure_ascii=False, separators=(",", ":")) + "\n"
+        for item in items
+    )
+    if lines:
+        _fsync_append(journal_path(path), lines)
+    return len(items)
+
+
+def journal_note(path: Path) -> str:
+    """Reminder printed by ingestion scripts after appending to the journal."""
+    return (
+        f"NOTE: new items are in {journal_path(path)}; cat/app.js reads only the bank file, "
+        "so run `make cat-compact` before committing."
+    )
+
+
+def clear_journal(path: Path) -> None:
+    try:
+        journal_path(path).unlink()
+    except FileNotFoundError:
+        pass
+
+
+def _bank_digest(mm: mmap.mmap | None, journal_bytes: bytes) -> str:
+    h = hashlib.sha256(mm if mm is not None else b"")
+    h.update(journal_bytes)
+    return h.hexdigest()
+
+
+def sha256_text(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def canonical_item_json(item: Any) -> str:
+    return json.dumps(item, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+
+
+def item_hash(item: Any) -> str:
+    """Content hash of one item, independent of key order and file formatting."""
+    return sha256_text(canonical_item_json(item))
+
+
+def bank_sha256(path: Path) -> str:
+    """Fingerprint of the bank as loaded: file bytes followed by any pending journal."""
+    path = Path(path)
+    mm = _open_mapped(path)
+    try:
+        return _bank_digest(mm, _read_journal_bytes(path))
+    finally:
+        if mm is not None:
+            mm.close()
+
+
+def _read_parse_cache(cache_path: Path, digest: str) -> dict[str, Any] | None:
+    try:
+        with cache_path.open("rb") as fh:
+            if fh.readline() != PARSE_CACHE_MAGIC:
+                return None
+            if fh.readline().strip().decode("ascii", "replace") != digest:
+                return None
+            entry = marshal.load(fh)
+    except (OSError, EOFError, TypeError, ValueError):
+        return None
+    return entry if isinstance(entry, dict) and "data" in entry else None
+
+
+def _write_parse_cache(cache_path: Path, digest: str, entry: dict[str, Any]) -> None:
+    tmp = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+    try:
+        with tmp.open("wb") as fh:
+            fh.write(PARSE_CACHE_MAGIC)
+            fh.write(digest.encode("ascii") + b"\n")
+            marshal.dump(entry, fh)
+        os.replace(tmp, cache_path)
+    except (OSError, ValueError):
+        # Read-only checkouts still work; they just never get a warm cache.
+        try:
+            tmp.unlink()
+        except OSError:
+            pass
+
+
+def load_bank(path: Path, use_cache: bool = True) -> LoadedBank:
+    """Load a bank JSON file, reusing the parse cache when the bytes are unchanged."""
+    path = Path(path)
+    journal_bytes = _read_journal_bytes(path)
+    mm = _open_mapped(path)
+    use_cache = use_cache and cache_enabled()
+    cache_path = parse_cache_path(path)
+
+    try:
+        digest = _bank_digest(mm, journal_bytes)
+        if use_cache:
+            entry = _read_parse_cache(cache_path, digest)
+            if entry is not None:
+                conflicts = list(entry.get("journal_conflicts", []))
+                _warn_conflicts(path, conflicts)
+                return LoadedBank(
+                    path=path,
+                    data=entry["data"],
+                    sha256=digest,
+                    from_cache=True,
+                    canonical=bool(entry.get("canonical")),
+                    journal_conflicts=conflicts,
+                )
+        raw = b"" if mm is None else mm[:]
+    finally:
+        if mm is not None:
+            mm.close()
+
+    data = json.loads(raw.decode("utf-8"))
+    conflicts = []
+    if journal_bytes:
+        apply_journal(data, parse_journal(journal_bytes), conflicts)
+        _warn_conflicts(path, conflicts)
+    if use_cache:
+        _write_parse_cache(cache_path, digest, {"data": data, "canonical": False, "journal_conflicts": conflicts})
+    return LoadedBank(path=path, data=data, sha256=digest, journal_conflicts=conflicts)
+
+
+def _warn_conflicts(path: Path, conflicts: list[str]) -> None:
+    if conflicts:
+        print(
+            f"WARNING: {journal_path(path)} adds {len(conflicts)} item(s) whose id is already used by "
+            f"a different item; they were skipped: {', '.join(conflicts[:20])}",
+            file=sys.stderr,
+        )
+
+
+def load_bank_data(path: Path) -> Any:
+    return load_bank(path).data
+
+
+def prime_parse_cache(path: Path, digest: str, data: Any) -> None:
+    """Seed the parse cache after a script has written `data` to the bank with save_bank()."""
+    if cache_enabled():
+        _write_parse_cache(parse_cache_path(Path(path)), digest, {"data": data, "canonical": True})
+
+
+class _StreamReader:
+    """Incremental JSON tokenizer over a text file handle."""
+
+    def __init__(self, fh: TextIO, chunk_size: int) -> None:
+        self.fh = fh
+        self.chunk_size = chunk_size
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+
+    def fill(self) -> bool:
+        if self.eof:
+            return False
+        # Grow geometrically so a single large value is not re-decoded per chunk.
+        data = self.fh.read(max(self.chunk_size, len(self.buf) - self.pos))
+        if not data:
+            self.eof = True
+            return False
+        self.buf = self.buf[self.pos:] + data
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        while True:
+            self.pos = _WS_RE.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self.fill():
+                return ""
+
+    def expect(self, ch: str) -> None:
+        got = self.peek()
+        if got != ch:
+            raise ValueError(f"Malformed bank JSON: expected {ch!r}, found {got or 'end of file'!r}")
+        self.pos += 1
+
+    def value(self) -> Any:
+        self.peek()
+        while True:
+            try:
+                val, end = _DECODER.raw_decode(self.buf, self.pos)
+                # A number at the buffer edge ("2" of "2.5") may be truncated; strings,
+                # arrays and objects are self-delimiting.
+                truncated = (
+                    isinstance(val, (int, float))
+                    and not isinstance(val, bool)
+                    and (end == len(self.buf) or self.buf[end] in _NUMBER_CHARS)
+                )
+                if not truncated or self.eof:
+                    self.pos = end
+                    return val
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            self.fill()
+
+
+def iter_bank(path: Path, chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[tuple[str | None, Any]]:
+    """Yield top-level members of a bank file in order, streaming the items array.
+
+    Non-items members arrive as (key, value). A top-level `items` array arrives
+    as ("items", ITEMS_ARRAY) followed by one (None, item) per element.
+    """
+    with Path(path).open(encoding="utf-8", newline="") as fh:
+        reader = _StreamReader(fh, chunk_size)
+        reader.expect("{")
+        if reader.peek() == "}":
+            return
+        while True:
+            key = reader.value()
+            if not isinstance(key, str):
+                raise ValueError("Malformed bank JSON: object keys must be strings")
+            reader.expect(":")
+            if key == "items" and reader.peek() == "[":
+                reader.pos += 1
+                yield key, ITEMS_ARRAY
+                if reader.peek() == "]":
+                    reader.pos += 1
+                else:
+                    while True:
+                        yield None, reader.value()
+                        sep = reader.peek()
+                        reader.pos += 1
+                        if sep == "]":
+                            break
+                        if sep != ",":
+                            raise ValueError("Malformed bank JSON: expected ',' or ']' in items")
+            else:
+                yield key, reader.value()
+            sep = reader.peek()
+            reader.pos += 1
+            if sep == "}":
+                return
+            if sep != ",":
+                raise ValueError("Malformed bank JSON: expected ',' or '}' after member")
+
+
+class BankStream:
+    """Constant-memory view of a bank file.
+
+    members() returns every top-level member except a streamed `items` array;
+    items() yields that array's elements one at a time. members() scans the
+    file once (decoding and discarding items), so top-level metadata is
+    available before items regardless of where it sits in the file.
+    """
+
+    def __init__(self, path: Path, chunk_size: int = STREAM_CHUNK_SIZE) -> None:
+        self.path = Path(path)
+        self.chunk_size = chunk_size
+        self._members: dict[str, Any] | None = None
+        self._layout: list[str] = []
+        self._item_count = 0
+        self._has_item_array = False
+        self._journal: list[dict[str, Any]] = []
+
+    def _scan(self) -> None:
+        members: dict[str, Any] = {}
+        layout: list[str] = []
+        count = 0
+        self._journal = read_journal(self.path)
+        journal_adds = any(r["op"] == "add" for r in self._journal)
+        ids: set[str] = set()
+        for key, value in iter_bank(self.path, self.chunk_size):
+            if key is None:
+                count += 1
+                if journal_adds and isinstance(value, dict) and value.get("id"):
+                    ids.add(str(value["id"]))
+                continue
+            if value is ITEMS_ARRAY:
+                self._has_item_array = True
+            else:
+                members[key] = value
+            if key not in layout:
+                layout.append(key)
+
+        for record in self._journal:
+            if record["op"] == "set":
+                members[record["key"]] = record["value"]
+                if record["key"] not in layout:
+                    layout.append(record["key"])
+            elif self._has_item_array:
+                item = record["item"]
+                iid = item.get("id") if isinstance(item, dict) else None
+                if not (iid and str(iid) in ids):
+                    count += 1
+                    if iid:
+                        ids.add(str(iid))
+        self._members, self._layout, self._item_count = members, layout, count
+
+    def _ensure_scanned(self) -> None:
+        if self._members is None:
+            self._scan()
+
+    @property
+    def has_item_array(self) -> bool:
+        self._ensure_scanned()
+        return self._has_item_array
+
+    @property
+    def item_count(self) -> int:
+        self._ensure_scanned()
+        return self._item_count
+
+    def members(self) -> dict[str, Any]:
+        self._ensure_scanned()
+        return dict(self._members or {})
+
+    def layout(self) -> list[str]:
+        """Top-level keys in file order (including `items`)."""
+        self._ensure_scanned()
+        return list(self._layout)
+
+    def items(self) -> Iterator[dict[str, Any]]:
+        self._ensure_scanned()
+        adds = [r["item"] for r in self._journal if r["op"] == "add"] if self._has_item_array else []
+        ids: set[str] = set()
+        for key, value in iter_bank(self.path, self.chunk_size):
+            if key is None:
+                if adds and isinstance(value, dict) and value.get("id"):
+                    ids.add(str(value["id"]))
+                yield value
+        for item in adds:
+            iid = item.get("id") if isinstance(item, dict) else None
+            if iid and str(iid) in ids:
+                continue
+            if iid:
+                ids.add(str(iid))
+            yield item
+
+
+def _indented(value: Any, level: int) -> str:
+    return json.dumps(value, indent=2, ensure_ascii=False).replace("\n", "\n" + "  " * level)
+
+
+def iter_bank_text(layout: list[str], members: dict[str, Any], items: Iterable[Any]) -> Iterator[str]:
+    """Text chunks identical to json.dumps(bank, indent=2, ensure_ascii=False) + "\n".
+
+    `layout` orders the top-level keys; the `items` key is taken from `items`
+    unless `members` already holds a (non-streamed) value for it.
+    """
+    if not layout:
+        yield "{}\n"
+        return
+    yield "{"
+    for n, key in enumerate(layout):
+        yield ("," if n else "") + "\n  " + json.dumps(key, ensure_ascii=False) + ": "
+        if key == "items" and key not in members:
+            first = True
+            for item in items:
+                yield ("[\n    " if first else ",\n    ") + _indented(item, 2)
+                first = False
+            yield "[]" if first else "\n  ]"
+        else:
+            yield _indented(members[key], 1)
+    yield "\n}\n"
+
+
+def _fsync_dir(path: Path) -> None:
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def atomic_write(path: Path, chunks: Iterable[str | bytes]) -> tuple[str, int]:
+    """Write text (UTF-8) or byte chunks to a temp file, fsync it and rename it over `path`.
+
+    Readers never see a partial file, and `chunks` may still be reading `path`
+    itself. Returns (sha256, byte count) of what was written, computed in the
+    same pass.
+    """
+    path = Path(path)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with tmp.open("wb") as fh:
+            for chunk in chunks:
+                data = chunk.encode("utf-8") if isinstance(chunk, str) else chunk
+                digest.update(data)
+                size += len(data)
+                fh.write(data)
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(tmp, path)
+        _fsync_dir(path.parent)
+    finally:
+        if tmp.exists():
+            tmp.unlink()
+    return digest.hexdigest(), size
+
+
+def write_json(path: Path, obj: Any) -> str:
+    """Atomically write `json.dumps(obj, indent=2, ensure_ascii=False) + "\n"`; returns its sha256."""
+    encoder = json.JSONEncoder(indent=2, ensure_ascii=False)
+    digest, _ = atomic_write(path, itertools.chain(encoder.iterencode(obj), ["\n"]))
+    return digest
+
+
+def write_checksum(path: Path, digest: str, target: Path) -> None:
+    """`sha256sum`-compatible sidecar for `target`."""
+    atomic_write(path, [f"{digest}  {Path(target).name}\n"])
+
+
+def write_bank_stream(path: Path, layout: list[str], members: dict[str, Any], items: Iterable[Any]) -> str:
+    """Stream a bank to `path` item by item (see atomic_write); returns its sha256."""
+    digest, _ = atomic_write(path, iter_bank_text(layout, members, items))
+    return digest
+
+
+def _bank_parts(bank: dict[str, Any]) -> tuple[list[str], dict[str, Any], Iterable[Any]]:
+    items = bank.get("items")
+    streamed = isinstance(items, list)
+    members = {k: v for k, v in bank.items() if not (k == "items" and streamed)}
+    return list(bank.keys()), members, items if streamed else []
+
+
+def bank_text_sha256(bank: dict[str, Any]) -> str:
+    """sha256 that save_bank() would produce, without building the document in memory."""
+    digest = hashlib.sha256()
+    for chunk in iter_bank_text(*_bank_parts(bank)):
+        digest.update(chunk.encode("utf-8"))
+    return digest.hexdigest()
+
+
+def save_bank(path: Path, bank: dict[str, Any], checksum_path: Path | None = None) -> str:
+    """Write a complete bank in the canonical layout and fold away its journal.
+
+    Returns the sha256 of the written file, optionally also written to
+    `checksum_path` without re-reading the bank.
+    """
+    digest = write_bank_stream(path, *_bank_parts(bank))
+    clear_journal(path)
+    if checksum_path is not None:
+        write_checksum(checksum_path, digest, path)
+    return digest
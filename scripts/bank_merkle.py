@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""Per-item hashes, per-domain keyed subtrees and a Merkle root for the bank manifest.
+
+The manifest's whole-file sha256 changes on any byte, including formatting.
+This module hashes each item's canonical JSON (bank_io.item_hash: sorted keys,
+no whitespace), so only content changes count, and arranges the hashes as:
+
+- leaf   = sha256("leaf:" + item id + ":" + item hash)
+- each domain is a 16-way prefix tree keyed by sha256("key:" + item id) in
+  hex. Items sit in the bucket named by the first MERKLE_DEPTH hex digits of
+  that key. A bucket hashes as a pairwise Merkle tree over its leaves ordered
+  by item id:
+  node = sha256("node:" + left + right), with an odd last node carried up
+  unchanged.
+- an internal node with prefix p hashes as sha256("prefix:" + p + ":" +
+  child digit + child hash + ...) over its non-empty children in hex order.
+  The domain's subtree root is the node with the empty prefix.
+- the bank root is the pairwise tree over sha256("domain:" + domain + ":" +
+  subtree root), ordered by domain name.
+
+Where an item sits depends only on its id, so adding or changing one item
+changes only the nodes on its path. Every node hash is stored (`nodes`, by
+prefix) along with the item hashes per bucket (`buckets`). diff_merkle()
+therefore descends only into nodes whose hashes differ and compares items
+only in the buckets that changed. All hashes are lowercase hex, so the browser
+app or the Cloudflare worker can recompute them with SubtleCrypto. Item order
+in the bank does not affect any hash.
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+from pathlib import Path
+from typing import Any, Iterable
+
+from bank_io import item_hash, load_bank_data, write_json
+from cat_domains import canonical_domain
+
+MERKLE_ALGORITHM = "sha256-merkle/2"
+# Hex digits of the key hash that name an item's bucket: 256 buckets per domain.
+MERKLE_DEPTH = 2
+HEX_DIGITS = "0123456789abcdef"
+
+
+def _sha256(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def item_key(item: dict[str, Any], position: int) -> str:
+    # Items without an id are keyed by bank position (1-based, as the validator reports them).
+    return str(item.get("id") or f"#{position}")
+
+
+def merkle_root(leaves: list[str]) -> str:
+    if not leaves:
+        return _sha256("empty:")
+    level = leaves
+    while len(level) > 1:
+        nxt = [_sha256("node:" + level[n] + level[n + 1]) for n in range(0, len(level) - 1, 2)]
+        if len(level) % 2:
+            nxt.append(level[-1])
+        level = nxt
+    return level[0]
+
+
+def bucket_of(key: str) -> str:
+    return _sha256("key:" + key)[:MERKLE_DEPTH]
+
+
+def domain_tree(items: dict[str, str]) -> dict[str, Any]:
+    """Subtree for one domain's item hashes (item key -> hash): root, node hashes, buckets."""
+    buckets: dict[str, dict[str, str]] = {}
+    for key in sorted(items):
+        buckets.setdefault(bucket_of(key), {})[key] = items[key]
+    nodes = {
+        prefix: merkle_root([_sha256(f"leaf:{k}:{h}") for k, h in bucket.items()])
+        for prefix, bucket in buckets.items()
+    }
+    level = set(nodes)
+    for depth in range(MERKLE_DEPTH - 1, -1, -1):
+        parents: dict[str, list[str]] = {}
+        for prefix in sorted(level):
+            parents.setdefault(prefix[:depth], []).append(prefix)
+        for prefix, children in parents.items():
+            nodes[prefix] = _sha256(f"prefix:{prefix}:" + "".join(c[-1] + nodes[c] for c in children))
+        level = set(parents)
+    root = nodes.pop("", _sha256("empty:"))
+    return {
+        "root": root,
+        "item_count": len(items),
+        "nodes": dict(sorted(nodes.items())),
+        "buckets": dict(sorted(buckets.items())),
+    }
+
+
+def build_merkle(items: Iterable[dict[str, Any]]) -> dict[str, Any]:
+    """The manifest `merkle` block: root, per-domain subtrees and item hashes."""
+    by_domain: dict[str, dict[str, str]] = {}
+    seen: set[str] = set()
+    for position, item in enumerate(items, start=1):
+        key = item_key(item, position)
+        if key in seen:
+            # Duplicate ids are a validator error; keep both so neither hides a change.
+            key = f"{key}#{position}"
+        seen.add(key)
+        by_domain.setdefault(canonical_domain(item.get("domain")), {})[key] = item_hash(item)
+
+    domains = {domain: domain_tree(by_domain[domain]) for domain in sorted(by_domain)}
+    root = merkle_root([_sha256(f"domain:{d}:{domains[d]['root']}") for d in domains])
+    return {"algorithm": MERKLE_ALGORITHM, "root": root, "domains": domains}
+
+
+def _changed_buckets(before: dict[str, Any], after: dict[str, Any]) -> Iterable[str]:
+    """Bucket prefixes under nodes whose hashes differ, found top-down from the domain root."""
+    old_nodes = before.get("nodes", {})
+    new_nodes = after.get("nodes", {})
+    stack = [""]
+    while stack:
+        prefix = stack.pop()
+        if len(prefix) == MERKLE_DEPTH:
+            yield prefix
+            continue
+        for digit in reversed(HEX_DIGITS):
+            child = prefix + digit
+            if old_nodes.get(child) != new_nodes.get(child):
+                stack.append(child)
+
+
+def diff_merkle(old: dict[str, Any], new: dict[str, Any]) -> dict[str, Any]:
+    """Items added, removed or changed between two `merkle` blocks."""
+    for block in (old, new):
+        if block.get("algorithm") != MERKLE_ALGORITHM:
+            raise ValueError(f"Unsupported merkle block: {block.get('algorithm')}")
+    diff: dict[str, Any] = {
+        "same": old["root"] == new["root"],
+        "changed_domains": [],
+        "changed_buckets": 0,
+        "added": [],
+        "removed": [],
+        "changed": [],
+    }
+    if diff["same"]:
+        return diff
+
+    old_items: dict[str, str] = {}
+    new_items: dict[str, str] = {}
+    for domain in sorted(set(old["domains"]) | set(new["domains"])):
+        before = old["domains"].get(domain, {})
+        after = new["domains"].get(domain, {})
+        if before.get("root") == after.get("root"):
+            continue
+        diff["changed_domains"].append(domain)
+        for prefix in _changed_buckets(before, after):
+            diff["changed_buckets"] += 1
+            old_items.update(before.get("buckets", {}).get(prefix, {}))
+            new_items.update(after.get("buckets", {}).get(prefix, {}))
+
+    # An item that moved domain leaves both subtrees changed and is reported once, as changed.
+    for key, digest in new_items.items():
+        previous = old_items.get(key)
+        if previous is None:
+            diff["added"].append(key)
+        elif previous != digest:
+            diff["changed"].append(key)
+    diff["removed"] = [key for key in old_items if key not in new_items]
+    for kind in ("added", "removed", "changed"):
+        diff[kind].sort()
+    return diff
+
+
+def load_merkle(path: Path) -> dict[str, Any]:
+    """The `merkle` block of a manifest written with --item-hashes, or built from a bank file."""
+    data = load_bank_data(path)
+    if isinstance(data, dict) and isinstance(data.get("merkle"), dict):
+        return data["merkle"]
+    if isinstance(data, dict) and isinstance(data.get("items"), list):
+        return build_merkle(data["items"])
+    raise SystemExit(f"{path} is neither a bank nor a manifest with item hashes")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("old", type=Path, help="manifest (written with --item-hashes) or bank file")
+    parser.add_argument("new", type=Path, nargs="?", default=Path("cat/question-bank.sample.json"))
+    parser.add_argument("--write-report", type=Path)
+    args = parser.parse_args()
+
+    diff = diff_merkle(load_merkle(args.old), load_merkle(args.new))
+    if args.write_report:
+        write_json(args.write_report, diff)
+
+    print(
+        "SUMMARY:",
+        json.dumps({
+            "same": diff["same"],
+            "changed_domains": len(diff["changed_domains"]),
+            "changed_buckets": diff["changed_buckets"],
+            "added": len(diff["added"]),
+            "removed": len(diff["removed"]),
+            "changed": len(diff["changed"]),
+        }),
+    )
+    for kind in ("added", "removed", "changed"):
+        for key in diff[kind]:
+            print(f"{kind.upper()}: {key}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""Bulk numeric statistics over the bank from per-item columns.
+
+The per-item numeric fields (choice lengths, stem/explanation word counts,
+difficulty/discrimination, correct position, domain) are pulled into columns
+in one Python pass; every count, ratio, percentile and histogram is then
+computed over whole columns. That pass dominates the run time, so it counts
+words with a byte translate table instead of tokenizing. NumPy is optional and
+only speeds up the reductions: without it (or with CAT_STATS_NUMPY=0) the same
+numbers come from plain Python, and floats are rounded so both backends write
+identical JSON.
+
+`validate_cat_bank.py --distributions` adds the per-domain distributions to
+the QA report; running this script prints the whole set.
+"""
+from __future__ import annotations
+
+import argparse
+import bisect
+import json
+import math
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterable, Sequence
+
+from bank_io import load_bank_data
+from cat_domains import canonical_domain
+
+try:
+    import numpy as np
+except ImportError:  # optional: plain-Python fallback below
+    np = None
+
+NUMPY_ENV = "CAT_STATS_NUMPY"
+PERCENTILES = (10, 25, 50, 75, 90)
+# Histogram bin lower edges for word counts; the last bin is open-ended.
+WORD_BIN_EDGES = (0, 10, 20, 40, 60, 80, 120)
+# Same thresholds as validate_cat_bank.difficulty_band and the lint rules.
+EASY_MAX = -0.6
+HARD_MIN = 0.7
+CHOICE_OUTLIER_RATIO = 2.8
+THIN_EXPLANATION_WORDS = 20
+ROUND = 4
+# Bytes outside item_quality_lint.WORD_RE's [A-Za-z0-9'] (including every byte
+# of a multi-byte UTF-8 character) become spaces, so split() yields its words.
+_WORD_BYTES = frozenset(b"ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789'")
+_NON_WORD_TO_SPACE = bytes(b if b in _WORD_BYTES else 0x20 for b in range(256))
+
+
+def numpy_enabled() -> bool:
+    return np is not None and os.environ.get(NUMPY_ENV, "1").strip().lower() not in {"0", "false", "no", "off"}
+
+
+def word_count(text: str) -> int:
+    """len(item_quality_lint.words(text)) without building the word list."""
+    return len(text.encode("utf-8", "surrogatepass").translate(_NON_WORD_TO_SPACE).split())
+
+
+def _number(value: Any) -> float:
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return math.nan
+    return float(value)
+
+
+@dataclass
+class BankColumns:
+    """One entry per item; NaN / -1 mark missing or invalid values."""
+
+    domains: list[str]
+    domain: Sequence[int]
+    difficulty: Sequence[float]
+    discrimination: Sequence[float]
+    correct_position: Sequence[int]
+    stem_words: Sequence[int]
+    explanation_words: Sequence[int]
+    choice_min: Sequence[int]
+    choice_max: Sequence[int]
+    choice_avg: Sequence[float]
+
+    @property
+    def count(self) -> int:
+        return len(self.domain)
+
+
+def build_columns(items: Iterable[dict[str, Any]], use_numpy: bool | None = None) -> BankColumns:
+    domains: list[str] = []
+    codes: dict[str, int] = {}
+    cols: dict[str, list[Any]] = {
+        name: [] for name in (
+            "domain", "difficulty", "discrimination", "correct_position", "stem_words",
+            "explanation_words", "choice_min", "choice_max", "choice_avg",
+        )
+    }
+    for item in items:
+        domain = canonical_domain(item.get("domain"))
+        code = codes.get(domain)
+        if code is None:
+            code = codes[domain] = len(domains)
+            domains.append(domain)
+        cols["domain"].append(code)
+        # validate_cat_bank treats a missing difficulty as 0 and discrimination as 1.
+        cols["difficulty"].append(_number(item.get("difficulty", 0)))
+        cols["discrimination"].append(_number(item.get("discrimination", 1)))
+
+        choices = item.get("choices") if isinstance(item.get("choices"), list) else []
+        ci = item.get("correctIndex")
+        valid_key = len(choices) >= 2 and isinstance(ci, int) and not isinstance(ci, bool) and 0 <= ci < len(choices)
+        cols["correct_position"].append(ci if valid_key else -1)
+        cols["stem_words"].append(word_count(str(item.get("stem") or "")))
+        cols["explanation_words"].append(word_count(str(item.get("explanation") or "")))
+        lengths = [len(c.strip()) for c in choices if isinstance(c, str)]
+        cols["choice_min"].append(min(lengths) if lengths else 0)
+        cols["choice_max"].append(max(lengths) if lengths else 0)
+        cols["choice_avg"].append(sum(lengths) / len(lengths) if lengths else 0.0)
+
+    if use_numpy is None:
+        use_numpy = numpy_enabled()
+    if use_numpy:
+        arrays: dict[str, Any] = {
+            name: np.asarray(values, dtype=np.float64 if name in {"difficulty", "discrimination", "choice_avg"} else np.int64)
+            for name, values in cols.items()
+        }
+        return BankColumns(domains=domains, **arrays)
+    return BankColumns(domains=domains, **cols)
+
+
+def _is_numpy(values: Any) -> bool:
+    return np is not None and isinstance(values, np.ndarray)
+
+
+def _round(value: float | None) -> float | None:
+    return None if value is None else round(float(value), ROUND)
+
+
+def _finite(values: Sequence[float]) -> Any:
+    if _is_numpy(values):
+        return values[~np.isnan(values)]
+    return [v for v in values if not math.isnan(v)]
+
+
+def _select(values: Sequence[Any], mask: Any) -> Any:
+    if _is_numpy(values):
+        return values[mask]
+    return [v for v, keep in zip(values, mask) if keep]
+
+
+def percentiles(values: Sequence[float]) -> dict[str, float | None]:
+    """Linear-interpolated percentiles (NumPy's default method) of the finite values."""
+    finite = _finite(values)
+    if len(finite) == 0:
+        return {f"p{p}": None for p in PERCENTILES}
+    if _is_numpy(finite):
+        return {f"p{p}": _round(v) for p, v in zip(PERCENTILES, np.percentile(finite, PERCENTILES))}
+    ordered = sorted(finite)
+    out: dict[str, float | None] = {}
+    for p in PERCENTILES:
+        pos = (len(ordered) - 1) * p / 100
+        lo = math.floor(pos)
+        hi = min(lo + 1, len(ordered) - 1)
+        out[f"p{p}"] = _round(ordered[lo] + (ordered[hi] - ordered[lo]) * (pos - lo))
+    return out
+
+
+def histogram(values: Sequence[int], edges: Sequence[int] = WORD_BIN_EDGES) -> list[int]:
+    """Counts per bin [edges[i], edges[i + 1]); the last bin is open-ended."""
+    if _is_numpy(values):
+        idx = np.searchsorted(np.asarray(edges), values, side="right") - 1
+        return [int(n) for n in np.bincount(idx[idx >= 0], minlength=len(edges))]
+    counts = [0] * len(edges)
+    for v in values:
+        i = bisect.bisect_right(edges, v) - 1
+        if i >= 0:
+            counts[i] += 1
+    return counts
+
+
+def _mean(values: Sequence[float]) -> float | None:
+    if len(values) == 0:
+        return None
+    if _is_numpy(values):
+        return _round(values.mean())
+    return _round(sum(values) / len(values))
+
+
+def _count_values(values: Sequence[int], size: int) -> list[int]:
+    if _is_numpy(values):
+        return [int(n) for n in np.bincount(values, minlength=size)]
+    counts = [0] * size
+    for v in values:
+        counts[v] += 1
+    return counts
+
+
+def _share(mask: Any, total: int) -> float:
+    if not total:
+        return 0.0
+    hits = int(mask.sum()) if _is_numpy(mask) else sum(mask)
+    return _round(hits / total)
+
+
+def bank_stats(cols: BankColumns) -> dict[str, Any]:
+    """Bank-wide counts and ratios the validator and lint compute item by item."""
+    n = cols.count
+    domain_counts = _count_values(cols.domain, len(cols.domains))
+
+    if _is_numpy(cols.correct_position):
+        positions = cols.correct_position[cols.correct_position >= 0]
+    else:
+        positions = [p for p in cols.correct_position if p >= 0]
+    width = (int(max(positions)) + 1) if len(positions) else 0
+    position_counts = _count_values(positions, width)
+
+    difficulty = _finite(cols.difficulty)
+    if _is_numpy(difficulty):
+        easy = int((difficulty <= EASY_MAX).sum())
+        hard = int((difficulty >= HARD_MIN).sum())
+    else:
+        easy = sum(1 for d in difficulty if d <= EASY_MAX)
+        hard = sum(1 for d in difficulty if d >= HARD_MIN)
+
+    if _is_numpy(cols.choice_avg):
+        outliers = (cols.choice_avg > 0) & (cols.choice_max > cols.choice_avg * CHOICE_OUTLIER_RATIO)
+        thin = cols.explanation_words < THIN_EXPLANATION_WORDS
+    else:
+        outliers = [a > 0 and m > a * CHOICE_OUTLIER_RATIO for a, m in zip(cols.choice_avg, cols.choice_max)]
+        thin = [w < THIN_EXPLANATION_WORDS for w in cols.explanation_words]
+
+    return {
+        "item_count": n,
+        "domain_counts": {d: c for d, c in zip(cols.domains, domain_counts)},
+        "correct_position_counts": {str(p): c for p, c in enumerate(position_counts) if c},
+        "answer_position_max_share": _round(max(position_counts) / len(positions)) if len(positions) else None,
+        "difficulty_band_counts": {"easy": easy, "medium": len(difficulty) - easy - hard, "hard": hard},
+        "choice_length": {
+            "min": int(min(cols.choice_min)) if n else None,
+            "max": int(max(cols.choice_max)) if n else None,
+            "mean_avg": _mean(cols.choice_avg),
+            "outlier_ratio": _share(outliers, n),
+        },
+        "stem_words": {"mean": _mean(cols.stem_words), **percentiles(_as_float(cols.stem_words))},
+        "explanation_words": {"mean": _mean(cols.explanation_words), **percentiles(_as_float(cols.explanation_words))},
+        "thin_explanation_ratio": _share(thin, n),
+    }
+
+
+def _as_float(values: Sequence[int]) -> Any:
+    if _is_numpy(values):
+        return values.astype(np.float64)
+    return [float(v) for v in values]
+
+
+def domain_distributions(cols: BankColumns) -> dict[str, Any]:
+    """Per-domain difficulty/discrimination percentiles and word-count histograms."""
+    out: dict[str, Any] = {}
+    order = sorted(range(len(cols.domains)), key=lambda c: cols.domains[c])
+    for code in order:
+        if _is_numpy(cols.domain):
+            mask = cols.domain == code
+        else:
+            mask = [d == code for d in cols.domain]
+        stem_words = _select(cols.stem_words, mask)
+        out[cols.domains[code]] = {
+            "count": len(stem_words),
+            "difficulty": percentiles(_select(cols.difficulty, mask)),
+            "discrimination": percentiles(_select(cols.discrimination, mask)),
+            "stem_words_histogram": histogram(stem_words),
+            "explanation_words_histogram": histogram(_select(cols.explanation_words, mask)),
+        }
+    return {"histogram_edges": list(WORD_BIN_EDGES), "domains": out}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("bank_json", type=Path, nargs="?", default=Path("cat/question-bank.sample.json"))
+    parser.add_argument("--python", action="store_true", help="use the plain-Python backend even if NumPy is installed")
+    args = parser.parse_args()
+
+    bank = load_bank_data(args.bank_json)
+    items = bank.get("items", []) if isinstance(bank, dict) else []
+    cols = build_columns(items, use_numpy=False if args.python else None)
+    print("BACKEND:", "numpy" if _is_numpy(cols.domain) else "python")
+    print(json.dumps({"stats": bank_stats(cols), "distributions": domain_distributions(cols)}, indent=2, ensure_ascii=False))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
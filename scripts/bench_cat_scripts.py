@@ -0,0 +1,379 @@
+#!/usr/bin/env python3
+"""Benchmark the CAT bank scripts on seeded synthetic banks.
+
+Builds a bank that follows the real schema (MCQ plus dragdrop/ordering PBQs,
+synthetic variants with `variantOf`, realistic stem/explanation lengths, cited
+sources) at each requested size, times each script's core function and writes
+wall time, peak traced memory and items/sec to `bench_output.txt`.
+
+Compare against a stored run to catch regressions:
+
+    python3 scripts/bench_cat_scripts.py --sizes 10k
+    cp bench_output.txt bench_baseline.txt
+    # ...change a script...
+    python3 scripts/bench_cat_scripts.py --sizes 10k --compare bench_baseline.txt
+
+QA caches are not used, so every run measures the full work.
+"""
+from __future__ import annotations
+
+import argparse
+import copy
+import gc
+import platform
+import random
+import time
+import tracemalloc
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable
+
+import annotate_cat_sources
+import audit_cat_accuracy
+import choice_index
+import claim_index
+import expand_cat_bank_variants
+import explanation_consistency
+import generate_from_cissp_memory
+import import_mock_exam_results
+import item_quality_lint
+import item_schema
+import near_duplicate_stems
+import source_index
+import validate_cat_bank
+
+SEED = 88
+DEFAULT_SIZES = "10k,100k,1m"
+DEFAULT_THRESHOLD = 0.25
+# Timings this short are mostly noise; they are reported but never flagged.
+MIN_COMPARE_SECONDS = 0.05
+
+DOMAINS = list(validate_cat_bank.BLUEPRINT)
+ROLES = ["security manager", "CISO", "SOC analyst", "auditor", "system owner", "data custodian", "developer"]
+ORGS = ["a regional hospital", "a payment processor", "a SaaS provider", "a government agency", "a manufacturer"]
+TERMS = [
+    "risk assessment", "business impact analysis", "data classification", "least privilege",
+    "separation of duties", "multi-factor authentication", "single sign-on", "federation",
+    "TLS 1.3", "IPsec", "network segmentation", "zero trust", "SIEM correlation", "incident response",
+    "chain of custody", "vulnerability scanning", "penetration testing", "code review",
+    "threat modeling", "secure SDLC", "change management", "configuration baseline",
+    "encryption at rest", "key management", "hashing", "digital signatures", "PKI",
+    "business continuity", "disaster recovery", "RTO", "RPO", "backup rotation",
+    "data retention", "privacy impact assessment", "GDPR", "PCI DSS", "ISO 27001",
+    "SOC 2 report", "vendor risk", "security awareness training", "due care", "due diligence",
+]
+FILLER = [
+    "after a recent audit finding", "while preparing for a regulatory review",
+    "following a reported phishing campaign", "during a merger integration",
+    "before migrating workloads to a public cloud", "after an outage affected customers",
+]
+QUESTION_TAILS = [
+    "Which action should be taken FIRST?",
+    "What is the BEST course of action?",
+    "Which control MOST effectively addresses the concern?",
+    "What should the team do NEXT?",
+]
+ORDERING_STEPS = ["Identify", "Contain", "Eradicate", "Recover", "Review lessons learned", "Report"]
+
+
+def _sentence(rnd: random.Random) -> str:
+    return (
+        f"The {rnd.choice(ROLES)} at {rnd.choice(ORGS)} is reviewing {rnd.choice(TERMS)} "
+        f"{rnd.choice(FILLER)}, and notes that {rnd.choice(TERMS)} and {rnd.choice(TERMS)} are in scope."
+    )
+
+
+def _stem(rnd: random.Random) -> str:
+    return " ".join(_sentence(rnd) for _ in range(rnd.randint(1, 3))) + " " + rnd.choice(QUESTION_TAILS)
+
+
+def _choice(rnd: random.Random) -> str:
+    return f"Apply {rnd.choice(TERMS)} to the {rnd.choice(['affected', 'critical', 'regulated', 'shared'])} systems"
+
+
+def _explanation(rnd: random.Random, correct: str, n_choices: int) -> str:
+    parts = [f"{correct} is correct because it directly addresses {rnd.choice(TERMS)}."]
+    for n in rnd.sample(range(1, n_choices + 1), k=min(2, n_choices)):
+        parts.append(f"Option {n} is not correct because it relies on {rnd.choice(TERMS)} {rnd.choice(FILLER)}.")
+    parts.extend(_sentence(rnd) for _ in range(rnd.randint(1, 3)))
+    return " ".join(parts)
+
+
+def synthetic_item(idx: int, rnd: random.Random, source_ids: list[str]) -> dict[str, Any]:
+    domain_num = rnd.randrange(len(DOMAINS))
+    roll = rnd.random()
+    item_type = "mcq" if roll < 0.86 else ("dragdrop" if roll < 0.93 else "ordering")
+    item: dict[str, Any] = {"id": f"d{domain_num + 1}-q{idx}"}
+    if item_type != "mcq":
+        item["id"] = f"d{domain_num + 1}-pbq-{idx}"
+        item["type"] = item_type
+    item["domain"] = DOMAINS[domain_num]
+    item["stem"] = _stem(rnd)
+
+    if item_type == "ordering":
+        steps = rnd.sample(ORDERING_STEPS, k=5)
+        choices = rnd.sample(steps, k=len(steps))
+        item["choices"] = choices
+        item["correctIndex"] = 0
+        item["correctOrder"] = [choices.index(s) for s in steps]
+    else:
+        choices = list(dict.fromkeys(_choice(rnd) for _ in range(6 if item_type == "dragdrop" else 4)))
+        while len(choices) < 4:
+            choices.append(f"Document the exception for {rnd.choice(TERMS)} ({len(choices)})")
+        item["choices"] = choices
+        item["correctIndex"] = rnd.randrange(len(choices))
+        if item_type == "dragdrop":
+            item["correctAnswers"] = sorted(rnd.sample(range(len(choices)), k=rnd.randint(2, 3)))
+
+    item["difficulty"] = round(rnd.uniform(-1.5, 1.5), 2)
+    item["discrimination"] = round(rnd.uniform(0.7, 1.6), 2)
+    item["questionType"] = "pbq" if item_type != "mcq" else rnd.choice(["scenario", "judgment", "knowledge"])
+    item["explanation"] = _explanation(rnd, item["choices"][item["correctIndex"]], len(item["choices"]))
+    if rnd.random() < 0.3:
+        item["judgmentLevel"] = rnd.randint(1, 3)
+    item["sourceIds"] = ["isc2-cissp-exam-outline-2024"] + rnd.sample(source_ids, k=rnd.randint(1, 4))
+    return item
+
+
+def synthetic_bank(size: int, seed: int = SEED) -> dict[str, Any]:
+    """Seeded bank with the real schema; about a quarter of the items are variants."""
+    rnd = random.Random(seed)
+    source_ids = [sid for sid in annotate_cat_sources.SOURCE_CATALOG if sid != "isc2-cissp-exam-outline-2024"]
+    items: list[dict[str, Any]] = []
+    originals: list[dict[str, Any]] = []
+    for idx in range(size):
+        if originals and rnd.random() < 0.25:
+            base = rnd.choice(originals[-50:])
+            variant = copy.deepcopy(base)
+            variant["id"] = f"{base['id']}__v{idx}"
+            variant["stem"] = f"In a similar situation, {base['stem'][0].lower()}{base['stem'][1:]}"
+            variant["variantOf"] = base["id"]
+            variant["isSyntheticVariant"] = True
+            items.append(variant)
+            continue
+        item = synthetic_item(idx, rnd, source_ids)
+        originals.append(item)
+        items.append(item)
+    return {"items": items, "sourceCatalog": copy.deepcopy(annotate_cat_sources.SOURCE_CATALOG)}
+
+
+def synthetic_mock_text(size: int, seed: int = SEED) -> str:
+    """Mock-exam result text in the format parse_mock_results() reads."""
+    rnd = random.Random(seed)
+    blocks: list[str] = []
+    for n in range(1, size + 1):
+        choices = list(dict.fromkeys(_choice(rnd) for _ in range(4)))
+        correct = rnd.choice(choices)
+        lines = [f"Question {n}{rnd.choice(['Correct', 'Incorrect'])}", _stem(rnd)]
+        for choice in choices:
+            if choice == correct:
+                lines.append("Correct answer")
+            lines.append(choice)
+        lines += ["Overall explanation", _explanation(rnd, correct, len(choices)), "Domain"]
+        lines.append(f"{rnd.randint(1, 8)}. Domain name")
+        blocks.append("\n".join(lines))
+    return "\n".join(blocks) + "\n"
+
+
+def synthetic_topics(seed: int = SEED) -> list[str]:
+    rnd = random.Random(seed)
+    topics = [t for t in TERMS if generate_from_cissp_memory.is_safe_topic(t)]
+    rnd.shuffle(topics)
+    return topics
+
+
+@dataclass
+class BenchResult:
+    name: str
+    size: int
+    wall_s: float
+    peak_mb: float | None
+
+    @property
+    def items_per_s(self) -> float:
+        return self.size / self.wall_s if self.wall_s > 0 else 0.0
+
+
+# Each benchmark gets the shared bank (and size) and returns the call to time.
+# Benchmarks that mutate their input get their own copy here, outside the timing.
+def _bench_validate(bank: dict[str, Any], size: int) -> Callable[[], Any]:
+    return lambda: validate_cat_bank.validate(bank)
+
+
+def _bench_lint(bank: dict[str, Any], size: int) -> Callable[[], Any]:
+    return lambda: item_quality_lint.lint(bank, profile="human")
+
+
+def _bench_audit(bank: dict[str, Any], size: int) -> Callable[[], Any]:
+    return lambda: audit_cat_accuracy.audit(bank["items"])
+
+
+def _bench_annotate(bank: dict[str, Any], size: int) -> Callable[[], Any]:
+    copied = {"items": [dict(item) for item in bank["items"]]}
+    return lambda: annotate_cat_sources.annotate(copied)
+
+
+def _bench_expand(bank: dict[str, Any], size: int) -> Callable[[], Any]:
+    return lambda: expand_cat_bank_variants.expand(dict(bank), 1)
+
+
+def _bench_build_items(bank: dict[str, Any], size: int) -> Callable[[], Any]:
+    topics = synthetic_topics()
+    return lambda: generate_from_cissp_memory.build_items(topics, size, SEED)
+
+
+def _bench_near_duplicates(bank: dict[str, Any], size: int) -> Callable[[], Any]:
+    return lambda: near_duplicate_stems.find_near_duplicates(bank["items"])
+
+
+def _bench_choice_index(bank: dict[str, Any], size: int) -> Callable[[], Any]:
+    return lambda: choice_index.build_report(choice_index.build_choice_index(bank["items"]))
+
+
+def _bench_source_index(bank: dict[str, Any], size: int) -> Callable[[], Any]:
+    return lambda: source_index.build_source_index(bank["items"])
+
+
+def _bench_schema_validate(bank: dict[str, Any], size: int) -> Callable[[], Any]:
+    return lambda: item_schema.validate_bank_items(bank["items"], bank["sourceCatalog"])
+
+
+def _bench_explanation_consistency(bank: dict[str, Any], size: int) -> Callable[[], Any]:
+    return lambda: explanation_consistency.check_consistency(bank["items"])
+
+
+def _bench_claim_index(bank: dict[str, Any], size: int) -> Callable[[], Any]:
+    return lambda: claim_index.build_report(claim_index.build_claim_index(bank["items"]))
+
+
+def _bench_parse_mock_results(bank: dict[str, Any], size: int) -> Callable[[], Any]:
+    raw = synthetic_mock_text(size)
+    return lambda: import_mock_exam_results.parse_mock_results(raw)
+
+
+BENCHES: dict[str, Callable[[dict[str, Any], int], Callable[[], Any]]] = {
+    "validate": _bench_validate,
+    "lint": _bench_lint,
+    "audit": _bench_audit,
+    "annotate": _bench_annotate,
+    "expand": _bench_expand,
+    "build_items": _bench_build_items,
+    "parse_mock_results": _bench_parse_mock_results,
+    "near_duplicates": _bench_near_duplicates,
+    "choice_index": _bench_choice_index,
+    "source_index": _bench_source_index,
+    "schema_validate": _bench_schema_validate,
+    "explanation_consistency": _bench_explanation_consistency,
+    "claim_index": _bench_claim_index,
+}
+
+
+def parse_size(raw: str) -> int:
+    raw = raw.strip().lower()
+    scale = {"k": 1_000, "m": 1_000_000}.get(raw[-1:], 1)
+    return int(float(raw[:-1] if scale > 1 else raw) * scale)
+
+
+def run_bench(name: str, bank: dict[str, Any], size: int, repeat: int, measure_memory: bool) -> BenchResult:
+    make_call = BENCHES[name]
+    best = float("inf")
+    for _ in range(repeat):
+        call = make_call(bank, size)
+        gc.collect()
+        start = time.perf_counter()
+        call()
+        best = min(best, time.perf_counter() - start)
+        del call
+
+    peak_mb: float | None = None
+    if measure_memory:
+        call = make_call(bank, size)
+        gc.collect()
+        tracemalloc.start()
+        try:
+            call()
+            peak_mb = tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+        finally:
+            tracemalloc.stop()
+        del call
+    return BenchResult(name=name, size=size, wall_s=best, peak_mb=peak_mb)
+
+
+def format_results(results: list[BenchResult], seed: int) -> str:
+    lines = [
+        f"# bench_cat_scripts seed={seed} python={platform.python_version()} machine={platform.machine()}",
+        f"{'bench':<20} {'items':>9} {'wall_s':>10} {'peak_mb':>9} {'items_per_s':>12}",
+    ]
+    for r in results:
+        peak = f"{r.peak_mb:.1f}" if r.peak_mb is not None else "-"
+        lines.append(f"{r.name:<20} {r.size:>9} {r.wall_s:>10.4f} {peak:>9} {r.items_per_s:>12.0f}")
+    return "\n".join(lines) + "\n"
+
+
+def read_results(path: Path) -> dict[tuple[str, int], BenchResult]:
+    results: dict[tuple[str, int], BenchResult] = {}
+    for line in path.read_text(encoding="utf-8").splitlines():
+        fields = line.split()
+        if len(fields) != 5 or line.startswith("#") or fields[0] == "bench":
+            continue
+        name, size, wall, peak, _ = fields
+        result = BenchResult(name, int(size), float(wall), None if peak == "-" else float(peak))
+        results[(name, result.size)] = result
+    return results
+
+
+def compare(results: list[BenchResult], baseline: dict[tuple[str, int], BenchResult], threshold: float) -> list[str]:
+    """Regression messages for wall time or peak memory beyond `threshold` (a fraction)."""
+    regressions: list[str] = []
+    for r in results:
+        base = baseline.get((r.name, r.size))
+        if base is None:
+            continue
+        if base.wall_s >= MIN_COMPARE_SECONDS and r.wall_s > base.wall_s * (1 + threshold):
+            pct = (r.wall_s / base.wall_s - 1) * 100
+            regressions.append(f"{r.name}@{r.size}: wall {base.wall_s:.3f}s -> {r.wall_s:.3f}s (+{pct:.0f}%)")
+        if r.peak_mb is not None and base.peak_mb and r.peak_mb > base.peak_mb * (1 + threshold):
+            pct = (r.peak_mb / base.peak_mb - 1) * 100
+            regressions.append(f"{r.name}@{r.size}: peak {base.peak_mb:.1f}MB -> {r.peak_mb:.1f}MB (+{pct:.0f}%)")
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help="comma-separated item counts (k/m suffixes allowed)")
+    parser.add_argument("--only", action="append", choices=sorted(BENCHES), help="run only these benchmarks")
+    parser.add_argument("--repeat", type=int, default=1, help="report the best of N timed runs")
+    parser.add_argument("--no-memory", action="store_true", help="skip the traced peak-memory run")
+    parser.add_argument("--seed", type=int, default=SEED)
+    parser.add_argument("--output", type=Path, default=Path("bench_output.txt"))
+    parser.add_argument("--compare", type=Path, help="baseline bench_output.txt to check for regressions")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="allowed slowdown fraction")
+    args = parser.parse_args()
+
+    names = [n for n in BENCHES if not args.only or n in args.only]
+    sizes = [parse_size(s) for s in args.sizes.split(",") if s.strip()]
+    results: list[BenchResult] = []
+    for size in sizes:
+        bank = synthetic_bank(size, seed=args.seed)
+        for name in names:
+            result = run_bench(name, bank, size, max(1, args.repeat), not args.no_memory)
+            results.append(result)
+            peak = f"{result.peak_mb:.1f}MB" if result.peak_mb is not None else "-"
+            print(f"{name:<20} {size:>9} items  {result.wall_s:8.3f}s  {peak:>9}  {result.items_per_s:10.0f} items/s")
+        del bank
+
+    args.output.write_text(format_results(results, args.seed), encoding="utf-8")
+    print(f"Wrote {args.output}")
+
+    if args.compare:
+        regressions = compare(results, read_results(args.compare), args.threshold)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            return 1
+        print(f"No regressions beyond {args.threshold:.0%} against {args.compare}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
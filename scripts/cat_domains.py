@@ -0,0 +1,37 @@
+"""CISSP blueprint domains and the aliases the bank may use for them.
+
+Kept apart from validate_cat_bank so the index and statistics scripts the
+validator itself calls can share canonical_domain() without importing it.
+"""
+from __future__ import annotations
+
+BLUEPRINT = {
+    "1. Security and Risk Management": 16,
+    "2. Asset Security": 10,
+    "3. Security Architecture and Engineering": 13,
+    "4. Communication and Network Security": 13,
+    "5. Identity and Access Management (IAM)": 13,
+    "6. Security Assessment and Testing": 12,
+    "7. Security Operations": 13,
+    "8. Software Development Security": 10,
+}
+
+DOMAIN_ALIASES = {
+    "1 Security and Risk Management": "1. Security and Risk Management",
+    "2 Asset Security": "2. Asset Security",
+    "3 Security Architecture and Engineering": "3. Security Architecture and Engineering",
+    "4 Communication and Network Security": "4. Communication and Network Security",
+    "5 Identity and Access Management": "5. Identity and Access Management (IAM)",
+    "6 Security Assessment and Testing": "6. Security Assessment and Testing",
+    "7 Security Operations": "7. Security Operations",
+    "8 Software Development Security": "8. Software Development Security",
+}
+
+
+def canonical_domain(raw: str) -> str:
+    raw = str(raw or "").strip()
+    if raw in BLUEPRINT:
+        return raw
+    if raw in DOMAIN_ALIASES:
+        return DOMAIN_ALIASES[raw]
+    return raw
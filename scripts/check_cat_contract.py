@@ -9,6 +9,9 @@ import argparse
 import json
 from pathlib import Path
 
+import item_schema
+from bank_io import journal_path, load_bank_data, read_journal
+
 
 def load_json(path: Path) -> dict:
     return json.loads(path.read_text(encoding="utf-8"))
@@ -24,25 +27,17 @@ def has_pbq_runtime_markers(app_js: str) -> bool:
     return any(m in app_js for m in markers)
 
 
-def main() -> int:
-    parser = argparse.ArgumentParser()
-    parser.add_argument("--bank", type=Path, default=Path("cat/question-bank.sample.json"))
-    parser.add_argument("--app", type=Path, default=Path("cat/app.js"))
-    parser.add_argument("--index", type=Path, default=Path("cat/index.html"))
-    args = parser.parse_args()
-
+def check_contract(
+    bank: dict, runtime: str, index_html: str, schema_json: str | None = None, pending_journal: str = ""
+) -> dict:
     errors: list[str] = []
     warnings: list[str] = []
 
-    bank = load_json(args.bank)
     items = bank.get("items", [])
     if not isinstance(items, list):
         errors.append("question bank is missing top-level 'items' list")
         items = []
 
-    runtime = args.app.read_text(encoding="utf-8")
-    index_html = args.index.read_text(encoding="utf-8")
-
     type_counts: dict[str, int] = {}
     citation_items = 0
     for item in items:
@@ -61,26 +56,67 @@ def main() -> int:
             "bank contains non-MCQ items but CAT runtime does not expose PBQ render/eval handlers"
         )
 
+    if schema_json is not None and schema_json != item_schema.export_text():
+        errors.append(
+            f"{item_schema.DEFAULT_EXPORT} does not match scripts/item_schema.py; run python3 scripts/item_schema.py --export"
+        )
+
+    if pending_journal:
+        errors.append(
+            f"{pending_journal} has items cat/app.js cannot see (it reads only the bank file); run make cat-compact"
+        )
+
     if '<input type="file"' in index_html:
         errors.append("legacy file-upload input found in cat/index.html")
 
     if "Load Sample Bank" in index_html:
         warnings.append("sample-bank UI text found in CAT page; verify this is intentional")
 
+    return {
+        "errors": errors,
+        "warnings": warnings,
+        "item_count": len(items),
+        "type_counts": type_counts,
+        "non_mcq_items": non_mcq,
+        "citation_items": citation_items,
+        "source_catalog_entries": len(source_catalog) if isinstance(source_catalog, dict) else 0,
+        "pbq_runtime_markers": has_pbq_runtime_markers(runtime),
+    }
+
+
+def print_contract(result: dict) -> None:
     print("CONTRACT SUMMARY:")
-    print(f"- items: {len(items)}")
-    print(f"- type_counts: {type_counts}")
-    print(f"- non_mcq_items: {non_mcq}")
-    print(f"- citation_items: {citation_items}/{len(items)}")
-    print(f"- source_catalog_entries: {len(source_catalog) if isinstance(source_catalog, dict) else 0}")
-    print(f"- pbq_runtime_markers: {has_pbq_runtime_markers(runtime)}")
-
-    for w in warnings:
+    print(f"- items: {result['item_count']}")
+    print(f"- type_counts: {result['type_counts']}")
+    print(f"- non_mcq_items: {result['non_mcq_items']}")
+    print(f"- citation_items: {result['citation_items']}/{result['item_count']}")
+    print(f"- source_catalog_entries: {result['source_catalog_entries']}")
+    print(f"- pbq_runtime_markers: {result['pbq_runtime_markers']}")
+
+    for w in result["warnings"]:
         print(f"WARNING: {w}")
-    for e in errors:
+    for e in result["errors"]:
         print(f"ERROR: {e}")
 
-    return 1 if errors else 0
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--bank", type=Path, default=Path("cat/question-bank.sample.json"))
+    parser.add_argument("--app", type=Path, default=Path("cat/app.js"))
+    parser.add_argument("--index", type=Path, default=Path("cat/index.html"))
+    parser.add_argument("--schema", type=Path, default=item_schema.DEFAULT_EXPORT)
+    args = parser.parse_args()
+
+    bank = load_bank_data(args.bank)
+    runtime = args.app.read_text(encoding="utf-8")
+    index_html = args.index.read_text(encoding="utf-8")
+    schema_json = args.schema.read_text(encoding="utf-8") if args.schema.exists() else ""
+
+    pending = str(journal_path(args.bank)) if read_journal(args.bank) else ""
+    result = check_contract(bank, runtime, index_html, schema_json, pending)
+    print_contract(result)
+
+    return 1 if result["errors"] else 0
 
 
 if __name__ == "__main__":
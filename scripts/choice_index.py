@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""Bank-wide inverted index of answer choices, and the leaks it reveals.
+
+Every choice string is normalized the way item_quality_lint compares choices
+(lowercased words, punctuation dropped) and mapped to each place it is used:
+item position, choice position and whether it is that item's key (a
+`correctAnswers` entry for dragdrop items). Ordering and hotspot items are left
+out: their choices are steps and regions, not keys and distractors. Built in one
+pass over the bank, so cross-item checks are dictionary lookups, not pairwise
+scans:
+
+- key_as_distractor: one item's correct answer is another item's distractor in
+  the same domain, so seeing one item gives away (or undermines) the other;
+- overused_choice: a choice string used by `--reuse-threshold` or more items.
+
+The index is written to `cat/question-bank.choice-index.json` (one choice per
+line, in the bank_index layout) and carries the bank sha256, so other tools
+can load it with ChoiceIndex and query it without rebuilding.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+from typing import Any, Iterable, Iterator
+
+from bank_index import BankIndex, ItemTable, default_output, header_lines, mapping_lines
+from bank_io import atomic_write, load_bank
+from item_quality_lint import norm_text
+from qa_timings import PhaseTimer, add_timing_args, cprofile_run
+
+INDEX_FORMAT = "choice-index/1"
+INDEX_SUFFIX = ".choice-index.json"
+DEFAULT_REUSE_THRESHOLD = 100
+EXAMPLE_ITEMS = 20
+# Ordering steps and hotspot regions are not answer options: every one of them is
+# part of the answer, and ordering items carry a placeholder correctIndex.
+UNKEYED_TYPES = {"ordering", "hotspot"}
+
+
+def answer_keys(item: dict[str, Any]) -> set[int]:
+    """Choice positions that are correct: `correctAnswers` for dragdrop, else `correctIndex`."""
+    if item.get("type") == "dragdrop":
+        answers = item.get("correctAnswers")
+        return {k for k in answers if isinstance(k, int)} if isinstance(answers, list) else set()
+    ci = item.get("correctIndex")
+    return {ci} if isinstance(ci, int) else set()
+
+
+def build_choice_index(items: Iterable[dict[str, Any]], source_sha256: str = "") -> dict[str, Any]:
+    """Normalized choice text -> [[item position, choice position, is key], ...]."""
+    table = ItemTable()
+    choices: dict[str, list[list[int]]] = {}
+    for item in items:
+        i = table.add(item)
+        raw = item.get("choices")
+        if not isinstance(raw, list) or item.get("type") in UNKEYED_TYPES:
+            continue
+        keys = answer_keys(item)
+        for pos, choice in enumerate(raw):
+            if not isinstance(choice, str):
+                continue
+            text = norm_text(choice)
+            if text:
+                choices.setdefault(text, []).append([i, pos, int(pos in keys)])
+
+    return {
+        "format": INDEX_FORMAT,
+        "bank_sha256": source_sha256,
+        **table.as_dict(),
+        "choices": choices,
+    }
+
+
+def find_choice_leaks(index: dict[str, Any], reuse_threshold: int = DEFAULT_REUSE_THRESHOLD) -> list[dict[str, Any]]:
+    ids = index["items"]
+    domains = index["domains"]
+    item_domains = index["item_domains"]
+    findings: list[dict[str, Any]] = []
+    for text, uses in index["choices"].items():
+        if len(uses) < 2:
+            continue
+        by_domain: dict[int, tuple[list[int], list[int]]] = {}
+        for item, _, is_key in uses:
+            keys, distractors = by_domain.setdefault(item_domains[item], ([], []))
+            (keys if is_key else distractors).append(item)
+        for code, (keys, distractors) in by_domain.items():
+            # An item repeating its own key as a distractor is a lint duplicate, not a leak.
+            if keys and distractors and len(set(keys) | set(distractors)) > 1:
+                findings.append({
+                    "level": "warning",
+                    "kind": "key_as_distractor",
+                    "choice": text,
+                    "domain": domains[code],
+                    "key_items": [ids[i] for i in dict.fromkeys(keys)],
+                    "distractor_items": [ids[i] for i in dict.fromkeys(distractors)],
+                })
+
+        item_count = len({item for item, _, _ in uses})
+        if item_count >= reuse_threshold:
+            examples = list(dict.fromkeys(item for item, _, _ in uses))[:EXAMPLE_ITEMS]
+            findings.append({
+                "level": "info",
+                "kind": "overused_choice",
+                "choice": text,
+                "item_count": item_count,
+                "key_count": sum(is_key for _, _, is_key in uses),
+                "example_items": [ids[i] for i in examples],
+            })
+    return findings
+
+
+def build_report(index: dict[str, Any], reuse_threshold: int = DEFAULT_REUSE_THRESHOLD) -> dict[str, Any]:
+    findings = find_choice_leaks(index, reuse_threshold)
+    return {
+        "item_count": len(index["items"]),
+        "distinct_choices": len(index["choices"]),
+        "reuse_threshold": reuse_threshold,
+        "key_as_distractor_count": sum(1 for f in findings if f["kind"] == "key_as_distractor"),
+        "overused_choice_count": sum(1 for f in findings if f["kind"] == "overused_choice"),
+        "findings": findings,
+    }
+
+
+def _index_lines(index: dict[str, Any]) -> Iterator[str]:
+    yield from header_lines(index, ("format", "bank_sha256", "items", "domains", "item_domains"))
+    yield '  "choices": '
+    yield from mapping_lines(index["choices"])
+    yield "\n}\n"
+
+
+def write_choice_index(path: Path, index: dict[str, Any]) -> None:
+    atomic_write(path, _index_lines(index))
+
+
+class ChoiceIndex(BankIndex):
+    """Query a written choice index without touching the bank."""
+
+    FORMAT = INDEX_FORMAT
+    LABEL = "Choice index"
+    MAKE_TARGET = "cat-choice-index"
+
+    def __init__(self, data: dict[str, Any]) -> None:
+        super().__init__(data)
+        self._choices: dict[str, list[list[int]]] = data["choices"]
+
+    def __contains__(self, choice: str) -> bool:
+        return norm_text(choice) in self._choices
+
+    def occurrences(self, choice: str) -> list[dict[str, Any]]:
+        """Every use of `choice` (normalized) as {item, domain, position, is_key}."""
+        return [
+            {
+                "item": self.ids[item],
+                "domain": self.domain_of(item),
+                "position": pos,
+                "is_key": bool(is_key),
+            }
+            for item, pos, is_key in self._choices.get(norm_text(choice), [])
+        ]
+
+    def items_using(self, choice: str, as_key: bool | None = None) -> list[str]:
+        uses = self._choices.get(norm_text(choice), [])
+        picked = (item for item, _, is_key in uses if as_key is None or bool(is_key) == as_key)
+        return [self.ids[i] for i in dict.fromkeys(picked)]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("bank_json", type=Path, nargs="?", default=Path("cat/question-bank.sample.json"))
+    parser.add_argument("--out", type=Path, help="index path (default: cat/question-bank.choice-index.json next to the bank)")
+    parser.add_argument("--write-report", type=Path)
+    parser.add_argument("--reuse-threshold", type=int, default=DEFAULT_REUSE_THRESHOLD, help="flag choices used by this many items")
+    parser.add_argument("--check", action="store_true", help="verify the index matches the current bank")
+    parser.add_argument("--fail-on-warning", action="store_true")
+    add_timing_args(parser)
+    args = parser.parse_args()
+
+    out_path = args.out or default_output(args.bank_json, INDEX_SUFFIX)
+    if args.check:
+        return ChoiceIndex.check(out_path, args.bank_json)
+
+    timer = PhaseTimer.from_args(args)
+    with cprofile_run(args):
+        with timer.phase("load"):
+            loaded = load_bank(args.bank_json)
+            items = loaded.data.get("items", []) if isinstance(loaded.data, dict) else []
+
+        with timer.phase("index"):
+            index = build_choice_index(items, source_sha256=loaded.sha256)
+        with timer.phase("write:index"):
+            write_choice_index(out_path, index)
+
+        with timer.phase("leaks"):
+            report = build_report(index, args.reuse_threshold)
+        if args.write_report:
+            timer.write_json(args.write_report, timer.embed(report), "report")
+
+    print(
+        "SUMMARY:",
+        json.dumps(
+            {k: report[k] for k in ("item_count", "distinct_choices", "key_as_distractor_count", "overused_choice_count")},
+            ensure_ascii=False,
+        ),
+    )
+    print(f"Wrote choice index {out_path}")
+    timer.print_summary()
+
+    if args.fail_on_warning and report["key_as_distractor_count"]:
+        return 2
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
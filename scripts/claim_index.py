@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""Bank-wide index of factual claims, and the contradictions it reveals.
+
+Items restate the same facts (breach-notification windows, RTO/RPO/MTD
+relationships, ALE = SLE x ARO, process step order) in their own words. Rather
+than one hand-written regex per fact, claims are extracted generically and
+indexed by subject, so a contradiction is a subject with more than one value:
+
+- quantity: a time span or percentage ("within 72 hours") in an explanation
+  or keyed choice, normalized to hours / percent. Its subject is built from
+  the text since the previous quantity in the sentence: the acronyms there,
+  the nearest FACT_TERMS word ("notify" -> notification) and any severity
+  word. A later quantity in a list keeps the topic it does not restate;
+- comparison: "<ACRONYM> ... less/shorter/greater/longer than <ACRONYM>",
+  keyed by the unordered acronym pair;
+- formula: "<ACRONYM> = <ACRONYM> x <ACRONYM> ...", keyed by the left side;
+- order: every pair of steps in an `ordering` item's correctOrder (the step
+  sequences add_pbq_items.py writes), keyed by the unordered step pair.
+
+Findings are review prompts (info level): legitimately different facts can
+share a subject, so the report lists which items back each value.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import re
+from itertools import combinations
+from pathlib import Path
+from typing import Any, Iterable
+
+from bank_io import BankStream, load_bank_data
+from item_quality_lint import norm_text
+from qa_timings import PhaseTimer, add_timing_args, cprofile_run
+
+DIGIT_RE = re.compile(r"\d")
+SENTENCE_RE = re.compile(r"(?<=[.!?;])\s+")
+ACRONYM_RE = re.compile(r"\b[A-Z][A-Z0-9]{1,5}\b")
+WORD_RE = re.compile(r"[a-z][a-z0-9']+")
+QUANTITY_RE = re.compile(
+    r"\b(\d+(?:\.\d+)?)(?:\s*|-)(minutes?|mins?|hours?|hrs?|days?|weeks?|months?|years?|percent|%)(?!\w)",
+    re.I,
+)
+COMPARISON_RE = re.compile(
+    r"\b([A-Z][A-Z0-9]{1,5})\b[^.;]{0,40}?\b(less|shorter|lower|smaller|greater|longer|higher|more)\s+than\s+"
+    r"(?:the\s+|its\s+|their\s+)?([A-Z][A-Z0-9]{1,5})\b"
+)
+FORMULA_RE = re.compile(r"\b([A-Z]{2,6})\s*=\s*([A-Z]{2,6}(?:\s*[x×*+/]\s*[A-Z]{2,6})+)\b")
+
+# Hours per unit; percentages stay as they are.
+UNIT_HOURS = {
+    "minute": 1 / 60, "min": 1 / 60, "hour": 1.0, "hr": 1.0,
+    "day": 24.0, "week": 168.0, "month": 730.0, "year": 8760.0,
+}
+LESS_WORDS = {"less", "shorter", "lower", "smaller"}
+SUBJECT_WINDOW = 8
+# Words naming what a time span or percentage is about, mapped to one fact name
+# so "notify the supervisory authority" and "notification requires" agree.
+FACT_TERMS = {
+    **dict.fromkeys(("notify", "notified", "notifying", "notification", "notifications", "report", "reported",
+                     "reporting", "disclose", "disclosed", "disclosure", "inform", "informed"), "notification"),
+    **dict.fromkeys(("retain", "retained", "retention", "keep", "kept", "store", "stored", "archive",
+                     "archived", "preserve", "preserved"), "retention"),
+    **dict.fromkeys(("recover", "recovered", "recovery", "restore", "restored", "restoration", "resume",
+                     "resumed", "downtime", "outage", "tolerate", "tolerable"), "recovery"),
+    **dict.fromkeys(("loss", "lose", "lost", "backup", "backups", "backed"), "data loss"),
+    **dict.fromkeys(("patch", "patched", "patching", "remediate", "remediated", "remediation", "fix",
+                     "fixed"), "remediation"),
+    **dict.fromkeys(("rotate", "rotated", "rotation", "expire", "expires", "expiry", "expiration",
+                     "lifetime", "validity", "valid"), "rotation"),
+    **dict.fromkeys(("review", "reviewed", "reviews", "recertify", "recertified", "recertification", "audit",
+                     "audited", "test", "tested", "testing"), "review"),
+    **dict.fromkeys(("uptime", "availability", "available"), "availability"),
+    **dict.fromkeys(("timeout", "idle", "inactivity", "inactive"), "timeout"),
+    **dict.fromkeys(("lockout", "locked"), "lockout"),
+}
+SEVERITY_WORDS = {"critical", "high", "medium", "moderate", "low"}
+
+
+def _fact(words: list[str]) -> str:
+    for word in reversed(words[-SUBJECT_WINDOW:]):
+        fact = FACT_TERMS.get(word)
+        if fact:
+            return fact
+    return ""
+
+
+def _quantity(number: str, unit: str) -> tuple[str, float] | None:
+    unit = unit.lower()
+    if unit in {"%", "percent"}:
+        return "percent", float(number)
+    base = unit[:-1] if unit.endswith("s") else unit
+    hours = UNIT_HOURS.get(base)
+    return ("hours", round(float(number) * hours, 4)) if hours is not None else None
+
+
+def _may_claim(text: str) -> bool:
+    # Every claim pattern needs a digit, "than" or "="; most sentences have none.
+    return "than" in text or "=" in text or DIGIT_RE.search(text) is not None
+
+
+def text_claims(text: str) -> list[tuple[str, str, str]]:
+    """(kind, subject, value) claims stated in free text."""
+    claims: list[tuple[str, str, str]] = []
+    if not _may_claim(text):
+        return claims
+    for sentence in SENTENCE_RE.split(text):
+        if not _may_claim(sentence):
+            continue
+        acronyms: list[str] = []
+        fact = ""
+        start = 0
+        for m in QUANTITY_RE.finditer(sentence):
+            # Only the text since the previous quantity describes this one.
+            segment = sentence[start : m.start()]
+            start = m.end()
+            quantity = _quantity(m.group(1), m.group(2))
+            if quantity is None:
+                continue
+            words = WORD_RE.findall(segment.lower())
+            acronyms = sorted(set(ACRONYM_RE.findall(segment))) or acronyms
+            fact = _fact(words) or fact
+            if not acronyms and not fact:
+                continue
+            severity = sorted({w for w in words[-SUBJECT_WINDOW:] if w in SEVERITY_WORDS})
+            dimension, value = quantity
+            subject = " ".join(acronyms + ([fact] if fact else []) + severity) + f" [{dimension}]"
+            claims.append(("quantity", subject, f"{value:g}"))
+        for m in COMPARISON_RE.finditer(sentence):
+            left, relation, right = m.group(1), m.group(2).lower(), m.group(3)
+            if left == right:
+                continue
+            less = relation in LESS_WORDS
+            if left > right:
+                left, right, less = right, left, not less
+            claims.append(("comparison", f"{left} vs {right}", f"{left} {'<' if less else '>'} {right}"))
+        for m in FORMULA_RE.finditer(sentence):
+            operands = re.split(r"\s*([x×*+/])\s*", m.group(2))
+            terms, ops = operands[::2], set(operands[1::2])
+            # Products are order-independent; anything else is kept as written.
+            if ops <= {"x", "×", "*"}:
+                value = " × ".join(sorted(terms))
+            else:
+                value = " ".join(operands)
+            claims.append(("formula", m.group(1), value))
+    return claims
+
+
+def order_claims(item: dict[str, Any]) -> list[tuple[str, str, str]]:
+    """Pairwise step precedence from an ordering item's correctOrder."""
+    choices = item.get("choices")
+    order = item.get("correctOrder")
+    if item.get("type") != "ordering" or not isinstance(choices, list) or not isinstance(order, list):
+        return []
+    if not all(isinstance(k, int) and 0 <= k < len(choices) for k in order):
+        return []
+    steps = [norm_text(str(choices[k])) for k in order]
+    claims: list[tuple[str, str, str]] = []
+    for a, b in combinations(steps, 2):
+        if not a or not b or a == b:
+            continue
+        first, second = sorted((a, b))
+        claims.append(("order", f"{first} | {second}", f"{a} -> {b}"))
+    return claims
+
+
+def item_claims(item: dict[str, Any]) -> list[tuple[str, str, str]]:
+    claims = text_claims(str(item.get("explanation") or ""))
+    choices = item.get("choices")
+    ci = item.get("correctIndex")
+    if item.get("type") in {None, "mcq"} and isinstance(choices, list) and isinstance(ci, int) and 0 <= ci < len(choices):
+        claims.extend(text_claims(str(choices[ci])))
+    claims.extend(order_claims(item))
+    return claims
+
+
+def build_claim_index(items: Iterable[dict[str, Any]]) -> dict[str, Any]:
+    """kind -> subject -> value -> item ids, in bank order."""
+    index: dict[str, dict[str, dict[str, list[str]]]] = {}
+    item_count = 0
+    claim_count = 0
+    for idx, item in enumerate(items, start=1):
+        item_count = idx
+        iid = str(item.get("id") or idx)
+        for kind, subject, value in item_claims(item):
+            claim_count += 1
+            backers = index.setdefault(kind, {}).setdefault(subject, {}).setdefault(value, [])
+            if not backers or backers[-1] != iid:
+                backers.append(iid)
+    return {"item_count": item_count, "claim_count": claim_count, "index": index}
+
+
+def find_contradictions(index: dict[str, dict[str, dict[str, list[str]]]]) -> list[dict[str, Any]]:
+    findings: list[dict[str, Any]] = []
+    for kind in sorted(index):
+        for subject in sorted(index[kind]):
+            values = index[kind][subject]
+            items = {iid for backers in values.values() for iid in backers}
+            # One item stating two values is a comparison within the item, not a contradiction.
+            if len(values) < 2 or len(items) < 2:
+                continue
+            ranked = sorted(values.items(), key=lambda v: (-len(v[1]), v[0]))
+            findings.append({
+                "level": "info",
+                "kind": f"conflicting_{kind}",
+                "subject": subject,
+                "values": {value: backers for value, backers in ranked},
+                "message": (
+                    f"{len(values)} different values for '{subject}'; most items say "
+                    f"'{ranked[0][0]}' ({len(ranked[0][1])})."
+                ),
+            })
+    return findings
+
+
+def build_report(claims: dict[str, Any]) -> dict[str, Any]:
+    index = claims["index"]
+    findings = find_contradictions(index)
+    return {
+        "item_count": claims["item_count"],
+        "claim_count": claims["claim_count"],
+        "subject_counts": {kind: len(index[kind]) for kind in sorted(index)},
+        "contradiction_count": len(findings),
+        "findings": findings,
+        "index": {kind: index[kind] for kind in sorted(index)},
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("bank_json", type=Path, nargs="?", default=Path("cat/question-bank.sample.json"))
+    parser.add_argument("--write-report", type=Path)
+    parser.add_argument("--stream", action="store_true", help="read items one at a time")
+    add_timing_args(parser)
+    args = parser.parse_args()
+
+    timer = PhaseTimer.from_args(args)
+    with cprofile_run(args):
+        with timer.phase("load"):
+            if args.stream:
+                stream = BankStream(args.bank_json)
+                if not stream.has_item_array:
+                    raise SystemExit("Top-level 'items' must be a list")
+                items: Iterable[dict[str, Any]] = stream.items()
+            else:
+                bank = load_bank_data(args.bank_json)
+                items = bank.get("items", []) if isinstance(bank, dict) else []
+
+        with timer.phase("claims"):
+            report = build_report(build_claim_index(items))
+
+        if args.write_report:
+            timer.write_json(args.write_report, timer.embed(report), "report")
+
+    print(
+        "SUMMARY:",
+        json.dumps({k: report[k] for k in ("item_count", "claim_count", "subject_counts", "contradiction_count")}),
+    )
+    for f in report["findings"][:20]:
+        print(f"{f['level'].upper()}: {f['kind']} - {f['message']}")
+    timer.print_summary()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""Fold a bank's pending delta journal back into the bank JSON file.
+
+Ingestion scripts append new items to `<bank>.journal.jsonl` instead of
+rewriting the whole bank. Python loaders merge the journal transparently, but
+the browser app reads the bank file directly, so compact before publishing.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+
+from bank_io import journal_path, load_bank, read_journal, save_bank
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("bank_json", type=Path, nargs="?", default=Path("cat/question-bank.sample.json"))
+    parser.add_argument("--drop-conflicts", action="store_true", help="discard journal adds whose id is taken")
+    args = parser.parse_args()
+
+    records = read_journal(args.bank_json)
+    if not records:
+        print(f"No pending journal for {args.bank_json}")
+        return 0
+
+    loaded = load_bank(args.bank_json, use_cache=False)
+    bank = loaded.data
+    if loaded.journal_conflicts and not args.drop_conflicts:
+        print(
+            f"Journal adds items whose ids are used by different bank items: {', '.join(loaded.journal_conflicts)}. "
+            "Give them new ids, or pass --drop-conflicts to discard them."
+        )
+        return 1
+    save_bank(args.bank_json, bank)
+    print(
+        json.dumps(
+            {
+                "journal": str(journal_path(args.bank_json)),
+                "records": len(records),
+                "items": len(bank.get("items", [])),
+                "dropped_conflicts": loaded.journal_conflicts,
+            }
+        )
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
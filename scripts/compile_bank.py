@@ -0,0 +1,361 @@
+#!/usr/bin/env python3
+"""Compile the question bank into a compact columnar artifact.
+
+Layout (all integers little-endian, every section 8-byte aligned):
+
+    b"CATCOL01" | u32 header length | u32 reserved | header JSON | sections
+
+The JSON header names each section as `[offset, byte_length, typecode]`
+(typecodes as in the `array` module). Item fields live in per-field columns:
+
+- `str` columns (id, stem, explanation, variantOf) hold u32 indices into one
+  deduplicated string table, so variants that share text store it once;
+- `strlist` columns (choices, sourceIds) hold u32 offsets into a u32 index list;
+- `enum` columns (domain, type, questionType) hold small 1-based codes into
+  the header's `enums` value lists;
+- `i32` / `f64` columns hold correctIndex and the IRT parameters.
+
+Values that do not fit their column's type, and every other field, go to a
+per-item "rest" JSON object in the string table. Each item also records which
+of the header's `keyOrders` it uses, so the round trip is exact. Other top-level
+members (sourceCatalog, ...) are kept as one JSON section.
+
+CompiledBank maps the file and exposes columns as zero-copy memoryviews; items
+and strings are decoded only when asked for.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import mmap
+import struct
+import sys
+from array import array
+from pathlib import Path
+from typing import Any, Iterator
+
+from bank_io import atomic_write, bank_sha256, load_bank
+
+MAGIC = b"CATCOL01"
+FORMAT_VERSION = 1
+NONE = 0xFFFFFFFF
+_PREFIX = struct.Struct("<8sII")
+_ALIGN = 8
+
+COLUMNS: tuple[tuple[str, str], ...] = (
+    ("id", "str"),
+    ("domain", "enum"),
+    ("type", "enum"),
+    ("questionType", "enum"),
+    ("stem", "str"),
+    ("choices", "strlist"),
+    ("correctIndex", "i32"),
+    ("difficulty", "f64"),
+    ("discrimination", "f64"),
+    ("guessing", "f64"),
+    ("explanation", "str"),
+    ("sourceIds", "strlist"),
+    ("variantOf", "str"),
+)
+_COLUMN_KINDS = dict(COLUMNS)
+
+
+def default_output(bank_path: Path) -> Path:
+    """cat/question-bank.sample.json -> cat/question-bank.compiled.bin"""
+    name = bank_path.name
+    for suffix in (".sample.json", ".json"):
+        if name.endswith(suffix):
+            name = name[: -len(suffix)]
+            break
+    return bank_path.with_name(name + ".compiled.bin")
+
+
+def _fits(kind: str, value: Any) -> bool:
+    if kind in {"str", "enum"}:
+        return isinstance(value, str)
+    if kind == "strlist":
+        return isinstance(value, list) and all(isinstance(v, str) for v in value)
+    if kind == "i32":
+        return type(value) is int and -(2**31) <= value < 2**31
+    # JSON keeps 1 and 1.0 apart, so only real floats go in float columns.
+    return type(value) is float
+
+
+class _StringTable:
+    def __init__(self) -> None:
+        self.index: dict[str, int] = {}
+        self.values: list[str] = []
+
+    def add(self, value: str) -> int:
+        idx = self.index.get(value)
+        if idx is None:
+            idx = self.index[value] = len(self.values)
+            self.values.append(value)
+        return idx
+
+
+def _le(arr: array) -> bytes:
+    if sys.byteorder != "little":
+        arr = array(arr.typecode, arr)
+        arr.byteswap()
+    return arr.tobytes()
+
+
+def compile_bank(bank: dict[str, Any], source_sha256: str = "") -> bytes:
+    items = bank.get("items")
+    if not isinstance(items, list) or not all(isinstance(it, dict) for it in items):
+        raise ValueError("Top-level 'items' must be a list of objects to compile the bank")
+
+    strings = _StringTable()
+    enums: dict[str, dict[str, int]] = {name: {} for name, kind in COLUMNS if kind == "enum"}
+    key_orders: dict[tuple[str, ...], int] = {}
+    data: dict[str, array] = {}
+    list_offsets: dict[str, array] = {}
+    for name, kind in COLUMNS:
+        if kind == "strlist":
+            data[name] = array("I")
+            list_offsets[name] = array("I", [0])
+        elif kind == "enum":
+            data[name] = array("H")
+        else:
+            data[name] = array({"str": "I", "i32": "i", "f64": "d"}[kind])
+    key_order_col = array("H")
+    rest_col = array("I")
+
+    for item in items:
+        order = tuple(item.keys())
+        key_order_col.append(key_orders.setdefault(order, len(key_orders)))
+        rest: dict[str, Any] = {}
+        for name, kind in COLUMNS:
+            value = item.get(name)
+            present = name in item
+            fits = present and _fits(kind, value)
+            if present and not fits:
+                rest[name] = value
+            if kind == "str":
+                data[name].append(strings.add(value) if fits else NONE)
+            elif kind == "enum":
+                codes = enums[name]
+                data[name].append(codes.setdefault(value, len(codes) + 1) if fits else 0)
+            elif kind == "strlist":
+                if fits:
+                    data[name].extend(strings.add(v) for v in value)
+                list_offsets[name].append(len(data[name]))
+            elif kind == "i32":
+                data[name].append(value if fits else -1)
+            else:
+                data[name].append(value if fits else float("nan"))
+        for key in order:
+            if key not in _COLUMN_KINDS:
+                rest[key] = item[key]
+        if rest:
+            rest_col.append(strings.add(json.dumps(rest, ensure_ascii=False, separators=(",", ":"))))
+        else:
+            rest_col.append(NONE)
+
+    for name, codes in enums.items():
+        if len(codes) >= 0xFFFF:
+            raise ValueError(f"Too many distinct values for enum column {name!r}")
+    if len(key_orders) >= 0xFFFF:
+        raise ValueError("Too many distinct item key orders to compile the bank")
+
+    blobs: list[tuple[str, bytes, str]] = []
+
+    def section(name: str, payload: bytes, typecode: str) -> None:
+        blobs.append((name, payload, typecode))
+
+    encoded = [s.encode("utf-8") for s in strings.values]
+    str_offsets = array("I", [0])
+    for raw in encoded:
+        str_offsets.append(str_offsets[-1] + len(raw))
+    section("strings.offsets", _le(str_offsets), "I")
+    section("strings.data", b"".join(encoded), "B")
+    section("keyOrder", _le(key_order_col), "H")
+    section("rest", _le(rest_col), "I")
+    for name, kind in COLUMNS:
+        if kind == "enum" and len(enums[name]) < 0xFF:
+            col = array("B", data[name])
+        else:
+            col = data[name]
+        section(f"{name}.data", _le(col), col.typecode)
+        if kind == "strlist":
+            section(f"{name}.offsets", _le(list_offsets[name]), "I")
+    members = {k: v for k, v in bank.items() if k != "items"}
+    section("members", json.dumps(members, ensure_ascii=False, separators=(",", ":")).encode("utf-8"), "B")
+
+    layout: dict[str, list[Any]] = {}
+    offset = 0
+    for name, payload, typecode in blobs:
+        layout[name] = [offset, len(payload), typecode]
+        offset += -(-len(payload) // _ALIGN) * _ALIGN
+
+    header = {
+        "version": FORMAT_VERSION,
+        "sourceSha256": source_sha256,
+        "count": len(items),
+        "layout": list(bank.keys()),
+        "columns": {name: kind for name, kind in COLUMNS},
+        "enums": {name: list(codes) for name, codes in enums.items()},
+        "keyOrders": [list(order) for order in key_orders],
+        "strings": len(strings.values),
+        "sections": layout,
+    }
+    header_bytes = json.dumps(header, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    header_bytes += b" " * (-(_PREFIX.size + len(header_bytes)) % _ALIGN)
+
+    out = bytearray(_PREFIX.pack(MAGIC, len(header_bytes), 0))
+    out += header_bytes
+    base = len(out)
+    for name, payload, _ in blobs:
+        out += b"\0" * (base + layout[name][0] - len(out))
+        out += payload
+    return bytes(out)
+
+
+def write_compiled(bank_path: Path, out_path: Path) -> tuple[int, int]:
+    """Compile `bank_path` (base + journal) to `out_path`; returns (items, bytes)."""
+    loaded = load_bank(bank_path)
+    payload = compile_bank(loaded.data, source_sha256=loaded.sha256)
+    atomic_write(out_path, [payload])
+    return len(loaded.data["items"]), len(payload)
+
+
+class CompiledBank:
+    """Memory-mapped reader for a compiled bank; columns are zero-copy views."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        with self.path.open("rb") as fh:
+            self._mm = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, header_len, _ = _PREFIX.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{self.path} is not a compiled question bank")
+        self.header: dict[str, Any] = json.loads(self._mm[_PREFIX.size : _PREFIX.size + header_len])
+        if self.header.get("version") != FORMAT_VERSION:
+            raise ValueError(f"Unsupported compiled bank version: {self.header.get('version')}")
+        self._base = _PREFIX.size + header_len
+        self._view = memoryview(self._mm)
+        self._sections: dict[str, Any] = {}
+        self._str_offsets = self._section("strings.offsets")
+        self._str_data = self._section("strings.data")
+        self._key_orders = [tuple(order) for order in self.header["keyOrders"]]
+        self._enums = self.header["enums"]
+
+    def close(self) -> None:
+        self._sections.clear()
+        self._str_offsets = self._str_data = None
+        try:
+            self._view.release()
+            self._mm.close()
+        except BufferError:
+            # A caller still holds a column view; the mapping is freed with it.
+            pass
+
+    def __enter__(self) -> "CompiledBank":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return int(self.header["count"])
+
+    @property
+    def source_sha256(self) -> str:
+        return str(self.header.get("sourceSha256", ""))
+
+    def _section(self, name: str) -> Any:
+        view = self._sections.get(name)
+        if view is None:
+            offset, length, typecode = self.header["sections"][name]
+            raw = self._view[self._base + offset : self._base + offset + length]
+            if typecode == "B":
+                view = raw
+            elif sys.byteorder == "little":
+                view = raw.cast(typecode)
+            else:
+                arr = array(typecode, raw.tobytes())
+                arr.byteswap()
+                view = memoryview(arr)
+            self._sections[name] = view
+        return view
+
+    def string(self, idx: int) -> str:
+        return str(self._str_data[self._str_offsets[idx] : self._str_offsets[idx + 1]], "utf-8")
+
+    def column(self, name: str) -> Any:
+        """Raw per-item values of a column (string indices, enum codes or numbers)."""
+        return self._section(f"{name}.data")
+
+    def enum_values(self, name: str) -> list[str]:
+        """Values of an enum column; code `n` is `enum_values(name)[n - 1]`, 0 is absent."""
+        return list(self._enums[name])
+
+    def members(self) -> dict[str, Any]:
+        return json.loads(bytes(self._section("members")))
+
+    def _value(self, name: str, i: int) -> Any:
+        kind = _COLUMN_KINDS[name]
+        if kind == "strlist":
+            offsets = self._section(f"{name}.offsets")
+            return [self.string(s) for s in self.column(name)[offsets[i] : offsets[i + 1]]]
+        raw = self.column(name)[i]
+        if kind == "str":
+            return self.string(raw)
+        if kind == "enum":
+            return self._enums[name][raw - 1]
+        return raw
+
+    def item(self, i: int) -> dict[str, Any]:
+        rest_idx = self._section("rest")[i]
+        rest = json.loads(self.string(rest_idx)) if rest_idx != NONE else {}
+        item: dict[str, Any] = {}
+        for key in self._key_orders[self._section("keyOrder")[i]]:
+            item[key] = rest[key] if key in rest else self._value(key, i)
+        return item
+
+    def items(self) -> Iterator[dict[str, Any]]:
+        for i in range(len(self)):
+            yield self.item(i)
+
+    def ids(self) -> list[str]:
+        col = self.column("id")
+        return [self.string(idx) if idx != NONE else "" for idx in col]
+
+    def to_bank(self) -> dict[str, Any]:
+        members = self.members()
+        bank: dict[str, Any] = {}
+        for key in self.header["layout"]:
+            bank[key] = list(self.items()) if key == "items" else members[key]
+        return bank
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("bank_json", type=Path, nargs="?", default=Path("cat/question-bank.sample.json"))
+    parser.add_argument("--out", type=Path, help="default: cat/question-bank.compiled.bin next to the bank")
+    parser.add_argument("--check", action="store_true", help="verify the artifact is current and round-trips")
+    args = parser.parse_args()
+
+    out_path = args.out or default_output(args.bank_json)
+    if args.check:
+        if not out_path.exists():
+            print(f"Compiled bank missing: {out_path}")
+            return 1
+        with CompiledBank(out_path) as compiled:
+            if compiled.source_sha256 != bank_sha256(args.bank_json):
+                print(f"Compiled bank is stale: {out_path} (run make cat-compile)")
+                return 1
+            if compiled.to_bank() != load_bank(args.bank_json).data:
+                print(f"Compiled bank does not round-trip: {out_path}")
+                return 1
+        print(f"Compiled bank OK: {out_path}")
+        return 0
+
+    count, size = write_compiled(args.bank_json, out_path)
+    print(f"Compiled {count} items from {args.bank_json} into {out_path} ({size} bytes)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
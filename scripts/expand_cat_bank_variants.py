@@ -11,11 +11,12 @@ from __future__ import annotations
 import argparse
 import copy
 import hashlib
-import json
 import re
 from pathlib import Path
 from typing import Any
 
+from bank_io import load_bank_data, save_bank
+
 LEADS = [
     "From a CISSP perspective,",
     "In this situation,",
@@ -108,11 +109,11 @@ def main() -> int:
     ap.add_argument("--out", type=Path)
     args = ap.parse_args()
 
-    raw = json.loads(args.bank.read_text(encoding="utf-8"))
+    raw = load_bank_data(args.bank)
     expanded, original_count = expand(raw, args.variants_per_item)
 
     out_path = args.bank if args.in_place or not args.out else args.out
-    out_path.write_text(json.dumps(expanded, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+    save_bank(out_path, expanded)
 
     new_count = len(expanded.get("items", []))
     print(f"Expanded bank written to {out_path}")
@@ -13,6 +13,8 @@ import json
 import random
 from pathlib import Path
 
+from bank_io import load_bank_data, save_bank
+
 
 STEM_PREFIXES = [
     "During a governance review, ",
@@ -29,7 +31,7 @@ STEM_PREFIXES = [
 
 
 def load_bank(path: Path) -> dict:
-    return json.loads(path.read_text(encoding="utf-8"))
+    return load_bank_data(path)
 
 
 def shuffled_mcq(item: dict, rnd: random.Random) -> tuple[list[str], int]:
@@ -123,7 +125,7 @@ def main() -> int:
         raise SystemExit("Bank has no items to expand.")
 
     bank["items"] = expand_items(items, args.target, args.seed)
-    args.bank.write_text(json.dumps(bank, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+    save_bank(args.bank, bank)
     print(json.dumps({"items": len(bank["items"]), "target": args.target, "seed": args.seed}))
     return 0
 
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""Explanation-to-key consistency check by TF-IDF similarity.
+
+Most explanations never say "Option N is correct", so the pattern checks in
+audit_cat_accuracy.py cannot tell when an explanation argues for a distractor.
+This pass tokenizes every choice and explanation once, weights terms by
+TF-IDF over that whole corpus (sublinear tf, smoothed idf, L2-normalized
+rows) and scores each choice against its own item's explanation. An item is
+flagged when its best-matching distractor beats the keyed choice by at least
+`margin` cosine similarity.
+
+With NumPy the choice/explanation products are computed for the whole bank at
+once from the sparse (document, term, weight) entries; without it (or with
+CAT_STATS_NUMPY=0) the same numbers come from plain Python. Similarities are
+rounded so both backends flag the same items.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import os
+from collections import Counter
+from itertools import chain
+from pathlib import Path
+from typing import Any, Iterable
+
+from bank_io import load_bank_data
+from item_quality_lint import words
+
+try:
+    import numpy as np
+except ImportError:  # optional: plain-Python fallback below
+    np = None
+
+NUMPY_ENV = "CAT_STATS_NUMPY"
+PBQ_TYPES = {"dragdrop", "ordering", "hotspot"}
+DEFAULT_MARGIN = 0.15
+# Distractors scoring below this are not evidence of anything.
+MIN_DISTRACTOR_SIMILARITY = 0.2
+ROUND = 4
+
+
+def numpy_enabled() -> bool:
+    return np is not None and os.environ.get(NUMPY_ENV, "1").strip().lower() not in {"0", "false", "no", "off"}
+
+
+class _Corpus:
+    """Sparse TF-IDF rows for every explanation and choice of the checked items."""
+
+    def __init__(self, items: Iterable[dict[str, Any]]) -> None:
+        self.ids: list[str] = []
+        self.keys: list[int] = []
+        # choice_item[c] / choice_pos[c]: owning item and position of choice row c.
+        self.choice_item: list[int] = []
+        self.choice_pos: list[int] = []
+        self.choice_text: list[str] = []
+        self.item_count = 0
+        vocab: dict[str, int] = {}
+        # Variants share explanations and many choices repeat across items, so
+        # each distinct text is tokenized once.
+        parsed: dict[str, dict[int, int]] = {}
+
+        def term_counts(text: str) -> dict[int, int]:
+            row = parsed.get(text)
+            if row is None:
+                row = parsed[text] = {vocab.setdefault(w, len(vocab)): n for w, n in Counter(words(text)).items()}
+            return row
+
+        explanation_rows: list[dict[int, int]] = []
+        choice_rows: list[dict[int, int]] = []
+        for idx, item in enumerate(items, start=1):
+            self.item_count = idx
+            choices = item.get("choices")
+            ci = item.get("correctIndex")
+            if item.get("type") in PBQ_TYPES or not isinstance(choices, list) or len(choices) < 2:
+                continue
+            if not isinstance(ci, int) or isinstance(ci, bool) or not 0 <= ci < len(choices):
+                continue
+            explanation = str(item.get("explanation") or "")
+            if not explanation.strip():
+                continue
+            n = len(self.ids)
+            self.ids.append(str(item.get("id") or idx))
+            self.keys.append(ci)
+            explanation_rows.append(term_counts(explanation))
+            for pos, choice in enumerate(choices):
+                text = str(choice)
+                self.choice_item.append(n)
+                self.choice_pos.append(pos)
+                self.choice_text.append(text)
+                choice_rows.append(term_counts(text))
+
+        self.vocab_size = len(vocab)
+        df = [0] * self.vocab_size
+        for row in explanation_rows:
+            for t in row:
+                df[t] += 1
+        for row in choice_rows:
+            for t in row:
+                df[t] += 1
+        docs = len(explanation_rows) + len(choice_rows)
+        self.idf = [math.log((1 + docs) / (1 + d)) + 1 for d in df]
+        self.explanation_rows = explanation_rows
+        self.choice_rows = choice_rows
+
+
+def _weighted(row: dict[int, int], idf: list[float]) -> dict[int, float]:
+    weights = {t: (1 + math.log(n)) * idf[t] for t, n in row.items()}
+    norm = math.sqrt(sum(w * w for w in weights.values()))
+    return {t: w / norm for t, w in weights.items()} if norm else weights
+
+
+def _similarities_python(corpus: _Corpus) -> list[float]:
+    explanations = [_weighted(row, corpus.idf) for row in corpus.explanation_rows]
+    sims: list[float] = []
+    for item, row in zip(corpus.choice_item, corpus.choice_rows):
+        explanation = explanations[item]
+        choice = _weighted(row, corpus.idf)
+        sims.append(sum(w * explanation.get(t, 0.0) for t, w in choice.items()))
+    return sims
+
+
+def _coo(rows: list[dict[int, int]], idf: Any) -> tuple[Any, Any, Any]:
+    """(row, term, L2-normalized weight) arrays for sparse TF-IDF rows."""
+    lengths = np.fromiter(map(len, rows), dtype=np.int64, count=len(rows))
+    total = int(lengths.sum())
+    terms = np.fromiter(chain.from_iterable(rows), dtype=np.int64, count=total)
+    counts = np.fromiter(chain.from_iterable(r.values() for r in rows), dtype=np.float64, count=total)
+    row_ids = np.repeat(np.arange(len(rows), dtype=np.int64), lengths)
+    weights = (1 + np.log(counts)) * idf[terms]
+    norms = np.sqrt(np.bincount(row_ids, weights * weights, minlength=len(rows)))
+    safe = np.where(norms[row_ids] > 0, norms[row_ids], 1.0)
+    return row_ids, terms, weights / safe
+
+
+def _similarities_numpy(corpus: _Corpus) -> Any:
+    idf = np.asarray(corpus.idf, dtype=np.float64)
+    vocab = max(corpus.vocab_size, 1)
+    e_rows, e_terms, e_weights = _coo(corpus.explanation_rows, idf)
+    c_rows, c_terms, c_weights = _coo(corpus.choice_rows, idf)
+
+    # Each choice only meets its own item's explanation: join the (item, term)
+    # keys of choice entries against the sorted explanation keys.
+    e_keys = e_rows * vocab + e_terms
+    order = np.argsort(e_keys, kind="stable")
+    e_keys, e_weights = e_keys[order], e_weights[order]
+    c_keys = np.asarray(corpus.choice_item, dtype=np.int64)[c_rows] * vocab + c_terms
+    if not len(e_keys):
+        return np.zeros(len(corpus.choice_rows))
+    at = np.minimum(np.searchsorted(e_keys, c_keys), len(e_keys) - 1)
+    products = np.where(e_keys[at] == c_keys, c_weights * e_weights[at], 0.0)
+    return np.bincount(c_rows, products, minlength=len(corpus.choice_rows))
+
+
+def check_consistency(
+    items: Iterable[dict[str, Any]], margin: float = DEFAULT_MARGIN, use_numpy: bool | None = None
+) -> dict[str, Any]:
+    corpus = _Corpus(items)
+    if use_numpy is None:
+        use_numpy = numpy_enabled()
+    if use_numpy and corpus.choice_rows:
+        sims = [round(float(s), ROUND) for s in _similarities_numpy(corpus)]
+    else:
+        sims = [round(s, ROUND) for s in _similarities_python(corpus)]
+
+    findings: list[dict[str, Any]] = []
+    start = 0
+    for n, iid in enumerate(corpus.ids):
+        end = start
+        while end < len(sims) and corpus.choice_item[end] == n:
+            end += 1
+        key = corpus.keys[n]
+        key_sim = sims[start + key]
+        best = max((c for c in range(start, end) if corpus.choice_pos[c] != key), key=lambda c: sims[c])
+        best_sim = sims[best]
+        if best_sim >= MIN_DISTRACTOR_SIMILARITY and round(best_sim - key_sim, ROUND) >= margin:
+            findings.append({
+                "level": "warning",
+                "item": iid,
+                "kind": "explanation_favors_distractor",
+                "message": (
+                    f"Explanation matches choice {corpus.choice_pos[best] + 1} ({best_sim}) better than "
+                    f"the key, choice {key + 1} ({key_sim})."
+                ),
+                "key_similarity": key_sim,
+                "distractor": corpus.choice_pos[best],
+                "distractor_similarity": best_sim,
+                "distractor_text": corpus.choice_text[best],
+            })
+        start = end
+
+    return {
+        "item_count": corpus.item_count,
+        "checked_items": len(corpus.ids),
+        "margin": margin,
+        "flagged_count": len(findings),
+        "findings": findings,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("bank_json", type=Path, nargs="?", default=Path("cat/question-bank.sample.json"))
+    parser.add_argument("--margin", type=float, default=DEFAULT_MARGIN, help="flag when a distractor beats the key by this much")
+    parser.add_argument("--python", action="store_true", help="use the plain-Python backend even if NumPy is installed")
+    args = parser.parse_args()
+
+    bank = load_bank_data(args.bank_json)
+    items = bank.get("items", []) if isinstance(bank, dict) else []
+    report = check_consistency(items, args.margin, use_numpy=False if args.python else None)
+    for f in report["findings"]:
+        print(f"{f['level'].upper()}: [{f['item']}] {f['kind']} - {f['message']}")
+    print("SUMMARY:", json.dumps({k: report[k] for k in ("item_count", "checked_items", "flagged_count")}))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
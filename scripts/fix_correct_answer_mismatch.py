@@ -2,11 +2,12 @@
 from __future__ import annotations
 
 import argparse
-import json
 import re
 from pathlib import Path
 from typing import Any
 
+from bank_io import load_bank_data, save_bank
+
 CORRECT_ANSWER_RE = re.compile(r"(\bCorrect\s+Answer\s*:\s*)(.+?)(?=(?:\.\s|$))", re.I)
 
 
@@ -21,7 +22,7 @@ def main() -> int:
     ap.add_argument("--out", type=Path)
     args = ap.parse_args()
 
-    bank = json.loads(args.bank.read_text(encoding="utf-8"))
+    bank = load_bank_data(args.bank)
     items = bank.get("items")
     if not isinstance(items, list):
         raise SystemExit("Top-level 'items' must be a list")
@@ -53,7 +54,7 @@ def main() -> int:
             changed += 1
 
     out_path = args.bank if args.in_place or not args.out else args.out
-    out_path.write_text(json.dumps(bank, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+    save_bank(out_path, bank)
     print(f"examined_with_correct_answer_field: {examined}")
     print(f"updated_items: {changed}")
     print(f"wrote: {out_path}")
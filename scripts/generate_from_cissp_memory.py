@@ -11,8 +11,11 @@ import argparse
 import json
 import random
 import re
+import sys
 from pathlib import Path
 
+from bank_io import append_journal, journal_note, load_bank_data, save_bank
+
 
 BANNED_TOPIC_PATTERNS = [
     r"sybex",
@@ -170,21 +173,37 @@ def main() -> int:
     memory_obj = json.loads(args.memory.read_text(encoding="utf-8"))
     topics = extract_topics(memory_obj)
 
-    bank = json.loads(args.bank.read_text(encoding="utf-8"))
+    bank = load_bank_data(args.bank)
     generated = build_items(topics, args.target, args.seed)
 
-    if args.replace_items:
+    source_catalog = json.loads(args.catalog.read_text(encoding="utf-8"))
+    existing = bank.get("items", [])
+    if args.replace_items or not isinstance(existing, list):
+        # Replacing items is an explicit full rewrite of the bank.
         bank["items"] = generated
+        bank["sourceCatalog"] = source_catalog
+        save_bank(args.bank, bank)
+        total_items = len(generated)
+        skipped: list[str] = []
     else:
-        existing = bank.get("items", [])
-        if not isinstance(existing, list):
-            existing = []
-        bank["items"] = existing + generated
-
-    bank["sourceCatalog"] = json.loads(args.catalog.read_text(encoding="utf-8"))
-    args.bank.write_text(json.dumps(bank, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
-
-    print(json.dumps({"safe_topics": len(topics), "generated": len(generated), "total_items": len(bank["items"])}))
+        # Generated ids are fixed (mem-origin-qNNNNN), so a rerun regenerates ids already in the bank.
+        existing_ids = {str(it.get("id")) for it in existing if isinstance(it, dict)}
+        new_items = [it for it in generated if it["id"] not in existing_ids]
+        skipped = [it["id"] for it in generated if it["id"] in existing_ids]
+        members = {} if bank.get("sourceCatalog") == source_catalog else {"sourceCatalog": source_catalog}
+        append_journal(args.bank, new_items, members=members)
+        total_items = len(existing) + len(new_items)
+        if new_items:
+            print(journal_note(args.bank), file=sys.stderr)
+
+    print(
+        json.dumps({
+            "safe_topics": len(topics),
+            "generated": len(generated),
+            "skipped_existing_ids": len(skipped),
+            "total_items": total_items,
+        })
+    )
     return 0
 
 
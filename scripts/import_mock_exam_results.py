@@ -5,9 +5,12 @@ from __future__ import annotations
 import argparse
 import json
 import re
+import sys
 from pathlib import Path
 from typing import Any
 
+from bank_io import append_journal, journal_note, load_bank_data
+
 DOMAIN_MAP = {
     "1": "1. Security and Risk Management",
     "2": "2. Asset Security",
@@ -166,19 +169,19 @@ def main() -> int:
     if args.write_parsed:
         args.write_parsed.write_text(json.dumps(parsed, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
 
-    bank = json.loads(args.bank_file.read_text(encoding="utf-8"))
+    bank = load_bank_data(args.bank_file)
     items = bank["items"]
     existing = {norm(it["stem"]) for it in items}
     next_ids = next_id_by_domain(items)
 
-    added = 0
+    new_items: list[dict[str, Any]] = []
     skipped = 0
     for entry in parsed:
         if norm(entry["stem"]) in existing:
             skipped += 1
             continue
         domain_num = int(str(entry["domain"]).split(".")[0])
-        items.append(
+        new_items.append(
             {
                 "id": f"d{domain_num}-q{next_ids[domain_num]}",
                 "domain": entry["domain"],
@@ -192,10 +195,11 @@ def main() -> int:
         )
         next_ids[domain_num] += 1
         existing.add(norm(entry["stem"]))
-        added += 1
 
-    args.bank_file.write_text(json.dumps(bank, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+    added = append_journal(args.bank_file, new_items)
     print(json.dumps({"parsed": len(parsed), "added": added, "skipped": skipped}, ensure_ascii=False))
+    if added:
+        print(journal_note(args.bank_file), file=sys.stderr)
     return 0
 
 
@@ -12,11 +12,22 @@ Notes:
 from __future__ import annotations
 
 import argparse
+import itertools
 import json
+import multiprocessing
+import os
 import re
-from collections import Counter
+import time
+from collections import Counter, deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable, Iterable, Iterator
+
+from bank_io import BankStream, item_hash, load_bank_data
+from qa_cache import QACache, cached_item, code_fingerprint
+from qa_timings import PhaseTimer, add_timing_args, cprofile_run
+from quality_report import read_quality_report, write_quality_report
 
 ABSOLUTE_TERMS = {
     "always",
@@ -84,8 +95,15 @@ ROLE_WORDS = {
     "organization",
 }
 
+# One alternation per pattern list, so each text is scanned once.
+NEGATIVE_RE = re.compile("|".join(f"(?:{p.pattern})" for p in NEGATIVE_PATTERNS))
+CUE_RE = re.compile("|".join(f"(?:{p.pattern})" for p in CUE_PATTERNS), re.I)
+
 WORD_RE = re.compile(r"[A-Za-z0-9']+")
 
+# Items per pool task when linting a streamed bank with --jobs.
+STREAM_LINT_CHUNK = 512
+
 
 def words(text: str) -> list[str]:
     return WORD_RE.findall(text.lower())
@@ -96,7 +114,7 @@ def norm_text(text: str) -> str:
 
 
 def has_negative_stem(stem: str) -> bool:
-    return any(p.search(stem) for p in NEGATIVE_PATTERNS)
+    return NEGATIVE_RE.search(stem) is not None
 
 
 def choice_length_stats(choices: list[str]) -> tuple[int, int, float]:
@@ -124,113 +142,271 @@ def add_finding(
     findings.append({"level": level, "kind": kind, "item": item, "message": message})
 
 
-def item_quality(item: dict[str, Any], idx: int, profile: str = "human") -> tuple[int, list[dict[str, str]]]:
-    findings: list[dict[str, str]] = []
-    score = 100
-
-    iid = str(item.get("id") or idx)
-    stem = str(item.get("stem") or "")
-    choices = item.get("choices") if isinstance(item.get("choices"), list) else []
-    explanation = str(item.get("explanation") or "")
-    ci = item.get("correctIndex")
-
-    if not stem.strip():
-        add_finding(findings, "error", "missing_stem", iid, "Missing stem.")
-        score -= 60
-
-    if not choices or len(choices) < 2:
-        add_finding(findings, "error", "invalid_choices", iid, "Missing or invalid choices.")
-        score -= 60
-
-    if not isinstance(ci, int) or ci < 0 or ci >= len(choices):
-        add_finding(findings, "error", "invalid_correct_index", iid, "Invalid correctIndex.")
-        score -= 60
-
-    stem_words = words(stem)
-    stem_wc = len(stem_words)
-    if stem_wc < 10:
-        add_finding(findings, "warning" if profile == "strict" else "info", "stem_too_short", iid, "Stem is very short; may test recall only.")
-        score -= 8
-    elif stem_wc > 120:
-        add_finding(findings, "warning" if profile == "strict" else "info", "stem_too_long", iid, "Stem is very long; may add reading-load noise.")
-        score -= 5
-
-    if has_negative_stem(stem):
-        add_finding(findings, "warning", "negative_stem", iid, "Negative stem wording (NOT/EXCEPT/LEAST) can increase construct-irrelevant difficulty.")
-        score -= 7
-
-    absolute_hits = sorted({w for w in stem_words if w in ABSOLUTE_TERMS})
+@dataclass
+class ItemView:
+    """One item tokenized once; every rule reads from this view."""
+
+    iid: str
+    stem: str
+    choices: list[Any]
+    explanation: str
+    ci: Any
+    question_type: str
+    judgment: Any
+    stem_words: list[str]
+    stem_set: set[str]
+    stem_content: set[str]
+    choice_texts: list[str]
+    normalized_choices: list[str]
+    choice_content: list[set[str]]
+    explanation_wc: int
+
+    @classmethod
+    def analyze(cls, item: dict[str, Any], idx: int) -> "ItemView":
+        stem = str(item.get("stem") or "")
+        choices = item.get("choices") if isinstance(item.get("choices"), list) else []
+        explanation = str(item.get("explanation") or "")
+        stem_words = words(stem)
+        choice_texts = [str(c) for c in choices]
+        choice_words = [words(c) for c in choice_texts]
+        return cls(
+            iid=str(item.get("id") or idx),
+            stem=stem,
+            choices=choices,
+            explanation=explanation,
+            ci=item.get("correctIndex"),
+            question_type=str(item.get("questionType") or "scenario"),
+            judgment=item.get("judgmentLevel"),
+            stem_words=stem_words,
+            stem_set=set(stem_words),
+            stem_content={w for w in stem_words if len(w) > 2},
+            choice_texts=choice_texts,
+            normalized_choices=[" ".join(cw) for cw in choice_words],
+            choice_content=[{w for w in cw if len(w) > 2} for cw in choice_words],
+            explanation_wc=len(words(explanation)),
+        )
+
+    @property
+    def has_valid_key(self) -> bool:
+        return isinstance(self.ci, int) and 0 <= self.ci < len(self.choices)
+
+    def stem_overlap(self, choice_idx: int) -> float:
+        """lexical_overlap(stem, choice) over the pre-tokenized sets."""
+        wb = self.choice_content[choice_idx]
+        if not self.stem_content or not wb:
+            return 0.0
+        return len(self.stem_content & wb) / max(1, len(wb))
+
+
+@dataclass
+class Hit:
+    """A rule outcome: a finding (when `level` is set) and/or a score delta."""
+
+    kind: str
+    delta: int = 0
+    level: str | None = None
+    message: str = ""
+
+
+def _soft(profile: str) -> str:
+    return "warning" if profile == "strict" else "info"
+
+
+def rule_schema(v: ItemView, profile: str) -> list[Hit]:
+    hits: list[Hit] = []
+    if not v.stem.strip():
+        hits.append(Hit("missing_stem", -60, "error", "Missing stem."))
+    if not v.choices or len(v.choices) < 2:
+        hits.append(Hit("invalid_choices", -60, "error", "Missing or invalid choices."))
+    if not v.has_valid_key:
+        hits.append(Hit("invalid_correct_index", -60, "error", "Invalid correctIndex."))
+    return hits
+
+
+def rule_stem_length(v: ItemView, profile: str) -> list[Hit]:
+    if len(v.stem_words) < 10:
+        return [Hit("stem_too_short", -8, _soft(profile), "Stem is very short; may test recall only.")]
+    if len(v.stem_words) > 120:
+        return [Hit("stem_too_long", -5, _soft(profile), "Stem is very long; may add reading-load noise.")]
+    return []
+
+
+def rule_negative_stem(v: ItemView, profile: str) -> list[Hit]:
+    if has_negative_stem(v.stem):
+        return [Hit("negative_stem", -7, "warning", "Negative stem wording (NOT/EXCEPT/LEAST) can increase construct-irrelevant difficulty.")]
+    return []
+
+
+def rule_absolute_wording(v: ItemView, profile: str) -> list[Hit]:
+    absolute_hits = sorted(v.stem_set & ABSOLUTE_TERMS)
     if absolute_hits:
-        add_finding(findings, "warning" if profile == "strict" else "info", "absolute_wording", iid, f"Absolute wording in stem: {', '.join(absolute_hits)}.")
-        score -= 4
-
-    normalized_choices = [norm_text(str(c)) for c in choices]
-    dup_counts = Counter(normalized_choices)
-    dups = [c for c, n in dup_counts.items() if c and n > 1]
-    if dups:
-        add_finding(findings, "error", "duplicate_choices", iid, "Duplicate or near-identical choices detected.")
-        score -= 35
-
-    for c in choices:
-        c_str = str(c)
-        if any(p.search(c_str) for p in CUE_PATTERNS):
-            add_finding(findings, "warning", "testwise_cue", iid, "Choice uses test-wise cue wording (all/none of the above, etc.).")
-            score -= 8
-            break
-
-    cmin, cmax, cavg = choice_length_stats([str(c) for c in choices])
+        return [Hit("absolute_wording", -4, _soft(profile), f"Absolute wording in stem: {', '.join(absolute_hits)}.")]
+    return []
+
+
+def rule_duplicate_choices(v: ItemView, profile: str) -> list[Hit]:
+    dup_counts = Counter(v.normalized_choices)
+    if any(c and n > 1 for c, n in dup_counts.items()):
+        return [Hit("duplicate_choices", -35, "error", "Duplicate or near-identical choices detected.")]
+    return []
+
+
+def rule_testwise_cue(v: ItemView, profile: str) -> list[Hit]:
+    for c in v.choice_texts:
+        if CUE_RE.search(c):
+            return [Hit("testwise_cue", -8, "warning", "Choice uses test-wise cue wording (all/none of the above, etc.).")]
+    return []
+
+
+def rule_choice_length(v: ItemView, profile: str) -> list[Hit]:
+    hits: list[Hit] = []
+    cmin, cmax, cavg = choice_length_stats(v.choice_texts)
     if cavg > 0 and cmax > (cavg * 2.8):
-        add_finding(findings, "warning", "choice_length_outlier", iid, "One choice is much longer than peers (possible cueing).")
-        score -= 7
+        hits.append(Hit("choice_length_outlier", -7, "warning", "One choice is much longer than peers (possible cueing)."))
     if cmin > 0 and cmin < 12:
-        add_finding(findings, "warning" if profile == "strict" else "info", "very_short_distractor", iid, "At least one choice is very short compared to exam style.")
-        score -= 4
-
-    if isinstance(ci, int) and 0 <= ci < len(choices):
-        correct_overlap = lexical_overlap(stem, str(choices[ci]))
-        distractor_overlaps = [lexical_overlap(stem, str(c)) for i, c in enumerate(choices) if i != ci]
-        avg_dist = sum(distractor_overlaps) / max(1, len(distractor_overlaps))
-        if correct_overlap - avg_dist > 0.35:
-            add_finding(findings, "warning" if profile == "strict" else "info", "keyword_cueing", iid, "Correct answer has much higher stem keyword overlap than distractors.")
-            score -= 6
-
-    exp_wc = len(words(explanation))
-    if exp_wc < 20:
-        add_finding(findings, "warning", "thin_explanation", iid, "Explanation is too brief for defensible rationale.")
-        score -= 7
-
-    qtype = str(item.get("questionType") or "scenario")
-    judgment = item.get("judgmentLevel")
-    if qtype == "judgment" and (not isinstance(judgment, int) or judgment < 2):
-        add_finding(findings, "warning", "judgment_level_low", iid, "Judgment item has low judgmentLevel metadata.")
-        score -= 5
+        hits.append(Hit("very_short_distractor", -4, _soft(profile), "At least one choice is very short compared to exam style."))
+    return hits
+
+
+def rule_keyword_cueing(v: ItemView, profile: str) -> list[Hit]:
+    if not v.has_valid_key:
+        return []
+    correct_overlap = v.stem_overlap(v.ci)
+    distractor_overlaps = [v.stem_overlap(i) for i in range(len(v.choices)) if i != v.ci]
+    avg_dist = sum(distractor_overlaps) / max(1, len(distractor_overlaps))
+    if correct_overlap - avg_dist > 0.35:
+        return [Hit("keyword_cueing", -6, _soft(profile), "Correct answer has much higher stem keyword overlap than distractors.")]
+    return []
+
+
+def rule_thin_explanation(v: ItemView, profile: str) -> list[Hit]:
+    if v.explanation_wc < 20:
+        return [Hit("thin_explanation", -7, "warning", "Explanation is too brief for defensible rationale.")]
+    return []
 
+
+def rule_judgment_level(v: ItemView, profile: str) -> list[Hit]:
+    if v.question_type == "judgment" and (not isinstance(v.judgment, int) or v.judgment < 2):
+        return [Hit("judgment_level_low", -5, "warning", "Judgment item has low judgmentLevel metadata.")]
+    return []
+
+
+def rule_ambiguity_bonus(v: ItemView, profile: str) -> list[Hit]:
     # Ambiguity quality bonus: scenario context + managerial decision framing.
-    stem_set = set(stem_words)
-    context_hits = len(stem_set & CONTEXT_WORDS)
-    decision_hits = len(stem_set & DECISION_WORDS)
-    role_hits = len(stem_set & ROLE_WORDS)
-    if context_hits >= 3:
-        score += 2
-    if decision_hits >= 1:
-        score += 2
-    if role_hits >= 1:
-        score += 1
+    hits: list[Hit] = []
+    if len(v.stem_set & CONTEXT_WORDS) >= 3:
+        hits.append(Hit("context_bonus", 2))
+    if v.stem_set & DECISION_WORDS:
+        hits.append(Hit("decision_bonus", 2))
+    if v.stem_set & ROLE_WORDS:
+        hits.append(Hit("role_bonus", 1))
+    return hits
 
+
+def rule_human_feel(v: ItemView, profile: str) -> list[Hit]:
     # Human-feel profile based on real exam-style review screenshots:
     # role + scenario context + decision framing ("BEST/NEXT/FIRST/most appropriate")
     # should be present often enough to test judgment, not just recall.
-    if profile == "human":
-        if role_hits == 0:
-            add_finding(findings, "info", "missing_actor_context", iid, "Stem may feel generic; consider role-based actor context.")
-        if decision_hits == 0:
-            add_finding(findings, "info", "missing_decision_prompt", iid, "Stem may feel recall-heavy; consider a best/next/first decision prompt.")
+    if profile != "human":
+        return []
+    hits: list[Hit] = []
+    if not v.stem_set & ROLE_WORDS:
+        hits.append(Hit("missing_actor_context", 0, "info", "Stem may feel generic; consider role-based actor context."))
+    if not v.stem_set & DECISION_WORDS:
+        hits.append(Hit("missing_decision_prompt", 0, "info", "Stem may feel recall-heavy; consider a best/next/first decision prompt."))
+    return hits
+
+
+# Applied in order; finding order in reports follows this list.
+RULES: list[Callable[[ItemView, str], list[Hit]]] = [
+    rule_schema,
+    rule_stem_length,
+    rule_negative_stem,
+    rule_absolute_wording,
+    rule_duplicate_choices,
+    rule_testwise_cue,
+    rule_choice_length,
+    rule_keyword_cueing,
+    rule_thin_explanation,
+    rule_judgment_level,
+    rule_ambiguity_bonus,
+    rule_human_feel,
+]
+
+
+class RuleStats:
+    """Per-rule hit counts and cumulative cost, collected with --rule-stats."""
+
+    def __init__(self) -> None:
+        self.items = 0
+        self.analyze_s = 0.0
+        self.rules: dict[str, dict[str, Any]] = {
+            r.__name__.removeprefix("rule_"): {"hits": 0, "findings": 0, "seconds": 0.0} for r in RULES
+        }
+
+    def merge(self, other: "RuleStats") -> None:
+        self.items += other.items
+        self.analyze_s += other.analyze_s
+        for name, stats in other.rules.items():
+            for field, value in stats.items():
+                self.rules[name][field] += value
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "items": self.items,
+            "analyze_seconds": round(self.analyze_s, 4),
+            "rules": {
+                name: {**stats, "seconds": round(stats["seconds"], 4)} for name, stats in self.rules.items()
+            },
+        }
+
+
+def item_quality(
+    item: dict[str, Any], idx: int, profile: str = "human", stats: RuleStats | None = None
+) -> tuple[int, list[dict[str, str]]]:
+    findings: list[dict[str, str]] = []
+    score = 100
+
+    if stats is None:
+        view = ItemView.analyze(item, idx)
+        for rule in RULES:
+            for hit in rule(view, profile):
+                score += hit.delta
+                if hit.level:
+                    add_finding(findings, hit.level, hit.kind, view.iid, hit.message)
+    else:
+        stats.items += 1
+        start = time.perf_counter()
+        view = ItemView.analyze(item, idx)
+        stats.analyze_s += time.perf_counter() - start
+        for rule in RULES:
+            start = time.perf_counter()
+            hits = rule(view, profile)
+            rule_stats = stats.rules[rule.__name__.removeprefix("rule_")]
+            rule_stats["seconds"] += time.perf_counter() - start
+            rule_stats["hits"] += len(hits)
+            for hit in hits:
+                score += hit.delta
+                if hit.level:
+                    rule_stats["findings"] += 1
+                    add_finding(findings, hit.level, hit.kind, view.iid, hit.message)
 
     score = max(0, min(100, score))
     return score, findings
 
 
-def lint(bank: dict[str, Any], profile: str = "human") -> dict[str, Any]:
+def cache_namespace(profile: str) -> str:
+    return f"{code_fingerprint(__file__)}:{profile}"
+
+
+def lint(
+    bank: dict[str, Any],
+    profile: str = "human",
+    cache: QACache | None = None,
+    stats: RuleStats | None = None,
+    jobs: int = 1,
+    record_hashes: bool = False,
+) -> dict[str, Any]:
     items = bank.get("items")
     if not isinstance(items, list):
         return {
@@ -248,12 +424,110 @@ def lint(bank: dict[str, Any], profile: str = "human") -> dict[str, Any]:
             ],
             "item_scores": [],
         }
+    return lint_items(items, profile=profile, cache=cache, stats=stats, jobs=jobs, record_hashes=record_hashes)
 
-    findings: list[dict[str, str]] = []
-    scores: list[dict[str, Any]] = []
 
+QualityResult = tuple[int, list[dict[str, str]]]
+
+
+def _lint_chunk(
+    chunk: list[tuple[int, dict[str, Any]]], profile: str, collect_stats: bool
+) -> tuple[list[QualityResult], RuleStats | None]:
+    stats = RuleStats() if collect_stats else None
+    return [item_quality(item, i, profile=profile, stats=stats) for i, item in chunk], stats
+
+
+def _iter_serial(
+    items: Iterable[dict[str, Any]], profile: str, cache: QACache | None, stats: RuleStats | None
+) -> Iterator[tuple[int, dict[str, Any], QualityResult]]:
     for i, item in enumerate(items, start=1):
-        score, item_findings = item_quality(item, i, profile=profile)
+        yield i, item, cached_item(cache, item, i, lambda: item_quality(item, i, profile=profile, stats=stats))
+
+
+def _iter_parallel(
+    items: Iterable[dict[str, Any]],
+    profile: str,
+    cache: QACache | None,
+    stats: RuleStats | None,
+    jobs: int,
+    chunk_size: int,
+) -> Iterator[tuple[int, dict[str, Any], QualityResult]]:
+    """Lint contiguous chunks on a process pool and yield results in item order.
+
+    Cache hits are resolved here; only misses are sent to workers. At most
+    2 * jobs chunks are in flight, so streamed banks stay bounded in memory.
+    """
+    methods = multiprocessing.get_all_start_methods()
+    ctx = multiprocessing.get_context("fork" if "fork" in methods else None)
+    pending: deque[tuple[list[tuple[int, dict[str, Any], Any]], Future | None]] = deque()
+
+    def drain() -> Iterator[tuple[int, dict[str, Any], QualityResult]]:
+        entries, future = pending.popleft()
+        computed: Iterator[QualityResult] = iter(())
+        if future is not None:
+            results, chunk_stats = future.result()
+            if stats is not None and chunk_stats is not None:
+                stats.merge(chunk_stats)
+            computed = iter(results)
+        for i, item, cached in entries:
+            if cached is None:
+                cached = next(computed)
+                if cache is not None:
+                    cache.put(item, i, cached)
+            yield i, item, cached
+
+    with ProcessPoolExecutor(max_workers=jobs, mp_context=ctx) as pool:
+        numbered = enumerate(items, start=1)
+        while True:
+            chunk = list(itertools.islice(numbered, chunk_size))
+            if not chunk:
+                break
+            entries: list[tuple[int, dict[str, Any], Any]] = []
+            misses: list[tuple[int, dict[str, Any]]] = []
+            for i, item in chunk:
+                hit, value = cache.lookup(item, i) if cache is not None else (False, None)
+                entries.append((i, item, value if hit else None))
+                if not hit:
+                    misses.append((i, item))
+            future = pool.submit(_lint_chunk, misses, profile, stats is not None) if misses else None
+            pending.append((entries, future))
+            while len(pending) > 2 * jobs:
+                yield from drain()
+        while pending:
+            yield from drain()
+
+
+def lint_items(
+    items: Iterable[dict[str, Any]],
+    profile: str = "human",
+    cache: QACache | None = None,
+    stats: RuleStats | None = None,
+    jobs: int = 1,
+    record_hashes: bool = False,
+) -> dict[str, Any]:
+    """Lint items from any iterable (a list or a BankStream) in one pass.
+
+    With jobs > 1 items are linted on a process pool in contiguous chunks;
+    the report is identical to a serial run. Collecting rule stats bypasses
+    the cache so every item is counted. record_hashes adds each item's content
+    hash (`item_hashes`, parallel to `item_scores`) for later --baseline runs.
+    """
+    findings: list[dict[str, str]] = []
+    scores: list[dict[str, Any]] = []
+    hashes: list[str] = []
+    if stats is not None:
+        cache = None
+
+    if jobs > 1:
+        if isinstance(items, list):
+            chunk_size = max(1, -(-len(items) // (jobs * 4)))
+        else:
+            chunk_size = STREAM_LINT_CHUNK
+        results = _iter_parallel(items, profile, cache, stats, jobs, chunk_size)
+    else:
+        results = _iter_serial(items, profile, cache, stats)
+
+    for i, item, (score, item_findings) in results:
         iid = str(item.get("id") or i)
         scores.append({
             "item": iid,
@@ -263,12 +537,14 @@ def lint(bank: dict[str, Any], profile: str = "human") -> dict[str, Any]:
             "pilotEligible": bool(item.get("pilotEligible", False)),
         })
         findings.extend(item_findings)
+        if record_hashes:
+            hashes.append(item_hash(item) if cache is None else cache.item_hash(item, i))
 
     scores_sorted = sorted(scores, key=lambda x: x["quality_score"])
     avg_score = sum(s["quality_score"] for s in scores) / max(1, len(scores))
 
-    return {
-        "item_count": len(items),
+    report = {
+        "item_count": len(scores),
         "profile": profile,
         "error_count": sum(1 for f in findings if f["level"] == "error"),
         "warning_count": sum(1 for f in findings if f["level"] == "warning"),
@@ -278,22 +554,114 @@ def lint(bank: dict[str, Any], profile: str = "human") -> dict[str, Any]:
         "findings": findings,
         "item_scores": scores,
     }
+    if record_hashes:
+        report["item_hashes"] = hashes
+    return report
+
+
+def _finding_key(finding: dict[str, str]) -> tuple[str, str, str]:
+    return finding["level"], finding["kind"], finding["message"]
+
+
+def _unmatched(findings: list[dict[str, str]], others: list[dict[str, str]]) -> list[dict[str, str]]:
+    """Findings in `findings` with no counterpart in `others` (multiset difference)."""
+    remaining = Counter(map(_finding_key, others))
+    out = []
+    for f in findings:
+        key = _finding_key(f)
+        if remaining[key]:
+            remaining[key] -= 1
+        else:
+            out.append(f)
+    return out
+
+
+def baseline_item_hashes(baseline: dict[str, Any], baseline_bank: Path | None = None) -> dict[str, str]:
+    """Item id -> content hash for the items a baseline report was computed from.
+
+    Taken from the report's own `item_hashes` when it was written with
+    --record-item-hashes, otherwise from the baseline bank file. Without either,
+    no item counts as unchanged.
+    """
+    recorded = baseline.get("item_hashes")
+    if isinstance(recorded, list):
+        return {s["item"]: h for s, h in zip(baseline.get("item_scores", []), recorded)}
+    if baseline_bank is None:
+        return {}
+    bank = load_bank_data(baseline_bank)
+    items = bank.get("items") if isinstance(bank, dict) else None
+    if not isinstance(items, list):
+        return {}
+    return {str(item.get("id") or i): item_hash(item) for i, item in enumerate(items, start=1)}
+
+
+def lint_against_baseline(
+    items: Iterable[dict[str, Any]],
+    baseline: dict[str, Any],
+    baseline_hashes: dict[str, str],
+    profile: str = "human",
+    cache: QACache | None = None,
+) -> dict[str, Any]:
+    """Lint only items whose content changed since `baseline`; report the difference.
+
+    Unchanged items keep their baseline findings and are not linted. The result
+    lists findings that appeared or went away and every score that moved.
+    """
+    if baseline.get("profile", profile) != profile:
+        raise ValueError(f"Baseline was linted with profile {baseline.get('profile')!r}, not {profile!r}")
+    base_scores = {s["item"]: s["quality_score"] for s in baseline.get("item_scores", [])}
+    base_findings: dict[str, list[dict[str, str]]] = {}
+    for f in baseline.get("findings", []):
+        base_findings.setdefault(f["item"], []).append(f)
+
+    seen: set[str] = set()
+    added: list[str] = []
+    new_findings: list[dict[str, str]] = []
+    resolved: list[dict[str, str]] = []
+    deltas: list[dict[str, Any]] = []
+    item_count = unchanged = 0
+    for i, item in enumerate(items, start=1):
+        item_count += 1
+        iid = str(item.get("id") or i)
+        seen.add(iid)
+        content_hash = item_hash(item) if cache is None else cache.item_hash(item, i)
+        if iid in base_scores and baseline_hashes.get(iid) == content_hash:
+            unchanged += 1
+            continue
+        score, findings = cached_item(cache, item, i, lambda: item_quality(item, i, profile=profile))
+        before = base_scores.get(iid)
+        if before is None:
+            added.append(iid)
+        old = base_findings.get(iid, [])
+        new_findings.extend(_unmatched(findings, old))
+        resolved.extend(_unmatched(old, findings))
+        if score != before:
+            deltas.append({
+                "item": iid,
+                "before": before,
+                "after": score,
+                "delta": None if before is None else score - before,
+            })
+
+    removed = [iid for iid in base_scores if iid not in seen]
+    return {
+        "profile": profile,
+        "item_count": item_count,
+        "linted_items": item_count - unchanged,
+        "unchanged_items": unchanged,
+        "added_items": added,
+        "removed_items": removed,
+        "new_error_count": sum(1 for f in new_findings if f["level"] == "error"),
+        "new_warning_count": sum(1 for f in new_findings if f["level"] == "warning"),
+        "new_info_count": sum(1 for f in new_findings if f["level"] == "info"),
+        "resolved_count": len(resolved),
+        "new_findings": new_findings,
+        "resolved_findings": resolved,
+        "score_deltas": deltas,
+    }
 
 
-def main() -> int:
-    parser = argparse.ArgumentParser()
-    parser.add_argument("bank_json", type=Path)
-    parser.add_argument("--write-report", type=Path)
-    parser.add_argument("--fail-on-warning", action="store_true")
-    parser.add_argument("--profile", choices=["human", "strict"], default="human")
-    args = parser.parse_args()
-
-    bank = json.loads(args.bank_json.read_text(encoding="utf-8"))
-    report = lint(bank, profile=args.profile)
-
-    if args.write_report:
-        args.write_report.write_text(json.dumps(report, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
-
+def print_summary(report: dict[str, Any]) -> None:
     print(
         "SUMMARY:",
         json.dumps(
@@ -312,6 +680,113 @@ def main() -> int:
     if report["low_quality_items"]:
         print("LOWEST_QUALITY_SAMPLE:", json.dumps(report["low_quality_items"][:10], ensure_ascii=False))
 
+
+def _run_baseline(args: argparse.Namespace, timer: PhaseTimer) -> int:
+    if args.write_report and args.write_report.resolve() == args.baseline.resolve():
+        raise SystemExit("--write-report must not overwrite the --baseline report")
+    with cprofile_run(args):
+        with timer.phase("load"):
+            baseline = read_quality_report(args.baseline)
+            base_hashes = baseline_item_hashes(baseline, args.baseline_bank)
+            if args.stream:
+                stream = BankStream(args.bank_json)
+                items: Iterable[dict[str, Any]] = stream.items() if stream.has_item_array else []
+            else:
+                bank = load_bank_data(args.bank_json)
+                items = bank.get("items", []) if isinstance(bank, dict) else []
+
+        with timer.phase("lint"):
+            cache = QACache.for_bank(args.bank_json, "lint", cache_namespace(args.profile))
+            diff = lint_against_baseline(items, baseline, base_hashes, profile=args.profile, cache=cache)
+            if cache is not None:
+                cache.save()
+
+        if args.write_report:
+            timer.write_json(args.write_report, timer.embed(diff), "report")
+
+    if not base_hashes:
+        print("NOTE: baseline has no item hashes and no --baseline-bank was given; every item was linted.")
+    print(
+        "BASELINE_DIFF:",
+        json.dumps(
+            {k: v for k, v in diff.items() if not isinstance(v, list)}
+            | {"added_items": len(diff["added_items"]), "removed_items": len(diff["removed_items"])},
+            ensure_ascii=False,
+        ),
+    )
+    for f in diff["new_findings"][:20]:
+        print("NEW:", json.dumps(f, ensure_ascii=False))
+    for d in sorted((d for d in diff["score_deltas"] if d["delta"] is not None), key=lambda d: d["delta"])[:10]:
+        print("SCORE_DELTA:", json.dumps(d, ensure_ascii=False))
+    timer.print_summary()
+
+    if diff["new_error_count"]:
+        return 1
+    if args.fail_on_warning and diff["new_warning_count"]:
+        return 2
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("bank_json", type=Path)
+    parser.add_argument("--write-report", type=Path)
+    parser.add_argument("--fail-on-warning", action="store_true")
+    parser.add_argument("--profile", choices=["human", "strict"], default="human")
+    parser.add_argument("--stream", action="store_true", help="lint item by item in constant memory")
+    parser.add_argument("--rule-stats", action="store_true", help="report per-rule hit counts and cost")
+    parser.add_argument("--jobs", type=int, default=1, help="lint on N processes (0: all cores)")
+    parser.add_argument(
+        "--report-format",
+        choices=["full", "compact"],
+        default="full",
+        help="compact: findings grouped by kind, columnar item scores (.ndjson/.gz suffixes select NDJSON/gzip)",
+    )
+    parser.add_argument("--record-item-hashes", action="store_true", help="add per-item content hashes for --baseline runs")
+    parser.add_argument("--baseline", type=Path, help="previous quality report; lint changed items and report only the difference")
+    parser.add_argument("--baseline-bank", type=Path, help="bank the baseline was linted from (if it has no item hashes)")
+    add_timing_args(parser)
+    args = parser.parse_args()
+
+    timer = PhaseTimer.from_args(args)
+    if args.baseline:
+        return _run_baseline(args, timer)
+    with cprofile_run(args):
+        stream = None
+        with timer.phase("load"):
+            if args.stream:
+                stream = BankStream(args.bank_json)
+                bank = stream.members()
+            else:
+                bank = load_bank_data(args.bank_json)
+
+        with timer.phase("lint"):
+            stats = RuleStats() if args.rule_stats else None
+            jobs = args.jobs if args.jobs > 0 else os.cpu_count() or 1
+            cache = None if stats else QACache.for_bank(args.bank_json, "lint", cache_namespace(args.profile))
+            hashes = args.record_item_hashes
+            if stream is not None and stream.has_item_array:
+                report = lint_items(
+                    stream.items(), profile=args.profile, cache=cache, stats=stats, jobs=jobs, record_hashes=hashes
+                )
+            else:
+                report = lint(bank, profile=args.profile, cache=cache, stats=stats, jobs=jobs, record_hashes=hashes)
+            if cache is not None:
+                cache.save()
+            if stats is not None:
+                report["rule_stats"] = stats.as_dict()
+
+        if args.write_report and args.report_format == "compact":
+            with timer.phase("write:report"):
+                write_quality_report(args.write_report, timer.embed(report))
+        elif args.write_report:
+            timer.write_json(args.write_report, timer.embed(report), "report")
+
+    print_summary(report)
+    if "rule_stats" in report:
+        print("RULE_STATS:", json.dumps(report["rule_stats"], ensure_ascii=False))
+    timer.print_summary()
+
     if report["error_count"]:
         return 1
     if args.fail_on_warning and report["warning_count"]:
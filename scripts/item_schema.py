@@ -0,0 +1,343 @@
+#!/usr/bin/env python3
+"""Declarative item schema, compiled into a specialized validation function.
+
+ITEM_SCHEMA lists every per-item rule once: the field it reads, the check, the
+finding level and message, and which item types it applies to. Rules are in
+two groups:
+
+- `bank`: the checks validate_cat_bank.py has always enforced (its findings and
+  summary rows are unchanged, so the committed QA report is too);
+- `runtime`: the normalizations cat/app.js `validateBank()` applies silently
+  (PBQ answer keys, IRT parameter clamps, judgmentLevel, GPCM maxScore and
+  thresholds), reported here instead of being discovered in the browser.
+
+compile_validator() turns the selected rules into Python source, with each
+field read once and each check inlined, and execs it; nothing walks the rule
+list per item. Every failing rule is reported in the same pass; a rule only
+waits on the rule named in its `after` (correctIndex needs a valid choices
+list).
+
+`--export` writes the schema to `cat/item-schema.json`, the contract the
+browser app reads; check_cat_contract.py fails while that file is stale.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+from typing import Any, Callable, Iterable
+
+from bank_io import atomic_write, load_bank_data
+from cat_domains import BLUEPRINT, DOMAIN_ALIASES, canonical_domain
+from qa_timings import PhaseTimer, add_timing_args, cprofile_run
+
+SCHEMA_FORMAT = "item-schema/1"
+DEFAULT_EXPORT = Path("cat/item-schema.json")
+GROUPS = ("bank", "runtime")
+ITEM_TYPES = ["mcq", "dragdrop", "ordering", "hotspot"]
+PBQ_TYPES = ["dragdrop", "ordering", "hotspot"]
+
+ITEM_SCHEMA: dict[str, Any] = {
+    "format": SCHEMA_FORMAT,
+    "itemTypes": ITEM_TYPES,
+    "pbqTypes": PBQ_TYPES,
+    "defaultType": "mcq",
+    "defaults": {"difficulty": 0, "discrimination": 1},
+    "rules": [
+        {"name": "id", "group": "bank", "field": "id", "check": "truthy", "level": "error",
+         "message": "Item {index} missing 'id'.", "row": "id"},
+        {"name": "stem", "group": "bank", "field": "stem", "check": "nonempty_string", "level": "error",
+         "message": "Item {label} missing/invalid 'stem'."},
+        {"name": "domain", "group": "bank", "field": "domain", "check": "blueprint_domain", "level": "warning",
+         "message": "Item {label} has non-blueprint domain: '{value}'.", "row": "domain"},
+        {"name": "choices", "group": "bank", "field": "choices", "check": "list", "min": 2, "level": "error",
+         "message": "Item {label} has invalid 'choices'."},
+        {"name": "correctIndex", "group": "bank", "field": "correctIndex", "check": "index", "of": "choices",
+         "after": "choices", "level": "error",
+         "message": "Item {label} has invalid 'correctIndex'.", "row": "correct_position"},
+        {"name": "difficulty", "group": "bank", "field": "difficulty", "check": "number", "level": "error",
+         "message": "Item {label} has non-numeric 'difficulty'.", "row": "difficulty_band"},
+        {"name": "discrimination", "group": "bank", "field": "discrimination", "check": "number", "level": "error",
+         "message": "Item {label} has non-numeric 'discrimination'."},
+        {"name": "explanation", "group": "bank", "field": "explanation", "check": "nonempty_string", "level": "warning",
+         "message": "Item {label} missing explanation text."},
+        {"name": "sourceIds", "group": "bank", "field": "sourceIds", "check": "list", "min": 1, "level": "error",
+         "message": "Item {label} missing sourceIds citations."},
+        {"name": "sourceIdsKnown", "group": "bank", "field": "sourceIds", "check": "catalog_refs",
+         "after": "sourceIds", "level": "error",
+         "message": "Item {label} references unknown sourceIds: {unknown}", "row": "cited"},
+        {"name": "type", "group": "runtime", "field": "type", "check": "one_of", "values": ITEM_TYPES,
+         "optional": True, "level": "warning",
+         "message": "Item {label} has unknown type '{value}'; the app treats it as 'mcq'."},
+        {"name": "correctAnswers", "group": "runtime", "field": "correctAnswers", "check": "index_set",
+         "of": "choices", "after": "choices", "types": ["dragdrop"], "level": "error",
+         "message": "Item {label} has invalid 'correctAnswers'."},
+        {"name": "correctOrder", "group": "runtime", "field": "correctOrder", "check": "permutation",
+         "of": "choices", "after": "choices", "types": ["ordering"], "level": "error",
+         "message": "Item {label} has invalid 'correctOrder'."},
+        {"name": "difficultyRange", "group": "runtime", "field": "difficulty", "check": "range", "min": -3, "max": 3,
+         "after": "difficulty", "level": "warning",
+         "message": "Item {label} difficulty {value} is outside [-3, 3]; the app clamps it."},
+        {"name": "discriminationRange", "group": "runtime", "field": "discrimination", "check": "range",
+         "min": 0.3, "max": 2.5, "after": "discrimination", "level": "warning",
+         "message": "Item {label} discrimination {value} is outside [0.3, 2.5]; the app clamps it."},
+        {"name": "judgmentLevel", "group": "runtime", "field": "judgmentLevel", "check": "range", "min": 1, "max": 3,
+         "optional": True, "level": "warning",
+         "message": "Item {label} has invalid 'judgmentLevel' {value}; the app replaces it with the questionType default."},
+        {"name": "maxScore", "group": "runtime", "field": "maxScore", "check": "score_steps", "of": "thresholds",
+         "optional": True, "types": PBQ_TYPES, "level": "warning",
+         "message": "Item {label} has maxScore {value} without one threshold per step; the app scores it dichotomously."},
+    ],
+}
+
+# Row values the validator's summary reads, by rule `row` key.
+_ROW_VALUES = {
+    "id": "str({v})",
+    "domain": "{v}_canonical",
+    "correct_position": "{v}",
+    "difficulty_band": "difficulty_band({v})",
+    "cited": "True",
+}
+_ROW_ALWAYS = {"domain"}
+_ROW_TEMPLATE = {"id": None, "domain": "", "correct_position": None, "difficulty_band": None, "cited": False}
+
+
+def _tuple_literal(values: Iterable[Any]) -> str:
+    # Tuples rather than sets: membership must not hash the (possibly unhashable) field value.
+    return repr(tuple(sorted(values)))
+
+
+def _fail_condition(rule: dict[str, Any], v: str, of: str) -> tuple[list[str], str]:
+    """(setup lines, expression that is true when the rule fails) for one rule."""
+    check = rule["check"]
+    if check == "truthy":
+        return [], f"not {v}"
+    if check == "nonempty_string":
+        return [], f"not isinstance({v}, str) or not {v}.strip()"
+    if check == "blueprint_domain":
+        return [f"{v}_canonical = canonical_domain({v})"], f"{v}_canonical not in BLUEPRINT"
+    if check == "list":
+        return [], f"not isinstance({v}, list) or len({v}) < {int(rule['min'])}"
+    if check == "index":
+        return [], f"not isinstance({v}, int) or {v} < 0 or {v} >= len({of})"
+    if check == "number":
+        return [], f"not isinstance({v}, (int, float))"
+    if check == "catalog_refs":
+        return [f"unknown = [sid for sid in {v} if sid not in source_catalog]"], "unknown"
+    if check == "one_of":
+        return [], f"{v} not in {_tuple_literal(rule['values'])}"
+    if check == "range":
+        return [], f"not isinstance({v}, (int, float)) or not {rule['min']!r} <= {v} <= {rule['max']!r}"
+    if check == "index_set":
+        return [], (
+            f"not isinstance({v}, list) or not {v}"
+            f" or not all(isinstance(x, int) and 0 <= x < len({of}) for x in {v})"
+            f" or len(set({v})) != len({v})"
+        )
+    if check == "permutation":
+        return [], (
+            f"not isinstance({v}, list) or not all(isinstance(x, int) for x in {v})"
+            f" or sorted({v}) != list(range(len({of})))"
+        )
+    if check == "score_steps":
+        return [], (
+            f"isinstance({v}, (int, float)) and {v} > 1"
+            f" and (not isinstance({of}, list) or len({of}) != {v})"
+        )
+    raise ValueError(f"Unknown schema check: {check}")
+
+
+def _selected_rules(schema: dict[str, Any], groups: Iterable[str]) -> tuple[list[dict[str, Any]], set[str]]:
+    """Rules in `groups`, plus (silently) any rule they wait on; and the names that report."""
+    groups = set(groups)
+    unknown = groups - set(GROUPS)
+    if unknown:
+        raise ValueError(f"Unknown schema groups: {sorted(unknown)}")
+    by_name = {rule["name"]: rule for rule in schema["rules"]}
+    reporting = {rule["name"] for rule in schema["rules"] if rule["group"] in groups}
+    needed = set(reporting)
+    for name in list(reporting):
+        after = by_name[name].get("after")
+        while after and after not in needed:
+            needed.add(after)
+            after = by_name[after].get("after")
+    return [rule for rule in schema["rules"] if rule["name"] in needed], reporting
+
+
+def validator_source(schema: dict[str, Any] = ITEM_SCHEMA, groups: Iterable[str] = GROUPS) -> str:
+    """Python source of `validate_item(item, i, source_catalog) -> (findings, row)`."""
+    rules, reporting = _selected_rules(schema, groups)
+    defaults = schema.get("defaults", {})
+    fields = list(dict.fromkeys([r["field"] for r in rules] + [r["of"] for r in rules if "of" in r]))
+    var = {field: f"f_{n}" for n, field in enumerate(fields)}
+
+    lines = [
+        "def validate_item(item, i, source_catalog):",
+        "    findings = []",
+        f"    row = {_ROW_TEMPLATE!r}",
+        "    get = item.get",
+    ]
+    for field in fields:
+        default = f", {defaults[field]!r}" if field in defaults else ""
+        lines.append(f"    {var[field]} = get({field!r}{default})")
+    # Messages keep the validator's historical `id or position` label.
+    lines.append(f"    label = {var['id']} or i" if "id" in var else "    label = i")
+    if any("types" in r for r in rules):
+        lines.append(f"    item_type = get('type', {schema['defaultType']!r})")
+        lines.append(f"    if item_type not in {_tuple_literal(schema['itemTypes'])}:")
+        lines.append(f"        item_type = {schema['defaultType']!r}")
+
+    passed: set[str] = set()
+    for n, rule in enumerate(rules):
+        v = var[rule["field"]]
+        of = var.get(rule.get("of", ""), "None")
+        setup, failed = _fail_condition(rule, v, of)
+        guards = []
+        if rule.get("after"):
+            guards.append(f"ok_{rule['after']}")
+        if rule.get("types"):
+            guards.append(f"item_type in {_tuple_literal(rule['types'])}")
+        if rule.get("optional"):
+            guards.append(f"{v} is not None")
+
+        indent = "    "
+        lines.append(f"    # {rule['name']}")
+        if guards:
+            lines.append(f"    if {' and '.join(guards)}:")
+            indent = "        "
+        lines.extend(indent + s for s in setup)
+        row_key = rule.get("row")
+        if row_key in _ROW_ALWAYS:
+            lines.append(f"{indent}row[{row_key!r}] = {_ROW_VALUES[row_key].format(v=v)}")
+        lines.append(f"{indent}if {failed}:")
+        if rule["name"] in reporting:
+            lines.append(
+                f"{indent}    findings.append(Finding({rule['level']!r}, MESSAGES[{n}].format("
+                f"index=i, label=label, value={v}{', unknown=unknown' if rule['check'] == 'catalog_refs' else ''})))"
+            )
+        else:
+            lines.append(f"{indent}    pass")
+        row_on_pass = row_key is not None and row_key not in _ROW_ALWAYS
+        needs_ok = any(r.get("after") == rule["name"] for r in rules)
+        if row_on_pass or needs_ok:
+            lines.append(f"{indent}else:")
+            if row_on_pass:
+                lines.append(f"{indent}    row[{row_key!r}] = {_ROW_VALUES[row_key].format(v=v)}")
+            if needs_ok:
+                lines.append(f"{indent}    ok_{rule['name']} = True")
+                passed.add(rule["name"])
+
+    lines[4:4] = [f"    ok_{name} = False" for name in sorted(passed)]
+    lines.append("    return findings, row")
+    return "\n".join(lines) + "\n"
+
+
+def compile_validator(
+    env: dict[str, Any], schema: dict[str, Any] = ITEM_SCHEMA, groups: Iterable[str] = GROUPS
+) -> Callable[[dict[str, Any], int, dict[str, Any]], tuple[list[Any], dict[str, Any]]]:
+    """Compile the schema once; `env` supplies Finding, canonical_domain, BLUEPRINT, difficulty_band."""
+    rules, _ = _selected_rules(schema, groups)
+    source = validator_source(schema, groups)
+    namespace = dict(env)
+    namespace["MESSAGES"] = [rule["message"] for rule in rules]
+    exec(compile(source, f"<item_schema:{'+'.join(sorted(set(groups)))}>", "exec"), namespace)
+    fn = namespace["validate_item"]
+    fn.__doc__ = "Per-item checks compiled from item_schema.ITEM_SCHEMA; the row feeds the bank-level summary."
+    fn.__source__ = source
+    return fn
+
+
+def bank_env() -> dict[str, Any]:
+    # validate_cat_bank compiles its own validator from this module at import time.
+    import validate_cat_bank
+
+    return {
+        "Finding": validate_cat_bank.Finding,
+        "canonical_domain": canonical_domain,
+        "BLUEPRINT": BLUEPRINT,
+        "difficulty_band": validate_cat_bank.difficulty_band,
+    }
+
+
+def export_schema(schema: dict[str, Any] = ITEM_SCHEMA) -> dict[str, Any]:
+    """The JSON contract for the browser app: the rules plus the blueprint domains they refer to."""
+    exported = dict(schema)
+    exported["blueprintDomains"] = list(BLUEPRINT)
+    exported["domainAliases"] = dict(DOMAIN_ALIASES)
+    return exported
+
+
+def export_text(schema: dict[str, Any] = ITEM_SCHEMA) -> str:
+    return json.dumps(export_schema(schema), indent=2, ensure_ascii=False) + "\n"
+
+
+def validate_bank_items(items: Iterable[dict[str, Any]], source_catalog: Any, groups: Iterable[str] = GROUPS) -> dict[str, Any]:
+    validate_item = compile_validator(bank_env(), groups=groups)
+    catalog = source_catalog if isinstance(source_catalog, dict) else {}
+    findings: list[dict[str, str]] = []
+    count = 0
+    for i, item in enumerate(items, start=1):
+        count += 1
+        for f in validate_item(item, i, catalog)[0]:
+            findings.append({"level": f.level, "message": f.message})
+    return {
+        "item_count": count,
+        "groups": sorted(set(groups)),
+        "error_count": sum(1 for f in findings if f["level"] == "error"),
+        "warning_count": sum(1 for f in findings if f["level"] == "warning"),
+        "findings": findings,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("bank_json", type=Path, nargs="?", default=Path("cat/question-bank.sample.json"))
+    parser.add_argument("--group", action="append", choices=GROUPS, help="rule groups to check (default: all)")
+    parser.add_argument("--write-report", type=Path)
+    parser.add_argument("--export", type=Path, nargs="?", const=DEFAULT_EXPORT, help="write the schema JSON and exit")
+    parser.add_argument("--check-export", type=Path, nargs="?", const=DEFAULT_EXPORT, help="verify the exported schema is current")
+    parser.add_argument("--show-source", action="store_true", help="print the compiled validator and exit")
+    parser.add_argument("--fail-on-warning", action="store_true")
+    add_timing_args(parser)
+    args = parser.parse_args()
+    groups = args.group or list(GROUPS)
+
+    if args.show_source:
+        print(validator_source(groups=groups), end="")
+        return 0
+    if args.export:
+        atomic_write(args.export, [export_text()])
+        print(f"Wrote item schema {args.export}")
+        return 0
+    if args.check_export:
+        if not args.check_export.exists() or args.check_export.read_text(encoding="utf-8") != export_text():
+            print(f"Item schema is stale: {args.check_export} (run python3 scripts/item_schema.py --export)")
+            return 1
+        print(f"Item schema OK: {args.check_export}")
+        return 0
+
+    timer = PhaseTimer.from_args(args)
+    with cprofile_run(args):
+        with timer.phase("load"):
+            bank = load_bank_data(args.bank_json)
+            if not isinstance(bank, dict) or not isinstance(bank.get("items"), list):
+                raise SystemExit("Top-level 'items' must be a list")
+        with timer.phase("validate"):
+            report = validate_bank_items(bank["items"], bank.get("sourceCatalog"), groups)
+        if args.write_report:
+            timer.write_json(args.write_report, timer.embed(report), "report")
+
+    print("SUMMARY:", json.dumps({k: report[k] for k in ("item_count", "groups", "error_count", "warning_count")}))
+    for f in report["findings"]:
+        print(f"{f['level'].upper()}: {f['message']}")
+    timer.print_summary()
+
+    if report["error_count"]:
+        return 1
+    if args.fail_on_warning and report["warning_count"]:
+        return 2
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""Bank-wide near-duplicate stem detection (MinHash + LSH banding).
+
+Exact-match duplicate checks (app.js `getStemKey`, `norm()` in the mock-exam
+importer) miss lightly reworded copies. Here each stem becomes a set of word
+shingles, summarized by a one-permutation MinHash signature; signatures are
+split into bands and only items that share a band bucket are compared, so the
+work grows with the bank instead of with the number of item pairs. Signatures
+cover every shingle, template boilerplate included, so a one-word rewording
+still shares most bands with its original. Every pair in a bucket is confirmed
+with the exact shingle Jaccard similarity.
+
+Templated stems that differ only in a few slot words land in the same buckets
+by the hundred, and all-pairs within such a bucket is quadratic again. Buckets
+with more than `max_bucket` members are therefore skipped, which bounds the
+candidates at `bands * n * (max_bucket - 1) / 2`. A reworded copy shares
+several bands with its original, so it is still found through a smaller
+bucket; the report counts the skipped buckets.
+
+Pairs within one `variantOf` family are intentional copies and are skipped;
+the remaining confirmed pairs are joined into clusters.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import zlib
+from pathlib import Path
+from typing import Any, Iterable
+
+from bank_io import BankStream, load_bank_data
+from qa_timings import PhaseTimer, add_timing_args, cprofile_run
+
+WORD_RE = re.compile(r"[a-z0-9]+")
+NUM_HASHES = 64
+BANDS = 16
+MAX_BUCKET = 16
+SHINGLE_WORDS = 3
+DEFAULT_THRESHOLD = 0.7
+STEM_PREVIEW_CHARS = 160
+
+_HASH_BITS = 32
+_HASH_MASK = (1 << _HASH_BITS) - 1
+_EMPTY = 1 << _HASH_BITS
+_SHINGLE_MIX = 0x9E3779B1
+_WORD_CODES: dict[str, int] = {}
+
+
+def _word_code(word: str) -> int:
+    code = _WORD_CODES.get(word)
+    if code is None:
+        code = _WORD_CODES[word] = zlib.crc32(word.encode("utf-8"))
+    return code
+
+
+def stem_shingles(stem: str, size: int = SHINGLE_WORDS) -> set[int]:
+    """32-bit hashes of the stem's `size`-word shingles (lowercased alphanumeric words)."""
+    codes = [_word_code(w) for w in WORD_RE.findall(str(stem or "").lower())]
+    if len(codes) < size:
+        size = len(codes)
+        if not size:
+            return set()
+    cur = codes[:len(codes) - size + 1]
+    for k in range(1, size):
+        cur = [(c * _SHINGLE_MIX + d) & _HASH_MASK for c, d in zip(cur, codes[k:])]
+    return set(cur)
+
+
+def minhash_signature(shingles: Iterable[int], num_hashes: int = NUM_HASHES) -> list[int]:
+    """One-permutation MinHash over shingle hashes, binned, with rotation densification."""
+    sig = [_EMPTY] * num_hashes
+    for h in shingles:
+        b = h % num_hashes
+        v = h // num_hashes
+        if v < sig[b]:
+            sig[b] = v
+    if _EMPTY not in sig or min(sig) == _EMPTY:
+        return sig
+    # Empty bins borrow the next filled bin to the right, offset by the distance,
+    # so two sets that leave the same bins empty still agree on them.
+    out = list(sig)
+    carry, dist = _EMPTY, 0
+    for i in range(2 * num_hashes - 1, -1, -1):
+        v = sig[i % num_hashes]
+        if v != _EMPTY:
+            carry, dist = v, 0
+            continue
+        dist += 1
+        if i < num_hashes:
+            out[i] = carry + dist * _EMPTY
+    return out
+
+
+def jaccard(a: set[int], b: set[int]) -> float:
+    if not a and not b:
+        return 1.0
+    shared = len(a & b)
+    return shared / (len(a) + len(b) - shared)
+
+
+class _UnionFind:
+    def __init__(self, n: int) -> None:
+        self.parent = list(range(n))
+
+    def find(self, x: int) -> int:
+        parent = self.parent
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    def union(self, a: int, b: int) -> None:
+        ra, rb = self.find(a), self.find(b)
+        if ra != rb:
+            self.parent[max(ra, rb)] = min(ra, rb)
+
+
+def find_near_duplicates(
+    items: Iterable[dict[str, Any]],
+    threshold: float = DEFAULT_THRESHOLD,
+    num_hashes: int = NUM_HASHES,
+    bands: int = BANDS,
+    max_bucket: int = MAX_BUCKET,
+) -> dict[str, Any]:
+    if num_hashes % bands:
+        raise ValueError("num_hashes must be a multiple of bands")
+
+    ids: list[str] = []
+    families: list[str] = []
+    stems: list[str] = []
+    shingles: list[set[int]] = []
+    for i, item in enumerate(items):
+        # Items without an id are named by 1-based bank position, as the validator reports them.
+        iid = str(item.get("id") or i + 1)
+        stem = str(item.get("stem") or "")
+        sh = stem_shingles(stem)
+        ids.append(iid)
+        families.append(str(item.get("variantOf") or iid))
+        stems.append(stem)
+        shingles.append(sh)
+
+    buckets: dict[tuple[int, tuple[int, ...]], list[int]] = {}
+    for i, sh in enumerate(shingles):
+        if not sh:
+            continue
+        sig = minhash_signature(sh, num_hashes)
+        # Bands take every `bands`-th bin rather than adjacent ones: a run of
+        # empty bins densified from one donor then never fills a whole band.
+        for band in range(bands):
+            key = (band, tuple(sig[band::bands]))
+            buckets.setdefault(key, []).append(i)
+
+    # Jaccard similarity is not transitive, so every pair sharing a bucket is a
+    # candidate, not just pairs with a cluster representative. Pairs are keyed
+    # i * n + j (members are appended in item order, so i < j), which also
+    # drops pairs that share several bands.
+    n = len(ids)
+    candidates: set[int] = set()
+    oversized = 0
+    for members in buckets.values():
+        if len(members) < 2:
+            continue
+        if len(members) > max_bucket:
+            oversized += 1
+            continue
+        for x, i in enumerate(members[:-1]):
+            base = i * n
+            candidates.update([base + j for j in members[x + 1:]])
+
+    uf = _UnionFind(n)
+    similarity: dict[tuple[int, int], float] = {}
+    for key in candidates:
+        i, j = divmod(key, n)
+        if families[i] == families[j]:
+            continue
+        a, b = shingles[i], shingles[j]
+        # Set sizes alone bound the Jaccard similarity.
+        if min(len(a), len(b)) < threshold * max(len(a), len(b)):
+            continue
+        sim = jaccard(a, b)
+        if sim >= threshold:
+            similarity[(i, j)] = sim
+            uf.union(i, j)
+
+    grouped: dict[int, list[int]] = {}
+    for r, i in similarity:
+        grouped.setdefault(uf.find(r), [])
+    for i in range(len(ids)):
+        root = uf.find(i)
+        if root in grouped:
+            grouped[root].append(i)
+    sims_by_root: dict[int, list[float]] = {}
+    for (r, _), sim in similarity.items():
+        sims_by_root.setdefault(uf.find(r), []).append(sim)
+
+    clusters: list[dict[str, Any]] = []
+    for root, members in sorted(grouped.items(), key=lambda g: (-len(g[1]), g[1][0])):
+        sims = sims_by_root[root]
+        clusters.append({
+            "items": [ids[i] for i in members],
+            "families": sorted({families[i] for i in members}),
+            "min_similarity": round(min(sims), 3),
+            "max_similarity": round(max(sims), 3),
+            "stem": stems[members[0]][:STEM_PREVIEW_CHARS],
+        })
+
+    return {
+        "item_count": len(ids),
+        "threshold": threshold,
+        "num_hashes": num_hashes,
+        "bands": bands,
+        "shingle_words": SHINGLE_WORDS,
+        "max_bucket": max_bucket,
+        "oversized_buckets": oversized,
+        "candidate_pairs": len(candidates),
+        "cluster_count": len(clusters),
+        "clustered_items": sum(len(c["items"]) for c in clusters),
+        "clusters": clusters,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("bank_json", type=Path)
+    parser.add_argument("--write-report", type=Path)
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="minimum stem shingle Jaccard similarity")
+    parser.add_argument("--num-hashes", type=int, default=NUM_HASHES)
+    parser.add_argument("--bands", type=int, default=BANDS)
+    parser.add_argument("--max-bucket", type=int, default=MAX_BUCKET, help="skip LSH buckets with more members than this")
+    parser.add_argument("--stream", action="store_true", help="read items one at a time")
+    parser.add_argument("--fail-on-clusters", action="store_true")
+    add_timing_args(parser)
+    args = parser.parse_args()
+
+    timer = PhaseTimer.from_args(args)
+    with cprofile_run(args):
+        with timer.phase("load"):
+            if args.stream:
+                stream = BankStream(args.bank_json)
+                if not stream.has_item_array:
+                    raise SystemExit("Top-level 'items' must be a list")
+                items: Iterable[dict[str, Any]] = stream.items()
+            else:
+                bank = load_bank_data(args.bank_json)
+                items = bank.get("items", []) if isinstance(bank, dict) else []
+
+        with timer.phase("near_duplicates"):
+            report = find_near_duplicates(items, args.threshold, args.num_hashes, args.bands, args.max_bucket)
+
+        if args.write_report:
+            timer.write_json(args.write_report, timer.embed(report), "report")
+
+    summary_keys = ("item_count", "oversized_buckets", "candidate_pairs", "cluster_count", "clustered_items")
+    print("SUMMARY:", json.dumps({k: report[k] for k in summary_keys}))
+    for cluster in report["clusters"][:10]:
+        print("CLUSTER:", json.dumps({"items": cluster["items"], "min_similarity": cluster["min_similarity"]}, ensure_ascii=False))
+    timer.print_summary()
+
+    if args.fail_on_clusters and report["cluster_count"]:
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
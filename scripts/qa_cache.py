@@ -0,0 +1,137 @@
+"""Per-item result cache for the CAT QA passes.
+
+validate/lint/audit results are stored per item, keyed by the item's content
+hash, so a re-run only recomputes items that changed. Bank-level summaries are
+re-aggregated from the cached rows.
+
+Each pass keeps its own file under `<bank>.qa-cache/`. Entries are namespaced
+by a fingerprint of the pass's source code plus any run options that change
+its output (lint profile, strict text matching, source catalog), so editing a
+rule invalidates that pass's cache automatically.
+
+Cache files are written with marshal, not pickle, so loading one cannot run
+code; cached values are therefore plain lists, tuples, dicts and scalars.
+
+Set CAT_QA_CACHE=0 to bypass the cache.
+"""
+from __future__ import annotations
+
+import hashlib
+import marshal
+import os
+from pathlib import Path
+from typing import Any, Callable, TypeVar
+
+from bank_io import item_hash
+
+QA_CACHE_SUFFIX = ".qa-cache"
+QA_CACHE_ENV = "CAT_QA_CACHE"
+
+T = TypeVar("T")
+
+
+def qa_cache_enabled() -> bool:
+    return os.environ.get(QA_CACHE_ENV, "1").strip().lower() not in {"0", "false", "no", "off"}
+
+
+def code_fingerprint(*module_files: str) -> str:
+    h = hashlib.sha256()
+    for module_file in module_files:
+        h.update(Path(module_file).read_bytes())
+    return h.hexdigest()[:16]
+
+
+def item_key(item: dict[str, Any], idx: int) -> str:
+    # Items without an id are reported by position, so the position is part of the key.
+    key = item_hash(item)
+    return key if item.get("id") else f"{key}@{idx}"
+
+
+def item_keys(items: list[dict[str, Any]]) -> list[str]:
+    """Keys for a whole bank; compute once and share across passes."""
+    return [item_key(item, i) for i, item in enumerate(items, start=1)]
+
+
+class QACache:
+    """One pass's cached per-item results for one namespace."""
+
+    def __init__(self, path: Path, namespace: str, keys: list[str] | None = None) -> None:
+        self.path = path
+        self.namespace = namespace
+        self.keys = keys
+        self.hits = 0
+        self.misses = 0
+        self._namespaces: dict[str, dict[str, Any]] = {}
+        self._used: dict[str, Any] = {}
+        try:
+            with path.open("rb") as fh:
+                loaded = marshal.load(fh)
+            if isinstance(loaded, dict):
+                self._namespaces = loaded
+        except (OSError, EOFError, TypeError, ValueError):
+            self._namespaces = {}
+        self._entries = self._namespaces.get(namespace, {})
+
+    @classmethod
+    def for_bank(
+        cls, bank_path: Path, pass_name: str, namespace: str, keys: list[str] | None = None
+    ) -> "QACache | None":
+        if not qa_cache_enabled():
+            return None
+        bank_path = Path(bank_path)
+        cache_dir = bank_path.with_name(bank_path.name + QA_CACHE_SUFFIX)
+        return cls(cache_dir / f"{pass_name}.marshal", namespace, keys)
+
+    def _key(self, item: dict[str, Any], idx: int) -> str:
+        return self.keys[idx - 1] if self.keys is not None else item_key(item, idx)
+
+    def item_hash(self, item: dict[str, Any], idx: int) -> str:
+        """bank_io.item_hash(item), taken from the precomputed key when there is one."""
+        return self._key(item, idx).partition("@")[0]
+
+    def lookup(self, item: dict[str, Any], idx: int) -> tuple[bool, Any]:
+        """(True, value) on a hit; on a miss the caller computes and calls put()."""
+        key = self._key(item, idx)
+        if key not in self._entries:
+            return False, None
+        self.hits += 1
+        value = self._used[key] = self._entries[key]
+        return True, value
+
+    def put(self, item: dict[str, Any], idx: int, value: Any) -> None:
+        self.misses += 1
+        self._used[self._key(item, idx)] = value
+
+    def get_or_compute(self, item: dict[str, Any], idx: int, compute: Callable[[], T]) -> T:
+        key = self._key(item, idx)
+        if key in self._entries:
+            self.hits += 1
+            value = self._entries[key]
+        else:
+            self.misses += 1
+            value = compute()
+        self._used[key] = value
+        return value
+
+    def save(self) -> None:
+        """Persist entries used in this run; stale items of this namespace are dropped."""
+        if not self.misses and len(self._used) == len(self._entries):
+            return
+        self._namespaces[self.namespace] = self._used
+        tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with tmp.open("wb") as fh:
+                marshal.dump(self._namespaces, fh)
+            os.replace(tmp, self.path)
+        except OSError:
+            try:
+                tmp.unlink()
+            except OSError:
+                pass
+
+
+def cached_item(cache: QACache | None, item: dict[str, Any], idx: int, compute: Callable[[], T]) -> T:
+    if cache is None:
+        return compute()
+    return cache.get_or_compute(item, idx, compute)
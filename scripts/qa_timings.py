@@ -0,0 +1,118 @@
+"""Opt-in per-phase timing and peak-memory instrumentation for the CAT scripts.
+
+Enable with `--timings` or CAT_QA_TIMINGS=1 (CAT_QA_TIMINGS=wall skips the
+tracemalloc peak, which itself slows Python allocation down). Each phase (load,
+validate/lint/audit, serialize, write) records wall time and peak traced
+memory. Report-writing scripts embed the phases finished before the report is
+serialized as a `timings` block, and the full run is summarized on stderr.
+
+`--cprofile PATH` (or CAT_QA_CPROFILE=PATH) also dumps cProfile stats for the
+run, for `python3 -m pstats PATH`.
+
+Nothing is recorded by default, so committed artifacts stay byte-for-byte
+unchanged.
+"""
+from __future__ import annotations
+
+import argparse
+import contextlib
+import cProfile
+import json
+import os
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Iterator, TextIO
+
+from bank_io import atomic_write, write_json
+
+TIMINGS_ENV = "CAT_QA_TIMINGS"
+CPROFILE_ENV = "CAT_QA_CPROFILE"
+
+
+def add_timing_args(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--timings", action="store_true", help="record per-phase wall time and peak memory")
+    parser.add_argument("--cprofile", type=Path, help="dump cProfile stats for the run to this path")
+
+
+class PhaseTimer:
+    """Records named phases; a disabled timer is a no-op."""
+
+    def __init__(self, enabled: bool = False, trace_memory: bool = True) -> None:
+        self.enabled = enabled
+        self.trace_memory = enabled and trace_memory
+        self.phases: list[dict[str, Any]] = []
+        self._started = time.perf_counter()
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    @classmethod
+    def from_args(cls, args: argparse.Namespace | None = None) -> "PhaseTimer":
+        env = os.environ.get(TIMINGS_ENV, "").strip().lower()
+        enabled = bool(getattr(args, "timings", False)) or env not in {"", "0", "false", "no", "off"}
+        return cls(enabled=enabled, trace_memory=env != "wall")
+
+    @contextlib.contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        if not self.enabled:
+            yield
+            return
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            entry: dict[str, Any] = {"phase": name, "wall_s": round(time.perf_counter() - start, 4)}
+            if self.trace_memory:
+                entry["peak_mb"] = round(tracemalloc.get_traced_memory()[1] / (1024 * 1024), 2)
+            self.phases.append(entry)
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "phases": [dict(p) for p in self.phases],
+            "total_s": round(time.perf_counter() - self._started, 4),
+        }
+
+    def embed(self, report: dict[str, Any]) -> dict[str, Any]:
+        if self.enabled:
+            report["timings"] = self.as_dict()
+        return report
+
+    def write_json(self, path: Path, obj: Any, label: str = "") -> None:
+        """bank_io.write_json(), split into serialize/write phases when enabled."""
+        if not self.enabled:
+            write_json(path, obj)
+            return
+        suffix = f":{label}" if label else ""
+        with self.phase("serialize" + suffix):
+            text = json.dumps(obj, indent=2, ensure_ascii=False) + "\n"
+        with self.phase("write" + suffix):
+            atomic_write(path, [text])
+
+    def print_summary(self, out: TextIO | None = None) -> None:
+        if not self.enabled:
+            return
+        out = out or sys.stderr
+        for p in self.phases:
+            peak = f"  peak {p['peak_mb']:.2f}MB" if "peak_mb" in p else ""
+            print(f"TIMING: {p['phase']:<24} {p['wall_s']:9.4f}s{peak}", file=out)
+        print(f"TIMING: {'total':<24} {self.as_dict()['total_s']:9.4f}s", file=out)
+
+
+@contextlib.contextmanager
+def cprofile_run(args: argparse.Namespace | None = None) -> Iterator[None]:
+    """Profile the enclosed block when `--cprofile` or CAT_QA_CPROFILE names an output file."""
+    target = getattr(args, "cprofile", None) or os.environ.get(CPROFILE_ENV, "").strip() or None
+    if target is None:
+        yield
+        return
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        profiler.dump_stats(str(target))
+        print(f"TIMING: cProfile stats written to {target}", file=sys.stderr)
@@ -0,0 +1,199 @@
+"""Compact layout for item_quality_lint reports, and a reader for every layout.
+
+The full report repeats the same finding `kind`/`message` strings and item-score
+keys thousands of times. The compact layout stores:
+
+- `finding_groups`: one entry per distinct (level, kind, message) with the
+  positions (into `item_scores`) of the items it was raised for;
+- `item_scores` as columns;
+- `kind_order`: the order findings appear in within one item, so the original
+  `findings` list can be rebuilt exactly. `low_quality_items` is recomputed.
+
+It can be written as JSON (one group or column per line, so diffs stay
+readable) or as NDJSON, either optionally gzip-compressed (`.gz` suffix).
+read_quality_report() returns the original full shape for any of them.
+"""
+from __future__ import annotations
+
+import gzip
+import io
+import json
+from pathlib import Path
+from typing import Any, Iterator
+
+from bank_io import atomic_write
+
+COMPACT_FORMAT = "quality-compact/1"
+SCORE_COLUMNS = ("item", "quality_score", "domain", "questionType", "pilotEligible")
+LOW_QUALITY_SAMPLE = 50
+_GROUPED = ("findings", "item_scores", "low_quality_items")
+
+
+def _compact_json(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+
+def _kind_order(findings: list[dict[str, str]], positions: list[int]) -> list[str]:
+    """Kinds sorted so that every item's findings appear in report order."""
+    first_seen: dict[str, int] = {}
+    edges: dict[str, set[str]] = {}
+    indegree: dict[str, int] = {}
+    prev: tuple[int, str] | None = None
+    for n, (f, pos) in enumerate(zip(findings, positions)):
+        kind = f["kind"]
+        first_seen.setdefault(kind, n)
+        edges.setdefault(kind, set())
+        indegree.setdefault(kind, 0)
+        if prev is not None and prev[0] == pos and kind not in edges[prev[1]]:
+            edges[prev[1]].add(kind)
+            indegree[kind] += 1
+        prev = (pos, kind)
+
+    order: list[str] = []
+    ready = sorted((k for k, d in indegree.items() if d == 0), key=first_seen.__getitem__)
+    while ready:
+        kind = ready.pop(0)
+        order.append(kind)
+        for nxt in edges[kind]:
+            indegree[nxt] -= 1
+            if indegree[nxt] == 0:
+                ready.append(nxt)
+        ready.sort(key=first_seen.__getitem__)
+    if len(order) != len(indegree):
+        raise ValueError("Findings have no consistent per-item kind order")
+    return order
+
+
+def compact_report(report: dict[str, Any]) -> dict[str, Any]:
+    scores = report.get("item_scores", [])
+    findings = report.get("findings", [])
+
+    # Findings follow item order, so each one belongs to the next item with that id.
+    positions: list[int] = []
+    pos = 0
+    for f in findings:
+        while pos < len(scores) and scores[pos]["item"] != f["item"]:
+            pos += 1
+        if pos == len(scores):
+            raise ValueError(f"Finding for {f['item']!r} is not in item order")
+        positions.append(pos)
+
+    groups: dict[tuple[str, str, str], list[int]] = {}
+    for f, p in zip(findings, positions):
+        groups.setdefault((f["level"], f["kind"], f["message"]), []).append(p)
+
+    compact: dict[str, Any] = {"format": COMPACT_FORMAT}
+    compact.update((k, v) for k, v in report.items() if k not in _GROUPED)
+    compact["item_scores"] = {col: [s.get(col) for s in scores] for col in SCORE_COLUMNS}
+    compact["kind_order"] = _kind_order(findings, positions)
+    compact["finding_groups"] = [
+        {"level": level, "kind": kind, "message": message, "items": items}
+        for (level, kind, message), items in groups.items()
+    ]
+    if expand_report(compact) != report:
+        raise ValueError("Quality report does not round-trip through the compact layout")
+    return compact
+
+
+def expand_report(compact: dict[str, Any]) -> dict[str, Any]:
+    """Rebuild the full report shape item_quality_lint writes by default."""
+    columns = compact["item_scores"]
+    count = len(columns["item"])
+    scores = [{col: columns[col][i] for col in SCORE_COLUMNS} for i in range(count)]
+
+    rank = {kind: n for n, kind in enumerate(compact["kind_order"])}
+    keyed: list[tuple[int, int, dict[str, str]]] = []
+    for group in compact["finding_groups"]:
+        for pos in group["items"]:
+            finding = {"level": group["level"], "kind": group["kind"], "item": scores[pos]["item"], "message": group["message"]}
+            keyed.append((pos, rank[group["kind"]], finding))
+    keyed.sort(key=lambda k: (k[0], k[1]))
+
+    meta = {k: v for k, v in compact.items() if k not in {"format", "item_scores", "kind_order", "finding_groups"}}
+    report: dict[str, Any] = {}
+    for key in ("item_count", "profile", "error_count", "warning_count", "info_count", "average_quality_score"):
+        if key in meta:
+            report[key] = meta.pop(key)
+    report["low_quality_items"] = sorted(scores, key=lambda x: x["quality_score"])[:LOW_QUALITY_SAMPLE]
+    report["findings"] = [k[2] for k in keyed]
+    report["item_scores"] = scores
+    report.update(meta)
+    return report
+
+
+def _compact_lines(compact: dict[str, Any]) -> Iterator[str]:
+    yield "{"
+    keys = list(compact)
+    for n, key in enumerate(keys):
+        sep = "," if n < len(keys) - 1 else ""
+        value = compact[key]
+        if key == "item_scores":
+            yield f'  "{key}": {{'
+            for m, col in enumerate(SCORE_COLUMNS):
+                yield f'    "{col}": {_compact_json(value[col])}' + ("," if m < len(SCORE_COLUMNS) - 1 else "")
+            yield "  }" + sep
+        elif key == "finding_groups":
+            yield f'  "{key}": ['
+            for m, group in enumerate(value):
+                yield "    " + _compact_json(group) + ("," if m < len(value) - 1 else "")
+            yield "  ]" + sep
+        else:
+            yield f"  {_compact_json(key)}: {_compact_json(value)}{sep}"
+    yield "}"
+
+
+def _ndjson_lines(compact: dict[str, Any]) -> Iterator[str]:
+    header = {k: v for k, v in compact.items() if k not in {"item_scores", "finding_groups"}}
+    yield _compact_json(header)
+    for col in SCORE_COLUMNS:
+        yield _compact_json({"column": col, "values": compact["item_scores"][col]})
+    for group in compact["finding_groups"]:
+        yield _compact_json({"group": group})
+
+
+def compact_text(report: dict[str, Any], ndjson: bool = False) -> str:
+    compact = compact_report(report)
+    lines = _ndjson_lines(compact) if ndjson else _compact_lines(compact)
+    return "\n".join(lines) + "\n"
+
+
+def write_quality_report(path: Path, report: dict[str, Any]) -> None:
+    """Write the compact layout; `.ndjson` selects NDJSON and a `.gz` suffix compresses."""
+    path = Path(path)
+    name = path.name[:-3] if path.name.endswith(".gz") else path.name
+    text = compact_text(report, ndjson=name.endswith(".ndjson"))
+    if path.name.endswith(".gz"):
+        # mtime=0 keeps the compressed bytes deterministic.
+        atomic_write(path, [gzip.compress(text.encode("utf-8"), mtime=0)])
+    else:
+        atomic_write(path, [text])
+
+
+def read_quality_report(path: Path) -> dict[str, Any]:
+    """Load a quality report in any layout and return the full shape."""
+    raw = Path(path).read_bytes()
+    if raw[:2] == b"\x1f\x8b":
+        raw = gzip.decompress(raw)
+    text = raw.decode("utf-8")
+    try:
+        data = json.loads(text)
+    except json.JSONDecodeError:
+        data = _parse_ndjson(text)
+    if isinstance(data, dict) and data.get("format") == COMPACT_FORMAT:
+        return expand_report(data)
+    return data
+
+
+def _parse_ndjson(text: str) -> dict[str, Any]:
+    lines = [json.loads(line) for line in io.StringIO(text) if line.strip()]
+    if not lines:
+        raise ValueError("Empty quality report")
+    compact = dict(lines[0])
+    compact["item_scores"] = {}
+    compact["finding_groups"] = []
+    for record in lines[1:]:
+        if "column" in record:
+            compact["item_scores"][record["column"]] = record["values"]
+        else:
+            compact["finding_groups"].append(record["group"])
+    return compact
@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+"""Run all CAT bank QA passes in one process over a single loaded bank.
+
+Equivalent to the `cat-annotate -> cat-contract -> cat-qa -> cat-accuracy ->
+cat-quality` Makefile chain, but the bank is parsed once and the independent
+passes run in turn (or on a process pool with --jobs N). Artifacts are
+byte-for-byte identical to the ones the individual scripts write.
+"""
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import json
+import multiprocessing
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+import annotate_cat_sources
+import audit_cat_accuracy
+import check_cat_contract
+import item_quality_lint
+import validate_cat_bank
+import validate_open_sources
+from bank_io import LoadedBank, atomic_write, journal_path, load_bank, prime_parse_cache, read_journal, save_bank
+from qa_cache import QACache, item_keys
+from qa_timings import PhaseTimer, add_timing_args, cprofile_run
+
+PASS_ORDER = ("contract", "qa", "accuracy", "quality", "open-sources")
+
+# Bank and per-item cache keys shared with pool workers: inherited on fork,
+# loaded from the parse cache otherwise.
+_BANK: dict[str, Any] | None = None
+_KEYS: list[str] | None = None
+
+
+@dataclass
+class PassResult:
+    name: str
+    exit_code: int
+    output: str
+    artifacts: dict[str, str] = field(default_factory=dict)
+
+
+def json_text(obj: Any) -> str:
+    return json.dumps(obj, indent=2, ensure_ascii=False) + "\n"
+
+
+def _bank_keys(bank: dict[str, Any]) -> list[str] | None:
+    items = bank.get("items")
+    return item_keys(items) if isinstance(items, list) else None
+
+
+def _init_worker(bank_path: str) -> None:
+    global _BANK, _KEYS
+    if _BANK is None:
+        _BANK = load_bank(Path(bank_path)).data
+        _KEYS = _bank_keys(_BANK)
+
+
+def _open_cache(opts: dict[str, Any], pass_name: str, namespace: str) -> QACache | None:
+    return QACache.for_bank(Path(opts["bank_file"]), pass_name, namespace, keys=_KEYS)
+
+
+def _save_cache(cache: QACache | None) -> None:
+    if cache is not None:
+        cache.save()
+
+
+def _pass_contract(bank: dict[str, Any], opts: dict[str, Any]) -> tuple[int, dict[str, str]]:
+    result = check_cat_contract.check_contract(
+        bank, opts["app_js"], opts["index_html"], opts["schema_json"], opts["pending_journal"]
+    )
+    check_cat_contract.print_contract(result)
+    return (1 if result["errors"] else 0), {}
+
+
+def _pass_timer(opts: dict[str, Any]) -> PhaseTimer:
+    return PhaseTimer(enabled=opts["timings"], trace_memory=opts["trace_memory"])
+
+
+def _pass_qa(bank: dict[str, Any], opts: dict[str, Any]) -> tuple[int, dict[str, str]]:
+    timer = _pass_timer(opts)
+    with timer.phase("validate"):
+        cache = None
+        if isinstance(bank.get("sourceCatalog"), dict):
+            cache = _open_cache(opts, "validate", validate_cat_bank.cache_namespace(bank["sourceCatalog"]))
+        findings, summary = validate_cat_bank.validate(bank, cache=cache)
+        _save_cache(cache)
+    artifacts: dict[str, str] = {}
+    if opts["qa_report"]:
+        distributions = None
+        if opts["distributions"] and isinstance(bank.get("items"), list):
+            with timer.phase("distributions"):
+                distributions = validate_cat_bank.bank_distributions(bank["items"])
+        report = timer.embed(
+            validate_cat_bank.build_report(opts["bank_file"], opts["sha256"], findings, summary, distributions)
+        )
+        with timer.phase("serialize:report"):
+            artifacts[opts["qa_report"]] = json_text(report)
+    if opts["manifest"]:
+        merkle = None
+        if opts["item_hashes"] and isinstance(bank.get("items"), list):
+            with timer.phase("merkle"):
+                merkle = validate_cat_bank.bank_merkle(bank["items"])
+        manifest = validate_cat_bank.build_manifest(opts["bank_file"], opts["sha256"], summary, merkle)
+        with timer.phase("serialize:manifest"):
+            artifacts[opts["manifest"]] = json_text(manifest)
+    validate_cat_bank.print_results(findings, summary)
+    timer.print_summary(sys.stdout)
+    return (1 if any(f.level == "error" for f in findings) else 0), artifacts
+
+
+def _pass_accuracy(bank: dict[str, Any], opts: dict[str, Any]) -> tuple[int, dict[str, str]]:
+    items = bank.get("items")
+    if not isinstance(items, list):
+        print("Top-level 'items' must be a list")
+        return 1, {}
+    timer = _pass_timer(opts)
+    with timer.phase("audit"):
+        cache = _open_cache(opts, "audit", audit_cat_accuracy.cache_namespace(opts["strict_text_match"]))
+        report = audit_cat_accuracy.audit(items, strict_text_match=opts["strict_text_match"], cache=cache)
+        _save_cache(cache)
+    if opts["semantic"]:
+        with timer.phase("semantic"):
+            audit_cat_accuracy.add_semantic_findings(report, items)
+    artifacts: dict[str, str] = {}
+    if opts["accuracy_report"]:
+        timer.embed(report)
+        with timer.phase("serialize:report"):
+            artifacts[opts["accuracy_report"]] = json_text(report)
+    audit_cat_accuracy.print_report(report)
+    timer.print_summary(sys.stdout)
+    return (1 if report["error_count"] else 0), artifacts
+
+
+def _pass_quality(bank: dict[str, Any], opts: dict[str, Any]) -> tuple[int, dict[str, str]]:
+    timer = _pass_timer(opts)
+    with timer.phase("lint"):
+        cache = _open_cache(opts, "lint", item_quality_lint.cache_namespace(opts["profile"]))
+        # Item hashes let a later `item_quality_lint.py --baseline` skip unchanged items.
+        report = item_quality_lint.lint(bank, profile=opts["profile"], cache=cache, record_hashes=True)
+        _save_cache(cache)
+    artifacts: dict[str, str] = {}
+    if opts["quality_report"]:
+        timer.embed(report)
+        with timer.phase("serialize:report"):
+            artifacts[opts["quality_report"]] = json_text(report)
+    item_quality_lint.print_summary(report)
+    timer.print_summary(sys.stdout)
+    return (1 if report["error_count"] else 0), artifacts
+
+
+def _pass_open_sources(bank: dict[str, Any], opts: dict[str, Any]) -> tuple[int, dict[str, str]]:
+    errors, warnings, counts = validate_open_sources.validate_open(bank, set(opts["open_catalog_ids"]))
+    validate_open_sources.print_open_validation(errors, warnings, counts)
+    return (1 if errors else 0), {}
+
+
+PASSES = {
+    "contract": _pass_contract,
+    "qa": _pass_qa,
+    "accuracy": _pass_accuracy,
+    "quality": _pass_quality,
+    "open-sources": _pass_open_sources,
+}
+
+
+def run_pass(name: str, opts: dict[str, Any]) -> PassResult:
+    assert _BANK is not None, "bank not loaded in this process"
+    buf = io.StringIO()
+    with contextlib.redirect_stdout(buf):
+        exit_code, artifacts = PASSES[name](_BANK, opts)
+    return PassResult(name=name, exit_code=exit_code, output=buf.getvalue(), artifacts=artifacts)
+
+
+def run_passes(names: list[str], opts: dict[str, Any], bank_path: Path, jobs: int) -> list[PassResult]:
+    if jobs <= 1 or len(names) <= 1:
+        return [run_pass(name, opts) for name in names]
+
+    methods = multiprocessing.get_all_start_methods()
+    ctx = multiprocessing.get_context("fork" if "fork" in methods else None)
+    with ProcessPoolExecutor(
+        max_workers=min(jobs, len(names)),
+        mp_context=ctx,
+        initializer=_init_worker,
+        initargs=(str(bank_path),),
+    ) as pool:
+        futures = [pool.submit(run_pass, name, opts) for name in names]
+        return [f.result() for f in futures]
+
+
+def annotate_in_place(loaded: LoadedBank) -> tuple[str, bool]:
+    """Mirror `annotate_cat_sources.py <bank>`; returns (sha256, rewritten)."""
+    provenance_file = annotate_cat_sources.provenance_path(loaded.path)
+    previous = annotate_cat_sources.load_provenance(provenance_file)
+    annotator = annotate_cat_sources.Annotator(previous)
+    digest = annotate_cat_sources.annotate_loaded(loaded, annotator)
+    annotate_cat_sources.save_provenance(provenance_file, annotator, previous)
+    if digest == loaded.sha256:
+        if not loaded.canonical:
+            prime_parse_cache(loaded.path, digest, loaded.data)
+        return digest, False
+    digest = save_bank(loaded.path, loaded.data)
+    prime_parse_cache(loaded.path, digest, loaded.data)
+    return digest, True
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("bank_json", type=Path, nargs="?", default=Path("cat/question-bank.sample.json"))
+    parser.add_argument("--skip-annotate", action="store_true")
+    parser.add_argument("--qa-report", type=Path, default=Path("cat/question-bank.qa.json"))
+    parser.add_argument("--manifest", type=Path, default=Path("cat/question-bank.manifest.json"))
+    parser.add_argument("--accuracy-report", type=Path, default=Path("cat/question-bank.accuracy.json"))
+    parser.add_argument("--quality-report", type=Path, default=Path("cat/question-bank.quality.json"))
+    parser.add_argument("--profile", choices=["human", "strict"], default="human")
+    parser.add_argument("--strict-text-match", action="store_true")
+    parser.add_argument("--semantic", action="store_true", help="add the TF-IDF explanation/key check to the accuracy audit")
+    parser.add_argument("--distributions", action="store_true", help="add per-domain distributions to the QA report")
+    parser.add_argument("--item-hashes", action="store_true", help="add per-item hashes and a Merkle root to the manifest")
+    parser.add_argument("--open-sources", action="store_true", help="also run the open-source policy check")
+    parser.add_argument("--catalog", type=Path, default=Path("sources/open_sources_catalog.json"))
+    parser.add_argument("--app", type=Path, default=Path("cat/app.js"))
+    parser.add_argument("--index", type=Path, default=Path("cat/index.html"))
+    parser.add_argument("--schema", type=Path, default=Path("cat/item-schema.json"))
+    parser.add_argument("--jobs", type=int, default=1, help="run the passes on N processes (default: serially)")
+    add_timing_args(parser)
+    args = parser.parse_args()
+
+    timer = PhaseTimer.from_args(args)
+    with cprofile_run(args):
+        exit_code = _run(args, timer)
+    timer.print_summary()
+    return exit_code
+
+
+def _run(args: argparse.Namespace, timer: PhaseTimer) -> int:
+    global _BANK, _KEYS
+    with timer.phase("load"):
+        loaded = load_bank(args.bank_json)
+    bank = loaded.data
+    sha256 = loaded.sha256
+
+    if not args.skip_annotate:
+        with timer.phase("annotate"):
+            sha256, rewritten = annotate_in_place(loaded)
+        state = "updated" if rewritten else "unchanged"
+        print(f"Annotated source citations for {len(bank.get('items', []))} items in {args.bank_json} ({state})")
+
+    names = [n for n in PASS_ORDER if n != "open-sources" or args.open_sources]
+    opts: dict[str, Any] = {
+        "bank_file": str(args.bank_json),
+        "sha256": sha256,
+        "qa_report": str(args.qa_report) if args.qa_report else "",
+        "manifest": str(args.manifest) if args.manifest else "",
+        "accuracy_report": str(args.accuracy_report) if args.accuracy_report else "",
+        "quality_report": str(args.quality_report) if args.quality_report else "",
+        "profile": args.profile,
+        "strict_text_match": args.strict_text_match,
+        "semantic": args.semantic,
+        "distributions": args.distributions,
+        "item_hashes": args.item_hashes,
+        "app_js": args.app.read_text(encoding="utf-8"),
+        "index_html": args.index.read_text(encoding="utf-8"),
+        "schema_json": args.schema.read_text(encoding="utf-8") if args.schema.exists() else "",
+        # Annotation folds a pending journal into the bank; with --skip-annotate it stays pending.
+        "pending_journal": str(journal_path(args.bank_json)) if read_journal(args.bank_json) else "",
+        "open_catalog_ids": [],
+        "timings": timer.enabled,
+        "trace_memory": timer.trace_memory,
+    }
+    if args.open_sources:
+        opts["open_catalog_ids"] = sorted(json.loads(args.catalog.read_text(encoding="utf-8")).keys())
+
+    _BANK = bank
+    _KEYS = _bank_keys(bank)
+    with timer.phase("passes"):
+        results = run_passes(names, opts, args.bank_json, args.jobs)
+
+    exit_code = 0
+    for result in results:
+        for path, text in result.artifacts.items():
+            with timer.phase(f"write:{Path(path).name}"):
+                atomic_write(Path(path), [text])
+        print(f"== {result.name} ==")
+        print(result.output, end="")
+        if result.exit_code:
+            exit_code = 1
+    return exit_code
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""Split the question bank into content-hashed per-domain shards.
+
+Each blueprint domain gets its own shard, PBQ items (dragdrop/ordering/hotspot)
+get one shared shard, and the top-level members other than `items`
+(sourceCatalog, ...) get a `members` shard. File names carry the first 12 hex
+digits of the shard's sha256, so clients can cache them forever. The small
+`manifest.json` next to them is the only file that has to be re-fetched to find out
+what changed.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import re
+from pathlib import Path
+from typing import Any
+
+from bank_io import atomic_write, load_bank, write_json
+from cat_domains import BLUEPRINT, canonical_domain
+from validate_cat_bank import sha256_bytes
+
+PBQ_TYPES = {"dragdrop", "ordering", "hotspot"}
+SHARD_PREFIX = "question-bank."
+MANIFEST_NAME = "manifest.json"
+HASH_CHARS = 12
+
+
+def shard_key(item: dict[str, Any]) -> str:
+    if item.get("type") in PBQ_TYPES:
+        return "pbq"
+    domain = canonical_domain(item.get("domain"))
+    if domain in BLUEPRINT:
+        return "d" + domain.split(".", 1)[0]
+    return "other"
+
+
+def shard_text(payload: dict[str, Any]) -> str:
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":")) + "\n"
+
+
+def build_shards(bank: dict[str, Any]) -> dict[str, dict[str, Any]]:
+    """Shard key -> payload, in a stable order: domains, pbq, other, members."""
+    grouped: dict[str, list[dict[str, Any]]] = {}
+    for item in bank.get("items", []):
+        grouped.setdefault(shard_key(item), []).append(item)
+
+    order = ["d" + d.split(".", 1)[0] for d in BLUEPRINT] + ["pbq", "other"]
+    shards = {key: {"items": grouped[key]} for key in order if key in grouped}
+    shards["members"] = {k: v for k, v in bank.items() if k != "items"}
+    return shards
+
+
+def write_shards(bank_path: Path, out_dir: Path) -> dict[str, Any]:
+    loaded = load_bank(bank_path)
+    if not isinstance(loaded.data.get("items"), list):
+        raise ValueError("Top-level 'items' must be a list to shard the bank")
+
+    domains = {"d" + d.split(".", 1)[0]: d for d in BLUEPRINT}
+    out_dir.mkdir(parents=True, exist_ok=True)
+    entries: list[dict[str, Any]] = []
+    written: set[str] = set()
+    for key, payload in build_shards(loaded.data).items():
+        text = shard_text(payload)
+        data = text.encode("utf-8")
+        digest = sha256_bytes(data)
+        name = f"{SHARD_PREFIX}{key}.{digest[:HASH_CHARS]}.json"
+        target = out_dir / name
+        if not target.exists() or sha256_bytes(target.read_bytes()) != digest:
+            atomic_write(target, [text])
+        written.add(name)
+        entry: dict[str, Any] = {"key": key, "file": name, "sha256": digest, "bytes": len(data)}
+        if key in domains:
+            entry["domain"] = domains[key]
+        if "items" in payload:
+            entry["item_count"] = len(payload["items"])
+        entries.append(entry)
+
+    # Old hashed shards are no longer referenced by the manifest.
+    stale = re.compile(re.escape(SHARD_PREFIX) + r"[a-z0-9]+\.[0-9a-f]{%d}\.json" % HASH_CHARS)
+    for path in out_dir.iterdir():
+        if stale.fullmatch(path.name) and path.name not in written:
+            path.unlink()
+
+    manifest = {
+        "bank_file": str(bank_path),
+        "bank_sha256": loaded.sha256,
+        "item_count": len(loaded.data["items"]),
+        "shards": entries,
+    }
+    write_json(out_dir / MANIFEST_NAME, manifest)
+    return manifest
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("bank_json", type=Path, nargs="?", default=Path("cat/question-bank.sample.json"))
+    parser.add_argument("--out-dir", type=Path, default=Path("cat/shards"))
+    args = parser.parse_args()
+
+    manifest = write_shards(args.bank_json, args.out_dir)
+    for entry in manifest["shards"]:
+        count = entry.get("item_count")
+        label = f"{count} items" if count is not None else "members"
+        print(f"{entry['file']}: {label}, {entry['bytes']} bytes")
+    print(f"Wrote {len(manifest['shards'])} shards and {args.out_dir / MANIFEST_NAME}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""Bank-wide inverted index of source citations.
+
+Items carry their citations as `sourceIds`, so "which items cite NIST SP
+800-61" otherwise means scanning every item. This index is built in one pass
+and answers coverage questions by lookup:
+
+- sources: source id -> positions of the items citing it (every catalog
+  entry is listed, uncited ones with no items);
+- source_domains: source id -> number of citing items per domain;
+- rules: per annotate_cat_sources.KEYWORD_RULES entry, how many items its
+  keywords match and how many it actually added a citation to (after
+  de-duplication and the per-item cap).
+
+The index is written to `cat/question-bank.source-index.json` (one source per
+line) with the bank sha256, in the bank_index layout shared with the choice
+index, so the analytics page or other tools can load it (SourceIndex) without
+the bank.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+from typing import Any, Iterable, Iterator
+
+from annotate_cat_sources import (
+    KEYWORD_MATCHER,
+    KEYWORD_RULES,
+    RULE_NAMES,
+    SOURCE_CATALOG,
+    attributed_source_ids,
+    item_text,
+)
+from bank_index import BankIndex, ItemTable, compact, default_output, header_lines, mapping_lines
+from bank_io import atomic_write, load_bank
+from qa_timings import PhaseTimer, add_timing_args, cprofile_run
+
+INDEX_FORMAT = "source-index/1"
+INDEX_SUFFIX = ".source-index.json"
+
+
+def build_source_index(items: Iterable[dict[str, Any]], source_sha256: str = "") -> dict[str, Any]:
+    table = ItemTable()
+    sources: dict[str, list[int]] = {sid: [] for sid in SOURCE_CATALOG}
+    rule_matched = [0] * len(KEYWORD_RULES)
+    rule_credited = [0] * len(KEYWORD_RULES)
+    # Items whose sourceIds are not what the current rules give (annotation not rerun).
+    stale: list[int] = []
+    for item in items:
+        i = table.add(item)
+        cited = item.get("sourceIds")
+        if isinstance(cited, list):
+            for sid in dict.fromkeys(str(s) for s in cited):
+                sources.setdefault(sid, []).append(i)
+
+        rules = KEYWORD_MATCHER.matched_rules(item_text(item))
+        for n in rules:
+            rule_matched[n] += 1
+        attributed = attributed_source_ids(item, rules)
+        origins = set(attributed.values())
+        for n in rules:
+            if f"keyword:{RULE_NAMES[n]}" in origins:
+                rule_credited[n] += 1
+        if cited != list(attributed):
+            stale.append(i)
+
+    source_domains: dict[str, dict[str, int]] = {}
+    for sid, cited_by in sources.items():
+        counts: dict[str, int] = {}
+        for i in cited_by:
+            domain = table.domains[table.item_domains[i]]
+            counts[domain] = counts.get(domain, 0) + 1
+        source_domains[sid] = dict(sorted(counts.items()))
+
+    return {
+        "format": INDEX_FORMAT,
+        "bank_sha256": source_sha256,
+        **table.as_dict(),
+        "stale_items": stale,
+        "rules": [
+            {"rule": n, "name": RULE_NAMES[n], "sources": sids, "matched": rule_matched[n], "credited": rule_credited[n]}
+            for n, (_, sids) in enumerate(KEYWORD_RULES)
+        ],
+        "source_domains": source_domains,
+        "sources": sources,
+    }
+
+
+def _index_lines(index: dict[str, Any]) -> Iterator[str]:
+    yield from header_lines(index, ("format", "bank_sha256", "items", "domains", "item_domains", "stale_items"))
+    yield '  "rules": ['
+    yield ",".join(f"\n    {compact(rule)}" for rule in index["rules"])
+    yield "\n  ],\n"
+    yield '  "source_domains": '
+    yield from mapping_lines(index["source_domains"])
+    yield ',\n  "sources": '
+    yield from mapping_lines(index["sources"])
+    yield "\n}\n"
+
+
+def write_source_index(path: Path, index: dict[str, Any]) -> None:
+    atomic_write(path, _index_lines(index))
+
+
+class SourceIndex(BankIndex):
+    """Query a written source index without touching the bank."""
+
+    FORMAT = INDEX_FORMAT
+    LABEL = "Source index"
+    MAKE_TARGET = "cat-source-index"
+
+    def __init__(self, data: dict[str, Any]) -> None:
+        super().__init__(data)
+        self._sources: dict[str, list[int]] = data["sources"]
+
+    def items_citing(self, source_id: str, domain: str | None = None) -> list[str]:
+        cited_by = self._sources.get(source_id, [])
+        return [self.ids[i] for i in cited_by if domain is None or self.domain_of(i) == domain]
+
+    def domain_counts(self, source_id: str) -> dict[str, int]:
+        return dict(self.data["source_domains"].get(source_id, {}))
+
+    def uncited_sources(self) -> list[str]:
+        return [sid for sid, cited_by in self._sources.items() if not cited_by]
+
+    def rule_stats(self) -> list[dict[str, Any]]:
+        return list(self.data["rules"])
+
+
+def summarize(index: dict[str, Any]) -> dict[str, Any]:
+    sources = index["sources"]
+    return {
+        "item_count": len(index["items"]),
+        "cited_sources": sum(1 for cited_by in sources.values() if cited_by),
+        "uncited_sources": [sid for sid, cited_by in sources.items() if not cited_by],
+        "unmatched_rules": [r["name"] for r in index["rules"] if not r["matched"]],
+        "stale_items": len(index["stale_items"]),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("bank_json", type=Path, nargs="?", default=Path("cat/question-bank.sample.json"))
+    parser.add_argument("--out", type=Path, help="index path (default: cat/question-bank.source-index.json next to the bank)")
+    parser.add_argument("--check", action="store_true", help="verify the index matches the current bank")
+    add_timing_args(parser)
+    args = parser.parse_args()
+
+    out_path = args.out or default_output(args.bank_json, INDEX_SUFFIX)
+    if args.check:
+        return SourceIndex.check(out_path, args.bank_json)
+
+    timer = PhaseTimer.from_args(args)
+    with cprofile_run(args):
+        with timer.phase("load"):
+            loaded = load_bank(args.bank_json)
+            items = loaded.data.get("items", []) if isinstance(loaded.data, dict) else []
+
+        with timer.phase("index"):
+            index = build_source_index(items, source_sha256=loaded.sha256)
+        with timer.phase("write:index"):
+            write_source_index(out_path, index)
+
+    print("SUMMARY:", json.dumps(summarize(index), ensure_ascii=False))
+    print(f"Wrote source index {out_path}")
+    timer.print_summary()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
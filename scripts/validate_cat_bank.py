@@ -12,29 +12,14 @@ from urllib.parse import urlparse
 from collections import Counter
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any
-
-BLUEPRINT = {
-    "1. Security and Risk Management": 16,
-    "2. Asset Security": 10,
-    "3. Security Architecture and Engineering": 13,
-    "4. Communication and Network Security": 13,
-    "5. Identity and Access Management (IAM)": 13,
-    "6. Security Assessment and Testing": 12,
-    "7. Security Operations": 13,
-    "8. Software Development Security": 10,
-}
+from typing import Any, Iterable
 
-DOMAIN_ALIASES = {
-    "1 Security and Risk Management": "1. Security and Risk Management",
-    "2 Asset Security": "2. Asset Security",
-    "3 Security Architecture and Engineering": "3. Security Architecture and Engineering",
-    "4 Communication and Network Security": "4. Communication and Network Security",
-    "5 Identity and Access Management": "5. Identity and Access Management (IAM)",
-    "6 Security Assessment and Testing": "6. Security Assessment and Testing",
-    "7 Security Operations": "7. Security Operations",
-    "8 Software Development Security": "8. Software Development Security",
-}
+import item_schema
+from bank_io import BankStream, bank_sha256, load_bank
+from bank_merkle import build_merkle
+from cat_domains import BLUEPRINT, canonical_domain
+from qa_cache import QACache, cached_item, code_fingerprint
+from qa_timings import PhaseTimer, add_timing_args, cprofile_run
 
 ALLOWED_SOURCE_HOSTS = {
     "nist.gov",
@@ -63,15 +48,6 @@ class Finding:
     message: str
 
 
-def canonical_domain(raw: str) -> str:
-    raw = str(raw or "").strip()
-    if raw in BLUEPRINT:
-        return raw
-    if raw in DOMAIN_ALIASES:
-        return DOMAIN_ALIASES[raw]
-    return raw
-
-
 def sha256_bytes(data: bytes) -> str:
     return hashlib.sha256(data).hexdigest()
 
@@ -80,14 +56,45 @@ def load_json(path: Path) -> Any:
     return json.loads(path.read_text(encoding="utf-8"))
 
 
-def validate(bank: dict[str, Any]) -> tuple[list[Finding], dict[str, Any]]:
-    findings: list[Finding] = []
-    items = bank.get("items")
-    source_catalog = bank.get("sourceCatalog")
+def difficulty_band(difficulty: float) -> str:
+    if difficulty <= -0.6:
+        return "easy"
+    if difficulty >= 0.7:
+        return "hard"
+    return "medium"
+
+
+# Per-item checks are declared in item_schema.ITEM_SCHEMA and compiled once;
+# validate_item(item, i, source_catalog) -> (findings, row feeding the summary).
+validate_item = item_schema.compile_validator(
+    {"Finding": Finding, "canonical_domain": canonical_domain, "BLUEPRINT": BLUEPRINT, "difficulty_band": difficulty_band},
+    groups=("bank",),
+)
 
+
+def cache_namespace(source_catalog: dict[str, Any]) -> str:
+    catalog_ids = hashlib.sha256("\n".join(sorted(map(str, source_catalog))).encode("utf-8")).hexdigest()[:16]
+    return f"{code_fingerprint(__file__, item_schema.__file__)}:{catalog_ids}"
+
+
+def validate(bank: dict[str, Any], cache: QACache | None = None) -> tuple[list[Finding], dict[str, Any]]:
+    items = bank.get("items")
     if not isinstance(items, list):
-        findings.append(Finding("error", "Top-level 'items' must be a list."))
-        return findings, {}
+        return [Finding("error", "Top-level 'items' must be a list.")], {}
+    return validate_items(items, bank.get("sourceCatalog"), cache=cache)
+
+
+def _cacheable(result: tuple[list[Finding], dict[str, Any]]) -> tuple[list[tuple[str, str]], dict[str, Any]]:
+    # The QA cache stores plain values, so findings are kept as (level, message) pairs.
+    findings, row = result
+    return [(f.level, f.message) for f in findings], row
+
+
+def validate_items(
+    items: Iterable[dict[str, Any]], source_catalog: Any, cache: QACache | None = None
+) -> tuple[list[Finding], dict[str, Any]]:
+    """Validate items from any iterable (a list or a BankStream) in one pass."""
+    findings: list[Finding] = []
 
     if not isinstance(source_catalog, dict):
         findings.append(Finding("error", "Top-level 'sourceCatalog' must be an object."))
@@ -105,66 +112,25 @@ def validate(bank: dict[str, Any]) -> tuple[list[Finding], dict[str, Any]]:
         if host not in ALLOWED_SOURCE_HOSTS:
             findings.append(Finding("error", f"sourceCatalog entry '{sid}' uses non-ISC2/NIST host: {host or 'unknown'}"))
 
-    ids: list[str] = []
-    domains: list[str] = []
-    correct_positions: list[int] = []
-    diff_bands: list[str] = []
-    source_coverage = 0
-
+    rows: list[dict[str, Any]] = []
     for i, item in enumerate(items, start=1):
-        iid = item.get("id")
-        if not iid:
-            findings.append(Finding("error", f"Item {i} missing 'id'."))
-        else:
-            ids.append(str(iid))
-
-        stem = item.get("stem")
-        if not isinstance(stem, str) or not stem.strip():
-            findings.append(Finding("error", f"Item {iid or i} missing/invalid 'stem'."))
-
-        domain = canonical_domain(item.get("domain"))
-        domains.append(domain)
-        if domain not in BLUEPRINT:
-            findings.append(Finding("warning", f"Item {iid or i} has non-blueprint domain: '{item.get('domain')}'."))
-
-        choices = item.get("choices")
-        ci = item.get("correctIndex")
-        if not isinstance(choices, list) or len(choices) < 2:
-            findings.append(Finding("error", f"Item {iid or i} has invalid 'choices'."))
-        else:
-            if not isinstance(ci, int) or ci < 0 or ci >= len(choices):
-                findings.append(Finding("error", f"Item {iid or i} has invalid 'correctIndex'."))
-            else:
-                correct_positions.append(ci)
-
-        difficulty = item.get("difficulty", 0)
-        if not isinstance(difficulty, (int, float)):
-            findings.append(Finding("error", f"Item {iid or i} has non-numeric 'difficulty'."))
-        else:
-            if difficulty <= -0.6:
-                diff_bands.append("easy")
-            elif difficulty >= 0.7:
-                diff_bands.append("hard")
-            else:
-                diff_bands.append("medium")
-
-        discrimination = item.get("discrimination", 1)
-        if not isinstance(discrimination, (int, float)):
-            findings.append(Finding("error", f"Item {iid or i} has non-numeric 'discrimination'."))
-
-        explanation = item.get("explanation")
-        if not isinstance(explanation, str) or not explanation.strip():
-            findings.append(Finding("warning", f"Item {iid or i} missing explanation text."))
-
-        source_ids = item.get("sourceIds")
-        if not isinstance(source_ids, list) or not source_ids:
-            findings.append(Finding("error", f"Item {iid or i} missing sourceIds citations."))
-        else:
-            unknown = [sid for sid in source_ids if sid not in source_catalog]
-            if unknown:
-                findings.append(Finding("error", f"Item {iid or i} references unknown sourceIds: {unknown}"))
-            else:
-                source_coverage += 1
+        item_findings, row = cached_item(cache, item, i, lambda: _cacheable(validate_item(item, i, source_catalog)))
+        findings.extend(Finding(level, message) for level, message in item_findings)
+        rows.append(row)
+
+    return findings, summarize(findings, rows, len(source_catalog))
+
+
+def summarize(findings: list[Finding], rows: list[dict[str, Any]], source_catalog_count: int) -> dict[str, Any]:
+    """Aggregate bank-level checks and the summary block from per-item rows.
+
+    Appends the bank-level findings to `findings`.
+    """
+    ids = [r["id"] for r in rows if r["id"] is not None]
+    domains = [r["domain"] for r in rows]
+    correct_positions = [r["correct_position"] for r in rows if r["correct_position"] is not None]
+    diff_bands = [r["difficulty_band"] for r in rows if r["difficulty_band"] is not None]
+    source_coverage = sum(1 for r in rows if r["cited"])
 
     id_counts = Counter(ids)
     dup_ids = [k for k, v in id_counts.items() if v > 1]
@@ -176,7 +142,7 @@ def validate(bank: dict[str, Any]) -> tuple[list[Finding], dict[str, Any]]:
         if domain_counts.get(d, 0) == 0:
             findings.append(Finding("warning", f"No questions for domain: {d}"))
 
-    if len(items) < 100:
+    if len(rows) < 100:
         findings.append(Finding("warning", "Bank has fewer than 100 items; cannot run full CAT exam model."))
 
     if correct_positions:
@@ -191,10 +157,10 @@ def validate(bank: dict[str, Any]) -> tuple[list[Finding], dict[str, Any]]:
             if band_counts.get(band, 0) == 0:
                 findings.append(Finding("warning", f"No {band} difficulty items detected."))
 
-    summary = {
-        "item_count": len(items),
+    return {
+        "item_count": len(rows),
         "unique_item_ids": len(id_counts),
-        "source_catalog_count": len(source_catalog),
+        "source_catalog_count": source_catalog_count,
         "source_coverage_count": source_coverage,
         "domain_counts": dict(domain_counts),
         "correct_position_counts": dict(Counter(correct_positions)),
@@ -202,47 +168,126 @@ def validate(bank: dict[str, Any]) -> tuple[list[Finding], dict[str, Any]]:
         "warning_count": sum(1 for f in findings if f.level == "warning"),
         "error_count": sum(1 for f in findings if f.level == "error"),
     }
-    return findings, summary
 
 
-def main() -> int:
-    parser = argparse.ArgumentParser()
-    parser.add_argument("bank_json", type=Path)
-    parser.add_argument("--write-report", type=Path)
-    parser.add_argument("--write-manifest", type=Path)
-    args = parser.parse_args()
-
-    raw_bytes = args.bank_json.read_bytes()
-    bank = json.loads(raw_bytes.decode("utf-8"))
-
-    findings, summary = validate(bank)
-
+def build_report(
+    bank_file: str,
+    sha256: str,
+    findings: list[Finding],
+    summary: dict[str, Any],
+    distributions: dict[str, Any] | None = None,
+) -> dict[str, Any]:
     report = {
-        "bank_file": str(args.bank_json),
-        "sha256": sha256_bytes(raw_bytes),
+        "bank_file": bank_file,
+        "sha256": sha256,
         "summary": summary,
         "findings": [f.__dict__ for f in findings],
     }
+    if distributions is not None:
+        report["distributions"] = distributions
+    return report
+
+
+def bank_distributions(items: Iterable[dict[str, Any]]) -> dict[str, Any]:
+    """Per-domain difficulty/discrimination percentiles and length histograms."""
+    import bank_stats  # imported here so plain validation runs never load NumPy
+
+    return bank_stats.domain_distributions(bank_stats.build_columns(items))
+
 
+def bank_merkle(items: Iterable[dict[str, Any]]) -> dict[str, Any]:
+    """Per-item hashes, per-domain subtree roots and the bank Merkle root."""
+    return build_merkle(items)
+
+
+def build_manifest(
+    bank_file: str, sha256: str, summary: dict[str, Any], merkle: dict[str, Any] | None = None
+) -> dict[str, Any]:
     manifest = {
-        "bank_file": str(args.bank_json),
-        "sha256": sha256_bytes(raw_bytes),
+        "bank_file": bank_file,
+        "sha256": sha256,
         "item_count": summary.get("item_count", 0),
         "unique_item_ids": summary.get("unique_item_ids", 0),
         "domain_counts": summary.get("domain_counts", {}),
     }
+    if merkle is not None:
+        manifest["merkle"] = merkle
+    return manifest
 
-    if args.write_report:
-        args.write_report.write_text(json.dumps(report, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
-
-    if args.write_manifest:
-        args.write_manifest.write_text(json.dumps(manifest, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
 
+def print_results(findings: list[Finding], summary: dict[str, Any]) -> None:
     for finding in findings:
         print(f"{finding.level.upper()}: {finding.message}")
 
     print("SUMMARY:", json.dumps(summary, ensure_ascii=False))
 
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("bank_json", type=Path)
+    parser.add_argument("--write-report", type=Path)
+    parser.add_argument("--write-manifest", type=Path)
+    parser.add_argument("--stream", action="store_true", help="validate item by item in constant memory")
+    parser.add_argument(
+        "--distributions", action="store_true", help="add per-domain distributions (uses NumPy if installed)"
+    )
+    parser.add_argument(
+        "--item-hashes", action="store_true", help="add per-item hashes and a Merkle root to the manifest"
+    )
+    add_timing_args(parser)
+    args = parser.parse_args()
+
+    timer = PhaseTimer.from_args(args)
+    with cprofile_run(args):
+        stream = None
+        with timer.phase("load"):
+            if args.stream:
+                stream = BankStream(args.bank_json)
+                bank = stream.members()
+                sha256 = bank_sha256(args.bank_json)
+            else:
+                loaded = load_bank(args.bank_json)
+                bank = loaded.data
+                sha256 = loaded.sha256
+
+        with timer.phase("validate"):
+            cache = None
+            if isinstance(bank.get("sourceCatalog"), dict):
+                cache = QACache.for_bank(args.bank_json, "validate", cache_namespace(bank["sourceCatalog"]))
+            if stream is not None and stream.has_item_array:
+                findings, summary = validate_items(stream.items(), bank.get("sourceCatalog"), cache=cache)
+            else:
+                findings, summary = validate(bank, cache=cache)
+            if cache is not None:
+                cache.save()
+
+        def bank_items() -> Iterable[dict[str, Any]]:
+            if stream is not None:
+                return stream.items() if stream.has_item_array else []
+            return bank.get("items") if isinstance(bank.get("items"), list) else []
+
+        distributions = None
+        if args.distributions:
+            with timer.phase("distributions"):
+                distributions = bank_distributions(bank_items())
+
+        merkle = None
+        if args.item_hashes:
+            with timer.phase("merkle"):
+                merkle = bank_merkle(bank_items())
+
+        report = timer.embed(build_report(str(args.bank_json), sha256, findings, summary, distributions))
+        manifest = build_manifest(str(args.bank_json), sha256, summary, merkle)
+
+        if args.write_report:
+            timer.write_json(args.write_report, report, "report")
+
+        if args.write_manifest:
+            timer.write_json(args.write_manifest, manifest, "manifest")
+
+    print_results(findings, summary)
+    timer.print_summary()
+
     has_errors = any(f.level == "error" for f in findings)
     return 1 if has_errors else 0
 
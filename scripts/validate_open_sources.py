@@ -9,6 +9,8 @@ import re
 from pathlib import Path
 from urllib.parse import urlparse
 
+from bank_io import load_bank_data
+
 
 ALLOWED_HOSTS = {
     "csrc.nist.gov",
@@ -42,16 +44,7 @@ BANNED_TEXT = [
 ]
 
 
-def main() -> int:
-    parser = argparse.ArgumentParser()
-    parser.add_argument("--bank", type=Path, default=Path("cat/question-bank.sample.json"))
-    parser.add_argument("--catalog", type=Path, default=Path("sources/open_sources_catalog.json"))
-    args = parser.parse_args()
-
-    bank = json.loads(args.bank.read_text(encoding="utf-8"))
-    allowed_catalog = json.loads(args.catalog.read_text(encoding="utf-8"))
-    allowed_ids = set(allowed_catalog.keys())
-
+def validate_open(bank: dict, allowed_ids: set[str]) -> tuple[list[str], list[str], dict[str, int]]:
     errors: list[str] = []
     warnings: list[str] = []
 
@@ -92,15 +85,34 @@ def main() -> int:
                 errors.append(f"{iid}: banned proprietary marker matched: {pat.pattern}")
                 break
 
+    counts = {"items": len(items), "source_catalog_entries": len(source_catalog)}
+    return errors, warnings, counts
+
+
+def print_open_validation(errors: list[str], warnings: list[str], counts: dict[str, int]) -> None:
     print("OPEN-SOURCE VALIDATION")
-    print(f"- items: {len(items)}")
-    print(f"- sourceCatalog entries: {len(source_catalog)}")
+    print(f"- items: {counts['items']}")
+    print(f"- sourceCatalog entries: {counts['source_catalog_entries']}")
     print(f"- errors: {len(errors)}")
     print(f"- warnings: {len(warnings)}")
     for w in warnings:
         print(f"WARNING: {w}")
     for e in errors:
         print(f"ERROR: {e}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--bank", type=Path, default=Path("cat/question-bank.sample.json"))
+    parser.add_argument("--catalog", type=Path, default=Path("sources/open_sources_catalog.json"))
+    args = parser.parse_args()
+
+    bank = load_bank_data(args.bank)
+    allowed_catalog = json.loads(args.catalog.read_text(encoding="utf-8"))
+    allowed_ids = set(allowed_catalog.keys())
+
+    errors, warnings, counts = validate_open(bank, allowed_ids)
+    print_open_validation(errors, warnings, counts)
     return 1 if errors else 0
 
 
@@ -0,0 +1,34 @@
+"""Shared fixtures for the scripts/ tests: a small seeded bank in a temp dir."""
+from __future__ import annotations
+
+import copy
+import sys
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+SCRIPTS = Path(__file__).resolve().parent.parent / "scripts"
+sys.path.insert(0, str(SCRIPTS))
+
+from bank_io import save_bank  # noqa: E402
+from bench_cat_scripts import synthetic_bank  # noqa: E402
+
+BANK_SIZE = 120
+
+
+@pytest.fixture(scope="session")
+def seeded_bank() -> dict[str, Any]:
+    return synthetic_bank(BANK_SIZE)
+
+
+@pytest.fixture
+def bank(seeded_bank: dict[str, Any]) -> dict[str, Any]:
+    return copy.deepcopy(seeded_bank)
+
+
+@pytest.fixture
+def bank_file(tmp_path: Path, bank: dict[str, Any]) -> Path:
+    path = tmp_path / "question-bank.sample.json"
+    save_bank(path, bank)
+    return path
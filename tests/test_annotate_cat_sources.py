@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import copy
+import json
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+import annotate_cat_sources as acs
+
+# Texts where a word-split matcher could part ways with one regex search per
+# rule: keywords shared by several rules, case, word boundaries, phrases with
+# punctuation, regex metacharacters and characters re.I folds differently.
+EDGE_CASES = [
+    "ISC2 Code of Ethics",
+    "isc2code of ethics",
+    "The principal and the PRINCIPALS agree",
+    "principalship",
+    "third-party risk, third party vendor and THIRD PARTY",
+    "thirdparty",
+    "POA&M milestones",
+    "poa&mx and poa& m",
+    "CSF 2.0 and csf 2x0 and csf 20",
+    "ISO/IEC 27001 and iso 27001 and ISO/IEC27001",
+    "canonical ssoX federation federat federated",
+    "SSO with MFA via FIDO",
+    "risk assessment of residual risk within risk appetite",
+    "riskassessment residual-risk",
+    "DSS and PCI DSS and pci-dss",
+    "select, implement, assess; monitor",
+    "FIPS 199 high-water mark",
+    "high water mark",
+    "TLS 1.3 per RFC 8446",
+    "rfc8446",
+    "soc 2 soc2 SOC 2",
+    "authenticator authentication authentic",
+    "Incident recovery and forensic containment",
+    "domſain ſso İSO 27001",
+    "İncident",
+    "café incident",
+    "",
+]
+
+
+@pytest.mark.parametrize("text", EDGE_CASES)
+def test_matcher_equals_per_rule_search(text: str) -> None:
+    assert acs.KEYWORD_MATCHER.matched_rules(text) == acs.reference_matched_rules(text)
+
+
+def test_matcher_rule_combinations() -> None:
+    # Every keyword of every rule, alone, capitalised and glued to its neighbours.
+    for pattern, _ in acs.KEYWORD_RULES:
+        for keyword in pattern.pattern[3:-3].split("|"):
+            keyword = keyword.replace("[- ]", "-").replace("?", "")
+            for text in (keyword, keyword.upper(), keyword.title(), f"x{keyword}", f"{keyword}s", f"({keyword}).."):
+                assert acs.KEYWORD_MATCHER.matched_rules(text) == acs.reference_matched_rules(text), text
+
+
+def test_bank_parity(bank: dict[str, Any]) -> None:
+    assert acs.check_parity(bank["items"]) == []
+    texts = [acs.item_text(item) for item in bank["items"]]
+    assert any(acs.reference_matched_rules(text) for text in texts)
+    for text in texts:
+        assert acs.KEYWORD_MATCHER.matched_rules(text) == acs.reference_matched_rules(text)
+
+
+def test_check_parity_reports_a_diverging_item(bank: dict[str, Any], monkeypatch: pytest.MonkeyPatch) -> None:
+    item = next(it for it in bank["items"] if acs.reference_matched_rules(acs.item_text(it)))
+    monkeypatch.setattr(acs.KEYWORD_MATCHER, "matched_rules", lambda text: [])
+    mismatches = acs.check_parity([item])
+    assert len(mismatches) == 1 and mismatches[0].startswith(f"[{item['id']}]")
+
+
+def test_annotation_reuses_unchanged_items(bank: dict[str, Any]) -> None:
+    first = acs.Annotator()
+    acs.annotate(bank, first)
+    assert first.matched == len(bank["items"]) and first.reused == 0
+    annotated = copy.deepcopy(bank)
+
+    second = acs.Annotator(first.provenance())
+    acs.annotate(bank, second)
+    assert (second.reused, second.matched, second.changed) == (len(bank["items"]), 0, 0)
+    assert bank == annotated
+    assert second.provenance() == first.provenance()
+
+    edited = bank["items"][5]
+    edited["stem"] = "Which control reduces risk from a third-party vendor's PCI DSS scope?"
+    third = acs.Annotator(second.provenance())
+    acs.annotate(bank, third)
+    assert (third.reused, third.matched) == (len(bank["items"]) - 1, 1)
+    assert edited["sourceIds"] == acs.build_source_ids(edited)
+    assert list(third.provenance()["items"][edited["id"]]["sourceIds"]) == edited["sourceIds"]
+
+
+def _annotate(monkeypatch: pytest.MonkeyPatch, bank_file: Path, *extra: str) -> int:
+    monkeypatch.setattr("sys.argv", ["annotate_cat_sources.py", str(bank_file), *extra])
+    return acs.main()
+
+
+def test_cli_leaves_an_annotated_bank_alone(
+    bank_file: Path, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+) -> None:
+    assert _annotate(monkeypatch, bank_file) == 0
+    provenance = acs.provenance_path(bank_file)
+    assert provenance.exists()
+    written = bank_file.read_bytes(), provenance.read_bytes()
+    capsys.readouterr()
+
+    assert _annotate(monkeypatch, bank_file) == 0
+    assert "(unchanged; 0 matched" in capsys.readouterr().out
+    assert (bank_file.read_bytes(), provenance.read_bytes()) == written
+
+    assert _annotate(monkeypatch, bank_file, "--full") == 0
+    assert "(unchanged; 0 matched" not in capsys.readouterr().out
+    assert (bank_file.read_bytes(), provenance.read_bytes()) == written
+    assert json.loads(bank_file.read_text(encoding="utf-8"))["sourceCatalog"] == acs.SOURCE_CATALOG
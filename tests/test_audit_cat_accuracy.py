@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import re
+from typing import Any
+
+import pytest
+
+import audit_cat_accuracy
+
+OPTION_RE = re.compile(r"\bOption\s+([1-9][0-9]?)\s+is\s+correct\b", re.I)
+CORRECT_ANSWER_RE = re.compile(r"\bCorrect\s+Answer\s*:\s*(.+?)(?:\.\s|$)", re.I)
+MULTI_ANSWER_RE = re.compile(r"\bcorrect\s+answers?\s+are\s+options?\b", re.I)
+GDPR_DISCOVERY_RE = re.compile(r"\bgdpr\b", re.I)
+DISCOVERY_RE = re.compile(r"\bfrom\s+discovery\b", re.I)
+
+
+def reference_audit_item(item: dict[str, Any], idx: int, strict_text_match: bool = False) -> list[dict[str, Any]]:
+    """The per-pattern audit_item the single-pass scanner replaced."""
+    findings: list[dict[str, Any]] = []
+
+    iid = str(item.get("id") or idx)
+    choices = item.get("choices") if isinstance(item.get("choices"), list) else []
+    ci = item.get("correctIndex")
+    explanation = str(item.get("explanation") or "")
+    stem = str(item.get("stem") or "")
+
+    if MULTI_ANSWER_RE.search(explanation):
+        findings.append({
+            "level": "error",
+            "item": iid,
+            "kind": "multi_answer_phrase",
+            "message": "Explanation suggests multiple correct options in single-answer MCQ.",
+        })
+
+    m = OPTION_RE.search(explanation)
+    if m and isinstance(ci, int):
+        explained_opt = int(m.group(1)) - 1
+        if explained_opt != ci:
+            findings.append({
+                "level": "error",
+                "item": iid,
+                "kind": "option_number_mismatch",
+                "message": f"Explanation says Option {explained_opt + 1} but correctIndex is {ci + 1}.",
+            })
+
+    if strict_text_match:
+        m2 = CORRECT_ANSWER_RE.search(explanation)
+        if m2 and isinstance(ci, int) and 0 <= ci < len(choices):
+            explained_text = audit_cat_accuracy.norm(m2.group(1))
+            correct_choice = audit_cat_accuracy.norm(str(choices[ci]))
+            if explained_text and correct_choice and (explained_text not in correct_choice and correct_choice not in explained_text):
+                findings.append({
+                    "level": "warning",
+                    "item": iid,
+                    "kind": "correct_answer_text_mismatch",
+                    "message": "Correct Answer text does not closely match answer key choice text.",
+                })
+
+    if GDPR_DISCOVERY_RE.search(stem + " " + explanation) and DISCOVERY_RE.search(explanation):
+        findings.append({
+            "level": "warning",
+            "item": iid,
+            "kind": "gdpr_awareness_wording",
+            "message": "GDPR wording uses 'from discovery'; Article 33 standard is from awareness.",
+        })
+
+    return findings
+
+
+CHOICES = ["Encrypt the data", "Notify the regulator", "Delete the logs", "Escalate to legal"]
+
+EDGE_CASES = [
+    "Option 2 is correct because notification comes first.",
+    "option 3 IS correct.",
+    "Option 12 is correct.",
+    "Options 2 is correct.",
+    "Correct Answer: Notify the regulator. Option 1 is correct.",
+    "Correct Answer: Option 3 is correct. Nothing else.",
+    "Correct answer : Delete the logs",
+    "The correct answers are options 1 and 2.",
+    "Correct answer is option 2; correct answers are option",
+    "Under GDPR the 72 hours run from discovery.",
+    "Under GDPRs the 72 hours run from discovery.",
+    "Notify within 72 hours from discoverys.",
+    "gdpr: count from   discovery of the breach. Option 4 is correct.",
+    "",
+]
+STEMS = ["Which step comes first?", "Under GDPR, when must the controller notify?", "Option 2 is correct?"]
+
+
+def _items() -> list[dict[str, Any]]:
+    items = []
+    for n, explanation in enumerate(EDGE_CASES):
+        for stem in STEMS:
+            items.append({"id": f"e{len(items)}", "stem": stem, "choices": CHOICES, "correctIndex": n % 4, "explanation": explanation})
+    items.append({"stem": "GDPR breach?", "explanation": "Count from discovery.", "choices": "not a list", "correctIndex": "1"})
+    return items
+
+
+@pytest.mark.parametrize("strict", [False, True])
+def test_scanner_matches_per_pattern_audit(strict: bool, bank: dict[str, Any]) -> None:
+    for idx, item in enumerate(_items() + bank["items"], start=1):
+        expected = reference_audit_item(item, idx, strict)
+        assert audit_cat_accuracy.audit_item(item, idx, strict) == expected, item
+        assert audit_cat_accuracy.audit_item(item, idx, strict, audit_cat_accuracy.AuditStats()) == expected
+
+
+def test_edge_cases_raise_findings() -> None:
+    kinds = {f["kind"] for idx, item in enumerate(_items(), start=1) for f in reference_audit_item(item, idx, True)}
+    assert kinds == {"multi_answer_phrase", "option_number_mismatch", "correct_answer_text_mismatch", "gdpr_awareness_wording"}
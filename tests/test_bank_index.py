@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+from pathlib import Path
+from types import ModuleType
+from typing import Any
+
+import pytest
+
+import choice_index
+import source_index
+from bank_io import append_journal, save_bank
+
+INDEXES = [
+    pytest.param(choice_index, choice_index.ChoiceIndex, id="choice-index"),
+    pytest.param(source_index, source_index.SourceIndex, id="source-index"),
+]
+
+
+def _run(monkeypatch: pytest.MonkeyPatch, module: ModuleType, bank_file: Path, out: Path, *extra: str) -> int:
+    monkeypatch.setattr("sys.argv", [f"{module.__name__}.py", str(bank_file), "--out", str(out), *extra])
+    return module.main()
+
+
+@pytest.mark.parametrize("module, reader", INDEXES)
+def test_check_detects_missing_and_stale_index(
+    module: ModuleType,
+    reader: type,
+    bank_file: Path,
+    bank: dict[str, Any],
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    out = tmp_path / "index.json"
+    assert _run(monkeypatch, module, bank_file, out, "--check") == 1
+    assert "missing" in capsys.readouterr().out
+
+    assert _run(monkeypatch, module, bank_file, out) == 0
+    assert _run(monkeypatch, module, bank_file, out, "--check") == 0
+    assert "OK" in capsys.readouterr().out.splitlines()[-1]
+    assert reader.load(out).ids == [item["id"] for item in bank["items"]]
+
+    bank["items"][3]["stem"] += " (revised)"
+    save_bank(bank_file, bank)
+    assert _run(monkeypatch, module, bank_file, out, "--check") == 1
+    assert "stale" in capsys.readouterr().out
+
+    assert _run(monkeypatch, module, bank_file, out) == 0
+    assert reader.check(out, bank_file) == 0
+    # A pending journal entry changes the bank as loaded, so it makes the index stale too.
+    append_journal(bank_file, [dict(bank["items"][4], stem="Journalled stem?")])
+    assert reader.check(out, bank_file) == 1
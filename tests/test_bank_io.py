@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+import json
+import pickle
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+import compact_bank_journal
+from bank_io import (
+    BankStream,
+    append_journal,
+    bank_text_sha256,
+    iter_bank_text,
+    journal_path,
+    load_bank,
+    parse_cache_path,
+    read_journal,
+    save_bank,
+    sha256_text,
+)
+
+
+def _dumps(bank: Any) -> str:
+    return json.dumps(bank, indent=2, ensure_ascii=False) + "\n"
+
+
+def test_parse_cache_round_trip(bank_file: Path, bank: dict[str, Any]) -> None:
+    cold = load_bank(bank_file)
+    warm = load_bank(bank_file)
+    assert not cold.from_cache
+    assert warm.from_cache
+    assert warm.data == cold.data == bank
+    assert warm.sha256 == cold.sha256
+
+
+class _Planted:
+    def __init__(self, marker: Path) -> None:
+        self.marker = marker
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return (Path.touch, (self.marker,))
+
+
+def test_parse_cache_never_unpickles(bank_file: Path, bank: dict[str, Any], tmp_path: Path) -> None:
+    digest = load_bank(bank_file).sha256
+    marker = tmp_path / "unpickled"
+    cache = parse_cache_path(bank_file)
+    header = cache.read_bytes().split(b"\n", 2)
+    # A cache file carrying a pickle payload under a valid header is ignored, not executed.
+    cache.write_bytes(header[0] + b"\n" + digest.encode("ascii") + b"\n" + pickle.dumps(_Planted(marker)))
+    loaded = load_bank(bank_file)
+    assert not marker.exists()
+    assert not loaded.from_cache
+    assert loaded.data == bank
+
+
+def _stream_text(bank: dict[str, Any]) -> str:
+    items = bank.get("items")
+    streamed = isinstance(items, list)
+    members = {k: v for k, v in bank.items() if not (k == "items" and streamed)}
+    return "".join(iter_bank_text(list(bank), members, items if streamed else []))
+
+
+@pytest.mark.parametrize(
+    "bank",
+    [
+        {},
+        {"items": []},
+        {"items": [{"id": "a", "stem": "Café — naïve “quotes”", "choices": ["x", "y"], "nested": {"k": [1, 2.5, None]}}]},
+        {"sourceCatalog": {"s": {"url": "https://www.nist.gov"}}, "items": [{"id": "a"}, {}], "version": 3},
+        {"items": "not a list", "meta": []},
+    ],
+)
+def test_iter_bank_text_matches_json_dumps(bank: dict[str, Any]) -> None:
+    assert _stream_text(bank) == _dumps(bank)
+
+
+def test_iter_bank_text_matches_json_dumps_on_seeded_bank(bank: dict[str, Any]) -> None:
+    assert _stream_text(bank) == _dumps(bank)
+    assert bank_text_sha256(bank) == sha256_text(_dumps(bank))
+
+
+def test_stream_rewrite_is_byte_identical(bank_file: Path) -> None:
+    stream = BankStream(bank_file)
+    text = "".join(iter_bank_text(stream.layout(), stream.members(), stream.items()))
+    assert text == bank_file.read_text(encoding="utf-8")
+
+
+def _new_item(bank: dict[str, Any], iid: str) -> dict[str, Any]:
+    return dict(bank["items"][0], id=iid, stem=f"New stem for {iid}?")
+
+
+def test_journal_append_apply_compact_round_trip(bank_file: Path, bank: dict[str, Any]) -> None:
+    added = [_new_item(bank, "new-1"), _new_item(bank, "new-2")]
+    assert append_journal(bank_file, added, members={"version": 2}) == 2
+    assert len(read_journal(bank_file)) == 3
+
+    merged = load_bank(bank_file, use_cache=False)
+    assert merged.journal_conflicts == []
+    assert merged.data["items"] == bank["items"] + added
+    assert merged.data["version"] == 2
+
+    save_bank(bank_file, merged.data)
+    assert not journal_path(bank_file).exists()
+    compacted = json.loads(bank_file.read_text(encoding="utf-8"))
+    assert compacted == merged.data
+    assert bank_file.read_text(encoding="utf-8") == _dumps(merged.data)
+
+
+def test_journal_duplicate_ids(bank_file: Path, bank: dict[str, Any]) -> None:
+    existing = bank["items"][1]
+    changed = dict(bank["items"][2], stem="A different stem under a taken id?")
+    new = _new_item(bank, "new-1")
+    # A replayed add (identical item) and a repeated new id are silently skipped;
+    # an add that would overwrite a different item is reported.
+    append_journal(bank_file, [existing, changed, new, new])
+
+    merged = load_bank(bank_file, use_cache=False)
+    assert merged.journal_conflicts == [changed["id"]]
+    assert merged.data["items"] == bank["items"] + [new]
+
+
+def test_journal_conflicts_survive_the_parse_cache(
+    bank_file: Path, bank: dict[str, Any], capsys: pytest.CaptureFixture[str]
+) -> None:
+    changed = dict(bank["items"][2], stem="A different stem under a taken id?")
+    append_journal(bank_file, [changed])
+    cold = load_bank(bank_file)
+    warm = load_bank(bank_file)
+    assert warm.from_cache
+    assert cold.journal_conflicts == warm.journal_conflicts == [changed["id"]]
+    assert capsys.readouterr().err.count("WARNING") == 2
+
+
+def test_compact_refuses_conflicts_unless_dropped(
+    bank_file: Path, bank: dict[str, Any], monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+) -> None:
+    changed = dict(bank["items"][2], stem="A different stem under a taken id?")
+    append_journal(bank_file, [changed, _new_item(bank, "new-1")])
+    original = bank_file.read_bytes()
+
+    monkeypatch.setattr("sys.argv", ["compact_bank_journal.py", str(bank_file)])
+    assert compact_bank_journal.main() == 1
+    assert bank_file.read_bytes() == original
+    assert journal_path(bank_file).exists()
+
+    monkeypatch.setattr("sys.argv", ["compact_bank_journal.py", str(bank_file), "--drop-conflicts"])
+    assert compact_bank_journal.main() == 0
+    result = json.loads(capsys.readouterr().out.strip().splitlines()[-1])
+    assert result["dropped_conflicts"] == [changed["id"]]
+    assert not journal_path(bank_file).exists()
+    assert [it["id"] for it in load_bank(bank_file, use_cache=False).data["items"]][-1] == "new-1"
+
+
+def test_torn_journal_tail_is_ignored(bank_file: Path, bank: dict[str, Any]) -> None:
+    append_journal(bank_file, [_new_item(bank, "new-1")])
+    with journal_path(bank_file).open("a", encoding="utf-8") as fh:
+        fh.write('{"op": "add", "item": {"id": "torn"')
+    assert [r["item"]["id"] for r in read_journal(bank_file)] == ["new-1"]
+    append_journal(bank_file, [_new_item(bank, "new-2")])
+    assert [r["item"]["id"] for r in read_journal(bank_file)] == ["new-1", "new-2"]
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import copy
+import random
+from typing import Any
+
+import pytest
+
+from bank_merkle import MERKLE_ALGORITHM, build_merkle, diff_merkle
+
+
+def _reordered(items: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """The same items shuffled, each with its keys in reverse order."""
+    shuffled = [dict(reversed(list(item.items()))) for item in items]
+    random.Random(3).shuffle(shuffled)
+    return shuffled
+
+
+def test_root_ignores_item_and_key_order(bank: dict[str, Any]) -> None:
+    merkle = build_merkle(bank["items"])
+    assert merkle["algorithm"] == MERKLE_ALGORITHM
+    assert build_merkle(_reordered(bank["items"])) == merkle
+    assert build_merkle(copy.deepcopy(bank["items"]))["root"] == merkle["root"]
+
+
+def test_one_edit_changes_the_root_and_only_that_item(bank: dict[str, Any]) -> None:
+    old = build_merkle(bank["items"])
+    edited = copy.deepcopy(bank["items"])
+    target = edited[17]
+    target["stem"] += " (revised)"
+    new = build_merkle(edited)
+
+    assert new["root"] != old["root"]
+    diff = diff_merkle(old, new)
+    assert not diff["same"]
+    assert diff["changed"] == [target["id"]]
+    assert diff["added"] == [] and diff["removed"] == []
+    assert diff["changed_buckets"] == 1
+    assert diff_merkle(old, build_merkle(_reordered(bank["items"])))["same"]
+
+
+def test_diff_reports_added_and_removed_items(bank: dict[str, Any]) -> None:
+    items = bank["items"]
+    old = build_merkle(items)
+    added = dict(copy.deepcopy(items[0]), id="added-1")
+    diff = diff_merkle(old, build_merkle(items[1:] + [added]))
+    assert diff["added"] == ["added-1"]
+    assert diff["removed"] == [items[0]["id"]]
+    assert diff["changed"] == []
+
+
+def test_diff_rejects_other_algorithms(bank: dict[str, Any]) -> None:
+    merkle = build_merkle(bank["items"])
+    with pytest.raises(ValueError):
+        diff_merkle(dict(merkle, algorithm="sha256-merkle/1"), merkle)
@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+import compile_bank
+from bank_io import append_journal, load_bank_data, save_bank
+
+
+def _check(monkeypatch: pytest.MonkeyPatch, bank_file: Path, out: Path) -> int:
+    monkeypatch.setattr("sys.argv", ["compile_bank.py", str(bank_file), "--out", str(out), "--check"])
+    return compile_bank.main()
+
+
+def test_compiled_bank_round_trips(bank_file: Path, tmp_path: Path) -> None:
+    out = tmp_path / "question-bank.compiled.bin"
+    count, _ = compile_bank.write_compiled(bank_file, out)
+    bank = load_bank_data(bank_file)
+    assert count == len(bank["items"])
+    with compile_bank.CompiledBank(out) as compiled:
+        assert len(compiled) == count
+        assert compiled.to_bank() == bank
+        assert compiled.ids() == [item["id"] for item in bank["items"]]
+
+
+def test_check_passes_then_detects_stale_bank(
+    bank_file: Path, bank: dict[str, Any], tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    out = tmp_path / "question-bank.compiled.bin"
+    assert _check(monkeypatch, bank_file, out) == 1  # missing
+
+    compile_bank.write_compiled(bank_file, out)
+    assert _check(monkeypatch, bank_file, out) == 0
+
+    append_journal(bank_file, [dict(bank["items"][0], id="new-1")])
+    assert _check(monkeypatch, bank_file, out) == 1  # journal changes the bank fingerprint
+
+    bank["items"][0]["stem"] += " Edited."
+    save_bank(bank_file, bank)
+    assert _check(monkeypatch, bank_file, out) == 1
+    compile_bank.write_compiled(bank_file, out)
+    assert _check(monkeypatch, bank_file, out) == 0
+
+
+def test_round_trip_keeps_unusual_values(tmp_path: Path) -> None:
+    bank = {
+        "items": [
+            {"id": "a", "stem": "Ünïcode — “stem”?", "choices": ["x", "y"], "correctIndex": 1, "difficulty": 0.25},
+            {"stem": "No id", "choices": [], "correctIndex": 99999999999, "difficulty": "hard", "extra": {"k": [1]}},
+            {"id": "c", "type": "dragdrop", "choices": ["a", "b", "c"], "correctAnswers": [0, 2], "sourceIds": []},
+        ],
+        "sourceCatalog": {},
+        "meta": {"version": 1},
+    }
+    bank_file = tmp_path / "bank.json"
+    bank_file.write_text(json.dumps(bank, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+    out = tmp_path / "bank.compiled.bin"
+    compile_bank.write_compiled(bank_file, out)
+    with compile_bank.CompiledBank(out) as compiled:
+        assert compiled.to_bank() == bank
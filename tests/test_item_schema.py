@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+from collections import Counter
+from typing import Any
+
+import pytest
+
+import validate_cat_bank
+from validate_cat_bank import BLUEPRINT, Finding, canonical_domain
+
+
+def reference_validate(items: list[dict[str, Any]], source_catalog: dict[str, Any]) -> tuple[list[Finding], dict[str, Any]]:
+    """The hand-written per-item checks validate_cat_bank had before item_schema."""
+    findings: list[Finding] = []
+    ids: list[str] = []
+    domains: list[str] = []
+    correct_positions: list[int] = []
+    diff_bands: list[str] = []
+    source_coverage = 0
+
+    for i, item in enumerate(items, start=1):
+        iid = item.get("id")
+        if not iid:
+            findings.append(Finding("error", f"Item {i} missing 'id'."))
+        else:
+            ids.append(str(iid))
+
+        stem = item.get("stem")
+        if not isinstance(stem, str) or not stem.strip():
+            findings.append(Finding("error", f"Item {iid or i} missing/invalid 'stem'."))
+
+        domain = canonical_domain(item.get("domain"))
+        domains.append(domain)
+        if domain not in BLUEPRINT:
+            findings.append(Finding("warning", f"Item {iid or i} has non-blueprint domain: '{item.get('domain')}'."))
+
+        choices = item.get("choices")
+        ci = item.get("correctIndex")
+        if not isinstance(choices, list) or len(choices) < 2:
+            findings.append(Finding("error", f"Item {iid or i} has invalid 'choices'."))
+        else:
+            if not isinstance(ci, int) or ci < 0 or ci >= len(choices):
+                findings.append(Finding("error", f"Item {iid or i} has invalid 'correctIndex'."))
+            else:
+                correct_positions.append(ci)
+
+        difficulty = item.get("difficulty", 0)
+        if not isinstance(difficulty, (int, float)):
+            findings.append(Finding("error", f"Item {iid or i} has non-numeric 'difficulty'."))
+        else:
+            if difficulty <= -0.6:
+                diff_bands.append("easy")
+            elif difficulty >= 0.7:
+                diff_bands.append("hard")
+            else:
+                diff_bands.append("medium")
+
+        discrimination = item.get("discrimination", 1)
+        if not isinstance(discrimination, (int, float)):
+            findings.append(Finding("error", f"Item {iid or i} has non-numeric 'discrimination'."))
+
+        explanation = item.get("explanation")
+        if not isinstance(explanation, str) or not explanation.strip():
+            findings.append(Finding("warning", f"Item {iid or i} missing explanation text."))
+
+        source_ids = item.get("sourceIds")
+        if not isinstance(source_ids, list) or not source_ids:
+            findings.append(Finding("error", f"Item {iid or i} missing sourceIds citations."))
+        else:
+            unknown = [sid for sid in source_ids if sid not in source_catalog]
+            if unknown:
+                findings.append(Finding("error", f"Item {iid or i} references unknown sourceIds: {unknown}"))
+            else:
+                source_coverage += 1
+
+    summary = {
+        "unique_item_ids": len(Counter(ids)),
+        "source_coverage_count": source_coverage,
+        "domain_counts": dict(Counter(domains)),
+        "correct_position_counts": dict(Counter(correct_positions)),
+        "difficulty_band_counts": dict(Counter(diff_bands)),
+    }
+    return findings, summary
+
+
+INVALID_ITEMS: list[dict[str, Any]] = [
+    {},
+    {"id": "", "stem": "   ", "domain": None, "choices": "abc", "correctIndex": "0"},
+    {"id": "x1", "stem": 42, "domain": "5 Identity and Access Management", "choices": ["only one"]},
+    {"id": "x2", "stem": "Stem?", "domain": "Cooking", "choices": ["a", "b"], "correctIndex": 2},
+    {"id": "x3", "stem": "Stem?", "choices": ["a", "b"], "correctIndex": -1, "difficulty": "hard"},
+    {"id": "x4", "stem": "Stem?", "choices": ["a", "b"], "correctIndex": 1, "discrimination": None},
+    {"id": "x5", "stem": "Stem?", "choices": ["a", "b"], "correctIndex": 0, "difficulty": -0.6, "explanation": " "},
+    {"id": "x6", "stem": "Stem?", "choices": ["a", "b"], "correctIndex": 0, "difficulty": 0.7, "sourceIds": []},
+    {"id": "x7", "stem": "Stem?", "choices": ["a", "b"], "correctIndex": 0, "sourceIds": ["nope", "nist-sp-800-61r2"]},
+    {"id": 7, "stem": "Stem?", "choices": [1, 2, 3], "correctIndex": True, "difficulty": 1, "sourceIds": "nist"},
+]
+
+
+def _findings(findings: list[Finding]) -> list[tuple[str, str]]:
+    return [(f.level, f.message) for f in findings]
+
+
+@pytest.mark.parametrize("case", ["valid", "invalid", "mixed"])
+def test_compiled_validator_matches_reference(bank: dict[str, Any], case: str) -> None:
+    if case == "valid":
+        items = bank["items"]
+    elif case == "invalid":
+        items = INVALID_ITEMS
+    else:
+        items = bank["items"][:20] + INVALID_ITEMS + bank["items"][20:40]
+    catalog = bank["sourceCatalog"]
+
+    findings, summary = validate_cat_bank.validate_items(items, catalog)
+    expected_findings, expected_summary = reference_validate(items, catalog)
+
+    per_item = [f for f in _findings(findings) if f[1].startswith("Item ")]
+    assert per_item == _findings(expected_findings)
+    for key, value in expected_summary.items():
+        assert summary[key] == value, key
+    if case == "valid":
+        assert per_item == []
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import copy
+import random
+from typing import Any
+
+import near_duplicate_stems as nd
+
+PLANTED = 12
+
+
+def _planted(bank: dict[str, Any]) -> tuple[list[dict[str, Any]], list[tuple[str, str]]]:
+    """The bank's originals plus one-word rewordings and prefixed copies of some of them."""
+    items = [it for it in bank["items"] if not it.get("variantOf")]
+    rnd = random.Random(7)
+    pairs = []
+    for k, item in enumerate(rnd.sample(items, PLANTED)):
+        words = item["stem"].split()
+        if k % 2:
+            words[rnd.randrange(len(words))] = "regulated"
+        else:
+            words.insert(0, "During an audit,")
+        copy_ = dict(copy.deepcopy(item), id=f"planted-{k}", stem=" ".join(words))
+        items.append(copy_)
+        pairs.append((item["id"], copy_["id"]))
+    return items, pairs
+
+
+def _brute_force_pairs(items: list[dict[str, Any]], threshold: float) -> set[tuple[str, str]]:
+    shingles = [nd.stem_shingles(it["stem"]) for it in items]
+    families = [str(it.get("variantOf") or it["id"]) for it in items]
+    return {
+        (items[i]["id"], items[j]["id"])
+        for i in range(len(items))
+        for j in range(i + 1, len(items))
+        if families[i] != families[j] and nd.jaccard(shingles[i], shingles[j]) >= threshold
+    }
+
+
+def _cluster_of(report: dict[str, Any]) -> dict[str, int]:
+    return {iid: n for n, cluster in enumerate(report["clusters"]) for iid in cluster["items"]}
+
+
+def test_lsh_finds_every_pair_brute_force_finds(bank: dict[str, Any]) -> None:
+    items, planted = _planted(bank)
+    report = nd.find_near_duplicates(items)
+    cluster = _cluster_of(report)
+    expected = _brute_force_pairs(items, nd.DEFAULT_THRESHOLD)
+    assert set(planted) <= expected
+    for a, b in expected:
+        assert a in cluster and cluster.get(a) == cluster.get(b), (a, b)
+    # The exact Jaccard confirmation keeps anything below the threshold out.
+    assert report["clustered_items"] == len({iid for pair in expected for iid in pair})
+
+
+def test_candidates_stay_linear_on_templated_stems(bank: dict[str, Any]) -> None:
+    template = bank["items"][0]
+    slots = ["vendor", "auditor", "regulator", "customer", "contractor", "partner"]
+    items = [
+        dict(template, id=f"t{n}", stem=f"A {slots[n % 6]} asks team {n} which control the {slots[n // 6 % 6]} relies on first?")
+        for n in range(300)
+    ]
+    report = nd.find_near_duplicates(items, max_bucket=8)
+    assert report["oversized_buckets"] > 0
+    assert report["candidate_pairs"] <= report["bands"] * len(items) * (8 - 1) // 2
+    unbounded = nd.find_near_duplicates(items, max_bucket=len(items))
+    assert unbounded["oversized_buckets"] == 0
+    assert report["candidate_pairs"] < unbounded["candidate_pairs"]
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Callable
+
+import pytest
+
+import audit_cat_accuracy
+import item_quality_lint
+import validate_cat_bank
+from bank_io import load_bank_data, save_bank
+from qa_cache import QACache
+
+
+def _validate(bank: dict[str, Any], cache: QACache | None) -> Any:
+    findings, summary = validate_cat_bank.validate(bank, cache=cache)
+    return [f.__dict__ for f in findings], summary
+
+
+def _lint(bank: dict[str, Any], cache: QACache | None) -> Any:
+    return item_quality_lint.lint(bank, profile="human", cache=cache)
+
+
+def _audit(bank: dict[str, Any], cache: QACache | None) -> Any:
+    return audit_cat_accuracy.audit(bank["items"], cache=cache)
+
+
+PASSES: dict[str, tuple[Callable[[dict[str, Any], QACache | None], Any], Callable[[dict[str, Any]], str]]] = {
+    "validate": (_validate, lambda bank: validate_cat_bank.cache_namespace(bank["sourceCatalog"])),
+    "lint": (_lint, lambda bank: item_quality_lint.cache_namespace("human")),
+    "audit": (_audit, lambda bank: audit_cat_accuracy.cache_namespace(False)),
+}
+
+
+@pytest.mark.parametrize("name", sorted(PASSES))
+def test_warm_cache_matches_cold_and_uncached(name: str, bank_file: Path) -> None:
+    run, namespace = PASSES[name]
+    bank = load_bank_data(bank_file)
+    expected = run(bank, None)
+
+    cold = QACache.for_bank(bank_file, name, namespace(bank))
+    assert run(bank, cold) == expected
+    assert cold.hits == 0 and cold.misses == len(bank["items"])
+    cold.save()
+
+    warm = QACache.for_bank(bank_file, name, namespace(bank))
+    assert run(bank, warm) == expected
+    assert warm.misses == 0 and warm.hits == len(bank["items"])
+
+
+@pytest.mark.parametrize("name", sorted(PASSES))
+def test_edited_item_is_recomputed(name: str, bank_file: Path) -> None:
+    run, namespace = PASSES[name]
+    bank = load_bank_data(bank_file)
+    cache = QACache.for_bank(bank_file, name, namespace(bank))
+    run(bank, cache)
+    cache.save()
+
+    bank["items"][3]["stem"] = "Which is ALWAYS the answer?"
+    bank["items"][5]["choices"] = ["Same", "Same"]
+    save_bank(bank_file, bank)
+    bank = load_bank_data(bank_file)
+    warm = QACache.for_bank(bank_file, name, namespace(bank))
+    assert run(bank, warm) == run(bank, None)
+    assert warm.misses == 2
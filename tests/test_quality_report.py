@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+import item_quality_lint
+from quality_report import compact_report, expand_report, read_quality_report, write_quality_report
+
+
+@pytest.fixture
+def report(bank: dict[str, Any]) -> dict[str, Any]:
+    bank["items"][4]["stem"] = "Which is ALWAYS the answer?"
+    bank["items"][7]["choices"] = ["Same", "Same", "Other", "Another"]
+    return item_quality_lint.lint(bank, profile="strict")
+
+
+def test_compact_report_round_trips(report: dict[str, Any]) -> None:
+    assert report["findings"]
+    assert expand_report(compact_report(report)) == report
+
+
+@pytest.mark.parametrize("name", ["quality.json", "quality.ndjson", "quality.json.gz", "quality.ndjson.gz"])
+def test_written_report_reads_back(report: dict[str, Any], tmp_path: Path, name: str) -> None:
+    path = tmp_path / name
+    write_quality_report(path, report)
+    assert read_quality_report(path) == report
+
+
+def test_full_layout_reads_back(report: dict[str, Any], tmp_path: Path) -> None:
+    path = tmp_path / "quality.json"
+    path.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    assert read_quality_report(path) == report
+
+
+def test_gzipped_compact_report_is_an_order_of_magnitude_smaller(report: dict[str, Any], tmp_path: Path) -> None:
+    full = len((json.dumps(report, indent=2, ensure_ascii=False) + "\n").encode("utf-8"))
+    path = tmp_path / "quality.json.gz"
+    write_quality_report(path, report)
+    assert path.stat().st_size * 10 <= full